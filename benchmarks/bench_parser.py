@@ -0,0 +1,145 @@
+"""
+
+:synopsis: Per-request cost of the parsing of a raw HTTP request, for each synthetic corpus.
+
+Compares :func:`hrt.parser.parse_raw_request` and :func:`hrt.parser.parse_compact_request` with the former line by
+line parser of :mod:`hrt.translator`. With ``--memory``, compares the memory held by the parsed requests instead. Run
+from the repository root::
+
+    $ python -m benchmarks.bench_parser [--number 1000] [--memory]
+
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+import tracemalloc
+try:
+    from urlparse import urlparse
+except ImportError:
+    from urllib.parse import urlparse
+
+from hrt.parser import parse_compact_request, parse_raw_request
+
+from .corpora import CORPORA
+
+
+def legacy_parse_raw_request(request):
+    """Former implementation of :func:`hrt.parser.parse_raw_request`, popping the lines of the request one by one."""
+    headers_lines = request.splitlines()
+    if not headers_lines:
+        raise ValueError("Request Malformed. Please Enter a Valid HTTP request.")
+    new_request_method = headers_lines.pop(0)
+    header_list = []
+    host = ''  # Formerly missing, a request without 'Host' header raised a NameError.
+    while headers_lines:
+        line = headers_lines.pop(0)
+        if not line.strip('\r\n'):
+            break
+        header_list.append(line)
+        try:
+            header, value = line.split(":", 1)
+        except IndexError:
+            raise ValueError("Headers Malformed. Please Enter a Valid HTTP request.")
+        if header.lower() == "host":
+            host = value.strip()
+    data = ''
+    if headers_lines:
+        data = ''.join(headers_lines)
+    details_dict = {}
+    details_dict['data'] = data
+    details_dict['method'] = new_request_method.split(' ', 1)[0].strip()
+    details_dict['Host'] = host
+    try:
+        proto_ver = new_request_method.split(' ', 2)[2].split('/', 1)
+        details_dict['protocol'] = proto_ver[0].strip()
+        details_dict['version'] = proto_ver[1].strip()
+        details_dict['path'] = new_request_method.split(' ', 2)[1].strip()
+    except IndexError:
+        details_dict['path'] = ""
+        try:
+            proto_ver = new_request_method.split(' ', 2)[1].split('/', 1)
+        except IndexError:
+            raise ValueError("Request Malformed. Please Enter a Valid HTTP request.")
+        details_dict['protocol'] = proto_ver[0].strip()
+        details_dict['version'] = proto_ver[1].strip()
+    scheme, netloc, path, params, query, frag = urlparse(details_dict['path'])
+    if params:
+        path = path + ";" + params
+    if query:
+        path = path + "?" + query
+    if frag:
+        path = path + "#" + frag
+    details_dict['path'] = path
+    if scheme and not host.startswith(scheme):
+        details_dict['pre_scheme'] = scheme + "://"
+    else:
+        details_dict['pre_scheme'] = ''
+    return (header_list, details_dict)
+
+
+def measure(function, request, number, repeat=3):
+    """Time `number` parsings of `request`, split in `repeat` runs to smooth out the noise.
+
+    :return: Cost of one parsing in the fastest run, in microseconds.
+    :rtype: float
+    """
+    number = max(number // repeat, 1)
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        for _ in range(number):
+            function(request)
+        timings.append(time.time() - start)
+    return min(timings) * 1e6 / number
+
+
+def measure_memory(function, request, number):
+    """Memory held by `number` parsings of `request`, as if they were the requests of a corpus.
+
+    :return: Memory held by one parsed request, in bytes.
+    :rtype: int
+    """
+    number = max(1, min(number, 10 ** 8 // len(request)))  # At most 100 MB of large requests.
+    requests = [request[:-1] + request[-1] for _ in range(number)]  # Distinct copies, as read from a capture.
+    function(request)  # Warm up the caches.
+    tracemalloc.start()
+    try:
+        parsed = [function(request) for request in requests]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return size // len(parsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the parsing of raw HTTP requests.")
+    parser.add_argument("--number", "-n", type=int, default=1000, help="Number of parsings per corpus")
+    parser.add_argument("--memory", action="store_true", help="Measure the memory held by the parsed requests")
+    args = parser.parse_args()
+    if args.memory:
+        print("%-14s %16s %16s" % ('corpus', 'tuple (bytes)', 'compact (bytes)'))
+        for name in sorted(CORPORA):
+            request = CORPORA[name]()
+            print("%-14s %16d %16d" % (
+                name,
+                measure_memory(parse_raw_request, request, args.number),
+                measure_memory(parse_compact_request, request, args.number)))
+        return
+    print("%-14s %14s %14s %14s" % ('corpus', 'legacy (us)', 'current (us)', 'compact (us)'))
+    for name in sorted(CORPORA):
+        request = CORPORA[name]()
+        headers, details = parse_raw_request(request)
+        parsed = parse_compact_request(request)
+        assert (parsed.headers, parsed.details) == (headers, details)
+        assert legacy_parse_raw_request(request)[0] == headers
+        print("%-14s %14.3f %14.3f %14.3f" % (
+            name,
+            measure(legacy_parse_raw_request, request, args.number),
+            measure(parse_raw_request, request, args.number),
+            measure(parse_compact_request, request, args.number)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+
+:synopsis: Per-URL cost of the URL validation, for IPv4, IPv6 and domain hosts.
+
+Compares :func:`hrt.url.check_valid_url` with the former regex based validation. Run from the repository root::
+
+    $ python -m benchmarks.bench_validators [--number 1000000]
+
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+try:
+    from urlparse import urlparse
+except ImportError:
+    from urllib.parse import urlparse
+
+from hrt.url import check_valid_port, check_valid_url
+from hrt.util import re_ipv4_address, re_ipv6_address, re_domain
+
+
+# Name of the host kind: URL and whether it is valid.
+URLS = {
+    'ipv4': ('https://192.168.100.200:8443/robots.txt', True),
+    'ipv6': ('https://[2001:db8:85a3::8a2e:370:7334]:8443/robots.txt', True),
+    'ipv6-bad': ('https://[1111:2222:3333:4444:5555:6666:255.255.255.25x]:8443/robots.txt', False),
+    'domain': ('https://www.some-subdomain.example.com:8443/robots.txt', True),
+}
+
+
+def legacy_check_valid_url(url):
+    """Former implementation of :func:`hrt.url.check_valid_url`, based on regexes."""
+    try:
+        _, netloc, _, _, _, _ = urlparse(url)
+    except ValueError:  # Recent Python versions reject invalid bracketed hosts.
+        return False
+    if not netloc:
+        return False
+    if not netloc.startswith('['):
+        if ':' in netloc:
+            netloc, port = netloc.rsplit(':', 1)
+            if port and not check_valid_port(port):
+                return False
+        if re_ipv4_address.match(netloc):
+            return True
+        if re_domain.match(netloc):
+            return True
+    else:
+        if not netloc.endswith(']'):
+            netloc, port = netloc.rsplit(':', 1)
+            if port and not check_valid_port(port):
+                return False
+        if re_ipv6_address.match(netloc[1:-1]):
+            return True
+    return False
+
+
+def measure(function, url, number, repeat=3):
+    """Time `number` validations of `url`, split in `repeat` runs to smooth out the noise.
+
+    :return: Cost of one validation in the fastest run, in microseconds.
+    :rtype: float
+    """
+    number = max(number // repeat, 1)
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        for _ in range(number):
+            function(url)
+        timings.append(time.time() - start)
+    return min(timings) * 1e6 / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the URL validation.")
+    parser.add_argument("--number", "-n", type=int, default=1000000, help="Number of validations per URL")
+    args = parser.parse_args()
+    print("%-10s %14s %14s" % ('host', 'legacy (us)', 'current (us)'))
+    for kind in sorted(URLS):
+        url, valid = URLS[kind]
+        assert check_valid_url(url) == legacy_check_valid_url(url) == valid
+        print("%-10s %14.3f %14.3f" % (
+            kind, measure(legacy_check_valid_url, url, args.number), measure(check_valid_url, url, args.number)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+
+:synopsis: Synthetic raw HTTP requests exercising the hot paths of the translator.
+
+"""
+
+
+def small_get():
+    """Typical browser GET request with a handful of headers."""
+    return (
+        "GET /index.html?q=search HTTP/1.1\r\n"
+        "Host: www.example.com\r\n"
+        "User-Agent: Mozilla/5.0 (X11; Linux x86_64; rv:45.0) Gecko/20100101 Firefox/45.0\r\n"
+        "Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8\r\n"
+        "Accept-Language: en-US,en;q=0.5\r\n"
+        "Cookie: session=0123456789abcdef\r\n"
+        "Connection: keep-alive\r\n")
+
+
+def many_headers(count=200):
+    """GET request carrying `count` headers, e.g. a large number of cookies."""
+    headers = ''.join('X-Header-%d: "value" number %d\r\n' % (i, i) for i in range(count))
+    return (
+        "GET /api/items HTTP/1.1\r\n"
+        "Host: api.example.com:8443\r\n" + headers)
+
+
+def large_post(size=10 * 1024 * 1024):
+    """POST request with a body of `size` bytes."""
+    body = ('field="value"&' * (size // 14 + 1))[:size]
+    return (
+        "POST https://upload.example.com/upload HTTP/1.1\r\n"
+        "Host: upload.example.com\r\n"
+        "Content-Type: application/x-www-form-urlencoded\r\n"
+        "Content-Length: %d\r\n"
+        "\r\n" % size) + body
+
+
+def ipv6_host():
+    """GET request to an IPv6 host with a custom port."""
+    return (
+        "GET https://[2001:db8:85a3::8a2e:370:7334]:8443/robots.txt HTTP/1.1\r\n"
+        "Host: [2001:db8:85a3::8a2e:370:7334]:8443\r\n"
+        "Accept: */*\r\n")
+
+
+#: Name of each corpus and function generating its raw request.
+CORPORA = {
+    'small_get': small_get,
+    'many_headers': many_headers,
+    'large_post': large_post,
+    'ipv6_host': ipv6_host,
+}
@@ -0,0 +1,142 @@
+"""
+
+:synopsis: Time the parse, validation and rendering hot paths of the translator on synthetic corpora.
+
+Results are written as JSON so that two runs, e.g. from two commits, can be compared. Run from the repository root::
+
+    $ python -m benchmarks.run --output before.json
+    $ git checkout other-commit
+    $ python -m benchmarks.run --output after.json
+    $ python -m benchmarks.run --compare before.json after.json
+
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from hrt.interface import HttpRequestTranslator
+from hrt.parser import parse_compact_request
+from hrt.plugin_manager import BUILTIN_SCRIPTS, get_script_class
+from hrt.request import create_url, prepare_request
+from hrt.url import check_valid_url
+
+from .corpora import CORPORA
+
+
+def measure(function, min_time=0.2, repeat=3):
+    """Time a function, calling it enough times for the measure to last at least `min_time` seconds.
+
+    :param function function: Function to time, called without arguments.
+    :param float min_time: Minimum duration of a measure, in seconds.
+    :param int repeat: Number of measures, the fastest one is kept.
+
+    :return: Number of calls per measure and cost of one call in the fastest measure, in microseconds.
+    :rtype: dict
+    """
+    number = 1
+    while True:
+        start = time.time()
+        for _ in range(number):
+            function()
+        elapsed = time.time() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    timings = [elapsed]
+    for _ in range(repeat - 1):
+        start = time.time()
+        for _ in range(number):
+            function()
+        timings.append(time.time() - start)
+    return {'number': number, 'us': min(timings) * 1e6 / number}
+
+
+def run(selected=None, min_time=0.2):
+    """Run the benchmarks.
+
+    :param str selected: Only run the benchmarks whose name contains this string.
+    :param float min_time: Minimum duration of a measure, in seconds.
+
+    :return: Results by benchmark name, e.g. 'render.python.small_get'.
+    :rtype: dict
+    """
+    script_classes = [get_script_class(language) for language in sorted(BUILTIN_SCRIPTS)]
+    benchmarks = []
+    for name in sorted(CORPORA):
+        translator = HttpRequestTranslator(request=CORPORA[name]())
+        prepared = prepare_request(translator.headers, translator.details)
+        url = create_url(translator.details)
+        benchmarks.append(('parse.%s' % name, lambda request=translator.request: parse_compact_request(request)))
+        benchmarks.append(('validate.%s' % name, lambda url=url: check_valid_url(url)))
+        for cls in script_classes:
+            benchmarks.append((
+                'render.%s.%s' % (cls.__language__, name),
+                lambda cls=cls, prepared=prepared: cls(prepared=prepared).generate_script()))
+    for cls in script_classes:
+        benchmarks.append(('load_attributes.%s' % cls.__language__, lambda cls=cls: cls.load_attributes(cls)))
+    results = {}
+    for name, function in benchmarks:
+        if selected and selected not in name:
+            continue
+        results[name] = measure(function, min_time=min_time)
+        sys.stderr.write("%-40s %14.3f us\n" % (name, results[name]['us']))
+    return results
+
+
+def get_commit():
+    """Commit of the working copy, when it is a git repository.
+
+    :return: Hash of the commit, ``None`` otherwise.
+    :rtype: str
+    """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.STDOUT).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before, after):
+    """Print the evolution of the benchmarks between two runs.
+
+    :param dict before: Results of the reference run.
+    :param dict after: Results of the new run.
+    """
+    print("%-40s %14s %14s %8s" % ('benchmark', 'before (us)', 'after (us)', 'ratio'))
+    for name in sorted(set(before['results']) & set(after['results'])):
+        old, new = before['results'][name]['us'], after['results'][name]['us']
+        print("%-40s %14.3f %14.3f %7.2fx" % (name, old, new, new / old if old else float('inf')))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of the translator hot paths.")
+    parser.add_argument("--output", "-o", help="Write the results to this JSON file instead of stdout")
+    parser.add_argument("--select", "-k", help="Only run the benchmarks whose name contains this string")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum duration of a measure, in seconds")
+    parser.add_argument("--compare", nargs=2, metavar=('BEFORE', 'AFTER'), help="Compare two JSON results")
+    args = parser.parse_args()
+    if args.compare:
+        with open(args.compare[0]) as before, open(args.compare[1]) as after:
+            compare(json.load(before), json.load(after))
+        return
+    report = {
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'results': run(selected=args.select, min_time=args.min_time),
+    }
+    content = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as fp:
+            fp.write(content)
+    else:
+        print(content)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,13 +4,38 @@
 
 """
 
+import os
+import sys
+from importlib import import_module
 try:
-    from urllib import quote
+    from importlib import reload
 except ImportError:
-    from urllib.parse import quote
-from importlib import import_module
+    pass  # Python 2.x builtin
+
+from .request import FORM_HEADERS, create_url, encode_url, escape, escape_headers
+
+
+#: Whether the templates are checked for changes each time a script is created, e.g. while editing them. Otherwise,
+#: a template is only read the first time a script of its language is created in the process.
+RELOAD_TEMPLATES = False
+
+#: Render plans of the templates already loaded, by template module name. A plan is a tuple of the modification time
+#: of the template file and of the dictionary of its code attributes.
+_render_plans = {}
+
 
-from .url import get_url, check_valid_url
+def _get_mtime(module):
+    """Modification time of the file of a module.
+
+    :param module module: Module to check.
+
+    :return: Modification time, or ``None`` when the module has no file.
+    :rtype: float
+    """
+    try:
+        return os.path.getmtime(module.__file__)
+    except (AttributeError, OSError):
+        return None
 
 
 class AbstractScript(object):
@@ -18,26 +43,57 @@ class AbstractScript(object):
     """Abstract representation of a script."""
 
     __language__ = ''
+    __extension__ = ''
+    #: Module of the template, defaults to the `__language__` module of :mod:`hrt.templates`.
+    __template__ = ''
+    #: Sections of the script in the order they are assembled, with the parts of the request each one is generated
+    #: from: 'url', 'method', 'headers', 'body', 'proxy' and 'search'. A script generating a section from other parts
+    #: than the default ones lists them, so that an edit of the request generates the section again.
+    __sections__ = (
+        ('begin', frozenset(['url', 'method', 'headers'])),
+        ('proxy', frozenset(['proxy'])),
+        ('post', frozenset(['method', 'body'])),
+        ('https', frozenset()),
+        ('request', frozenset(['url', 'method', 'headers', 'search'])),
+    )
+
+    #: Escaping scheme of the values embedded in the string literals of the templates.
+    escape = staticmethod(escape)
+    #: Escaping scheme of the search pattern, embedded in raw string or regular expression literals by some templates.
+    escape_pattern = staticmethod(escape)
 
     code_begin = ''
     code_header = ''
     code_proxy = ''
     code_post = ''
+    code_post_file = ''
+    code_form = ''
+    code_form_field = ''
+    code_form_file = ''
     code_https = ''
     code_search = ''
     code_nosearch = ''
 
-    def __init__(self, headers=None, details=None, search=None):
+    def __init__(self, headers=None, details=None, search=None, prepared=None):
         """Initialize the script generation.
 
         :param list headers: Headers list containing fields like 'Host', 'User-Agent', etc.
         :param dict details: Request specific details dictionary like body and method of the request.
         :param str search: String to search for in the response to the request.
+        :param `PreparedRequest` prepared: Request already prepared by :func:`hrt.request.prepare_request`, shared
+            with the scripts of the other languages. Takes precedence over `headers`, `details` and `search`.
 
         :raises ValueError: When url is invalid.
         """
         self.load_attributes(self.__class__)
         self._script = ''
+        self.prepared = prepared
+        if prepared is not None:
+            self.headers = list(prepared.headers)
+            self.details = prepared.details
+            self.search = prepared.search
+            self.url = prepared.url
+            return
         self.headers = headers
         self.details = details
         self.search = search
@@ -57,31 +113,48 @@ class AbstractScript(object):
         :return: Generated script code.
         :rtype: str
         """
+        if headers or details or search:  # The prepared request is outdated.
+            self.prepared = None
         self.headers = headers or self.headers
         self.details = details or self.details
         self.search = search or self.search
+        sections = self.generate_sections()
+        # Sections are assembled once, a large body is not copied again for each section.
+        self._script = ''.join([self._script] + [sections[name] for name, _ in self.__sections__])
+        return self._script
+
+    def generate_sections(self, names=None):
+        """Generate sections of the script code, see `__sections__`.
+
+        A section the script or the request does not have, e.g. the body of a GET request, is empty.
+
+        :param iterable names: Names of the sections to generate, all of them by default.
+
+        :raises ValueError: when unsupported HTTP method, invalid `headers` or `details` values.
+
+        :return: Code snippets by section name.
+        :rtype: dict
+        """
         if not self.headers:
             raise ValueError("'headers' cannot be equal to '%s'" % self.headers)
         elif not self.details:
             raise ValueError("'details' cannot be equal to '%s'" % self.details)
         if not self.url and self.details:
             self.url = self.encode_url(self.create_url())
-        if self.code_begin:
-            self._script += self._generate_begin()
-        if self.code_proxy:
-            self._script += self._generate_proxy()
         method = self.details.get('method', '').strip().lower()
-        if method == 'get':
-            pass
-        elif method == 'post':
-            if self.code_post:
-                self._script += self._generate_post()
-        else:
+        if method not in ('get', 'post'):
             raise ValueError("'%s' is not supported! Only GET and POST are supported for now." % self.details['method'])
-        if self.code_https:
-            self._script += self._generate_https()
-        self._script += self._generate_request()
-        return self._script
+        if names is None:
+            names = [name for name, _ in self.__sections__]
+        sections = {}
+        for name in names:
+            if name == 'request':
+                sections[name] = self._generate_request()
+            elif not getattr(self, 'code_' + name) or (name == 'post' and method != 'post'):
+                sections[name] = ''
+            else:
+                sections[name] = getattr(self, '_generate_' + name)()
+        return sections
 
     def _generate_begin(self):
         """Default generation of the beginning of the code.
@@ -94,14 +167,20 @@ class AbstractScript(object):
     def _generate_headers(self):
         """Default generation of request headers.
 
+        When the code sends a form (see 'form_parts' detail), the headers describing the captured multipart body are
+        dropped, the form being sent with its own boundary.
+
         :return: Code snippet with HTTP requests headers.
         :rtype: str
         """
-        code = ''
-        for item in self.headers:
-            header, value = item.split(':', 1)
-            code += self.code_header.format(header=header.replace('"', '\\"'), value=value.replace('"', '\\"'))
-        return code
+        if self.prepared is not None:
+            headers = self.prepared.escaped_headers(self.escape)
+        else:
+            headers = escape_headers(self.headers, self.escape)
+        if self.details.get('form_parts') and self.code_form:
+            headers = [(header, value) for header, value in headers if header.strip().lower() not in FORM_HEADERS]
+        code_header = self.code_header
+        return ''.join([code_header.format(header=header, value=value) for header, value in headers])
 
     def _generate_proxy(self):
         """Default generation of the proxy specific code.
@@ -116,10 +195,38 @@ class AbstractScript(object):
     def _generate_post(self):
         """Default generation of the post body code.
 
+        When the body is written to a file (see 'data_file' detail), the code reads it from that file instead of
+        embedding it. When the parts of a multipart body are set (see 'form_parts' detail), the code sends them as a
+        form, uploading its files from disk.
+
         :return: Code snippet containing body to be sent in request.
         :rtype: str
         """
-        return self.code_post.format(data=self.details.get('data', '').replace('"', '\\"'))
+        if self.details.get('form_parts') and self.code_form:
+            return self._generate_form()
+        if self.details.get('data_file') and self.code_post_file:
+            return self.code_post_file.format(data_file=self.escape(self.details['data_file']))
+        if self.prepared is not None:
+            return self.code_post.format(data=self.prepared.escaped_data(self.escape))
+        return self.code_post.format(data=self.escape(self.details.get('data', '')))
+
+    def _generate_form(self):
+        """Default generation of the multipart form code.
+
+        :return: Code snippet sending the fields and the files of the form.
+        :rtype: str
+        """
+        parts = []
+        for part in self.details['form_parts']:
+            if part.path is None:
+                parts.append(self.code_form_field.format(name=self.escape(part.name), value=self.escape(part.value)))
+            else:
+                parts.append(self.code_form_file.format(
+                    name=self.escape(part.name),
+                    path=self.escape(part.path),
+                    filename=self.escape(part.filename),
+                    content_type=self.escape(part.content_type)))
+        return self.code_form.format(parts=''.join(parts))
 
     def _generate_https(self):
         """Default generation of the HTTPS specific code.
@@ -147,12 +254,17 @@ class AbstractScript(object):
     def _generate_search(self, search_string=''):
         """Default generation of the code having search functionality.
 
+        The response is searched as it is received. When the 'first_match' detail is set, the transfer stops at the
+        first match.
+
         :param str search_string: String to search for in the response to the request.
 
         :return: Code snippet with the HTTP response search feature.
         :rtype: str
         """
-        return self.code_search.format(search_string=search_string.replace('"', '\\"'))
+        return self.code_search.format(
+            search_string=self.escape_pattern(search_string),
+            first_match=int(bool(self.details.get('first_match'))))
 
     def _generate_nosearch(self):
         """Default generation of the code having no search functionality.
@@ -170,10 +282,7 @@ class AbstractScript(object):
         :return: Created URL.
         :rtype: str
         """
-        url = get_url(self.details.get('Host', ''), self.details.get('pre_scheme', '')) + self.details.get('path', '')
-        if not check_valid_url(url):
-            raise ValueError("Invalid URL '%s'." % url)
-        return url
+        return create_url(self.details)
 
     def encode_url(self, url):
         """Check if the URL of the HTTP request needs encoding.
@@ -183,28 +292,45 @@ class AbstractScript(object):
         :return: Encoded URL if encoding is needed.
         :rtype: str
         """
-        http_verb_with_encoding = ['head', 'options', 'get']
-        encoded_url = url
-        if self.details.get('data') and (self.details.get('method', '').lower() in http_verb_with_encoding):
-            encoded_url += quote(self.details['data'], '')
-        return encoded_url
+        return encode_url(url, self.details)
 
     @staticmethod
     def load_attributes(cls):
         """Loads attributes to Script class from a given script's template
 
-        Imports the template file/module, assigns all the attributes defined in the template file to the given class.
+        Imports the template file/module and assigns all the attributes defined in the template file to the given
+        class. A script class extending another one inherits the attributes missing from its template. The attributes
+        are compiled once per template into a render plan which is reused by every instance. When
+        :data:`RELOAD_TEMPLATES` is set, the plan is recompiled when the template file changes.
 
         :param class cls: Script class to which template is to be loaded.
 
         :raises AttributeError: When __language__ attribute is not present.
         """
+        if not RELOAD_TEMPLATES and '_render_plan' in cls.__dict__:  # Already loaded, without checking the file.
+            return
         templates_path = "{}.templates".format(__name__.split('.', 1)[0])
         if not hasattr(cls, '__language__'):
             raise AttributeError("__language__ not found in class: {}, attributes cannot be loaded".format(cls.__name__))
-        template = import_module("{templates_path}.{class_template}".format(
+        for base in cls.__bases__:
+            if base is not AbstractScript and issubclass(base, AbstractScript):
+                base.load_attributes(base)
+        template_name = cls.__template__ or "{templates_path}.{class_template}".format(
             templates_path=templates_path,
-            class_template=cls.__language__))
-        attributes = (var for var in vars(template) if var.startswith('code_'))
-        for attr in attributes:
-            setattr(cls, attr, getattr(template, attr))
+            class_template=cls.__language__)
+        template = sys.modules.get(template_name) or import_module(template_name)
+        mtime = _get_mtime(template)
+        plan = _render_plans.get(template_name)
+        if plan is None or plan[0] != mtime:
+            if plan is not None:  # The template changed since it was compiled.
+                template = reload(template)
+            attributes = dict((var, getattr(template, var)) for var in vars(template) if var.startswith('code_'))
+            plan = _render_plans[template_name] = (mtime, attributes)
+        previous_plan = cls.__dict__.get('_render_plan')
+        if previous_plan is not plan:
+            if previous_plan is not None:  # Drop the attributes removed from the template.
+                for attr in set(previous_plan[1]) - set(plan[1]):
+                    delattr(cls, attr)
+            for attr, value in plan[1].items():
+                setattr(cls, attr, value)
+            cls._render_plan = plan
@@ -0,0 +1,147 @@
+"""
+
+:synopsis: Translate many raw HTTP requests in a single invocation.
+
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+from .input_handler import callback_har, iter_file_requests
+from .interface import HttpRequestTranslator
+from .request import VOLATILE_FIELDS
+from .plugin_manager import get_script_class
+
+
+class BatchStats(object):
+
+    """Counters describing a finished batch translation."""
+
+    def __init__(self):
+        self.total = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self):
+        """Throughput of the batch.
+
+        :return: Number of requests translated per second.
+        :rtype: float
+        """
+        if not self.elapsed:
+            return 0.0
+        return self.total / self.elapsed
+
+    def __str__(self):
+        return "Translated %d request(s) (%d failed, %d duplicate(s)) in %.3fs: %.1f requests/second" % (
+            self.total, self.failed, self.duplicates, self.elapsed, self.rate)
+
+
+def iter_batch_input(path):
+    """Reads every raw request stored in a file or in the files of a directory.
+
+    Files are memory mapped and read incrementally by :func:`hrt.input_handler.iter_file_requests`, one request at a
+    time. Files with a '.har' extension are read as HAR files by :func:`hrt.input_handler.callback_har`. A request
+    whose body cannot be delimited, e.g. a malformed chunked body, is read as its `ValueError` and the next requests
+    are still read.
+
+    :param str path: Path to a file or a directory containing raw HTTP requests.
+
+    :raises OSError, IOError: When a file fails to open.
+    :raises ValueError: When a HAR file is malformed.
+
+    :return: Generator of tuples of source name and :class:`hrt.parser.RawRequest` or `ValueError`.
+    :rtype: generator
+    """
+    if os.path.isdir(path):
+        filepaths = sorted(
+            os.path.join(path, name) for name in os.listdir(path) if os.path.isfile(os.path.join(path, name)))
+    else:
+        filepaths = [path]
+    for filepath in filepaths:
+        source, extension = os.path.splitext(os.path.basename(filepath))
+        if extension.lower() == '.har':
+            for index, raw_request in enumerate(callback_har(filepath)):
+                yield '%s.%d' % (source, index), raw_request
+            continue
+        for index, raw_request in enumerate(iter_file_requests(filepath, yield_errors=True)):
+            yield '%s.%d' % (source, index), raw_request
+
+
+def write_result(result, output_dir=None, stream=None):
+    """Writes the code generated for one request of a batch.
+
+    :param `BatchResult` result: Successful result of :meth:`HttpRequestTranslator.translate_batch`.
+    :param str output_dir: Directory where one file per language is written, named after the request source.
+    :param file stream: Stream where the code is written when no `output_dir` is given. Defaults to stdout.
+    """
+    name = result.source or str(result.index)
+    for language in sorted(result.codes):
+        if output_dir:
+            extension = get_script_class(language).__extension__ or language
+            with open(os.path.join(output_dir, '%s.%s' % (name, extension)), 'w') as fp:
+                fp.write(result.codes[language])
+        else:
+            stream = stream or sys.stdout
+            print('=' * 5 + ' %s %s ' % (name, language.upper()) + '=' * 5, file=stream)
+            print(result.codes[language], file=stream)
+
+
+def run_batch(path, languages=['bash'], output_dir=None, stream=None, proxy=None, search_string='', data=None,
+              jobs=1, dedup=False, volatile_fields=VOLATILE_FIELDS, repeat=None, concurrency=None, keep_alive=None,
+              first_match=False):
+    """Translates every raw request found in `path` and writes the generated code.
+
+    :param str path: Path to a file or a directory containing raw HTTP requests.
+    :param list languages: list of languages in which requests' code is to be generated.
+    :param str output_dir: Directory where the generated code is written, one file per request and language.
+    :param file stream: Stream where the code is written when no `output_dir` is given. Defaults to stdout.
+    :param str proxy: custom proxy, if required in the code.
+    :param str search_string: search phrase(can be regex too) to be searched in the response.
+    :param str data: data string to be sent along with the header.
+    :param int jobs: Number of worker processes translating the requests. The output keeps the order of the input.
+    :param bool dedup: Whether the duplicate requests are translated only once, their code is the one of the first.
+    :param set volatile_fields: Lower case names of the headers and parameters ignored when deduplicating.
+    :param int repeat: number of times the load testing scripts send each request.
+    :param int concurrency: number of requests the load testing scripts keep in flight at the same time.
+    :param bool keep_alive: whether the load testing scripts reuse the connections between the requests.
+    :param bool first_match: whether the search of the responses stops at the first match.
+
+    :raises OSError, IOError: When an input file fails to open or an output file fails to be written.
+
+    :return: Statistics of the batch.
+    :rtype: :class:`BatchStats`
+    """
+    if output_dir and not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    stats = BatchStats()
+    start = time.time()
+    results = HttpRequestTranslator.translate_batch(
+        iter_batch_input(path),
+        languages=languages,
+        proxy=proxy,
+        search_string=search_string,
+        data=data,
+        jobs=jobs,
+        dedup=dedup,
+        volatile_fields=volatile_fields,
+        repeat=repeat,
+        concurrency=concurrency,
+        keep_alive=keep_alive,
+        first_match=first_match)
+    for result in results:
+        stats.total += 1
+        if result.duplicate_of is not None:
+            stats.duplicates += 1
+        if result.error:
+            stats.failed += 1
+            sys.stderr.write("error: Failed to translate request '%s': %s\n" % (result.source, result.error))
+            continue
+        write_result(result, output_dir=output_dir, stream=stream)
+    stats.elapsed = time.time() - start
+    return stats
@@ -3,12 +3,21 @@ from __future__ import print_function
 import sys
 import argparse
 
-from .interface import HttpRequestTranslator
-from .input_handler import handlers
-
 
 def init():
     args = take_args()
+    if args.parse_args().serve:
+        process_serve_args(args)
+        return
+    if args.parse_args().batch:
+        process_batch_args(args)
+        return
+    if args.parse_args().interactive:
+        process_interactive_args(args)
+        return
+    if args.parse_args().watch is not None:
+        process_watch_args(args)
+        return
     hrt = process_args(args)
     codes = hrt.generate_code()
     if args.parse_args().beautify:
@@ -35,7 +44,7 @@ def take_args():
         action="append",
         help="Generates a script in language 'language' for given HTTP request. "
              "If you want to generate multiple scripts, separate the script's name with a <,>. "
-             "Available languages: bash, php, python, ruby")
+             "Available languages: bash, bash_parallel, php, python, python_asyncio, python_load, ruby")
     parser.add_argument(
         "--beautify", "-bt",
         action="store_true",
@@ -48,14 +57,41 @@ def take_args():
     parser.add_argument(
         "--search_string", "-ss",
         help="Sends the request and searches for the required string in the response (regex can be provided)")
+    parser.add_argument(
+        "--first-match",
+        action="store_true",
+        help="Stops the search of the response at the first match")
     parser.add_argument(
         "--interactive", "-i",
         action="store_true",
-        help="Interactive mode: read raw HTTP request from keyboard, hit enter when ready. Type 'Ctrl+D' or 'Ctrl+C'"
-             "to exit from the interactive mode.")
+        help="Interactive mode: read raw HTTP request from keyboard, then edits of its headers or body, printing the "
+             "code after each one. Type 'Ctrl+D' or 'Ctrl+C' to exit from the interactive mode.")
     parser.add_argument(
         "--data", "-d",
         help="Add the data that you want to send along with the header")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        help="Load testing scripts (bash_parallel, python_asyncio, python_load): number of times the request is sent")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Load testing scripts (bash_parallel, python_asyncio, python_load): number of requests in flight at the "
+             "same time")
+    parser.add_argument(
+        "--no-keep-alive",
+        action="store_false",
+        dest="keep_alive",
+        default=None,
+        help="Load testing scripts (bash_parallel, python_asyncio, python_load): open a new connection for every "
+             "request")
+    parser.add_argument(
+        "--body-file",
+        help="Write the body of the request to this file and make the generated code read it from there")
+    parser.add_argument(
+        "--form-dir",
+        help="Write the files of a multipart/form-data body to this directory and make the generated code upload them "
+             "from there as a form")
     request_group.add_argument(
         "--request", "-r",
         help="Input the HTTP request")
@@ -66,9 +102,71 @@ def take_args():
         "--stdin", "-s",
         action="store_true",
         help="Enable stdin mode for HTTP request")
+    request_group.add_argument(
+        "--batch", "-b",
+        help="Batch mode: translate every HTTP request of a file or of the files of a directory")
+    parser.add_argument(
+        "--output-dir", "-od",
+        help="Batch mode: write the generated scripts in this directory instead of printing them")
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Batch mode: translate once the requests only differing in volatile headers and parameters "
+             "(e.g. cookies, CSRF tokens), or in the order and case of their headers")
+    parser.add_argument(
+        "--volatile",
+        action="append",
+        default=[],
+        help="Batch mode: name of a header or parameter ignored when deduplicating, in addition to the default ones. "
+             "Can be repeated")
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Batch mode: number of worker processes translating the requests")
+    parser.add_argument(
+        "--watch", "-w",
+        nargs='*',
+        metavar='FILE',
+        help="Watch mode: translate the --file request file and the given ones again each time they change, writing "
+             "the scripts next to them (e.g. req.py for req.txt)")
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Watch mode: poll the files for changes instead of relying on inotify, e.g. on network file systems")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Daemon mode: keep running and translate the requests POSTed as JSON to /translate")
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8010,
+        help="Daemon mode: localhost port to listen on")
+    parser.add_argument(
+        "--unix-socket",
+        help="Daemon mode: listen on this Unix socket instead of localhost")
     return parser
 
 
+def get_languages(argdict):
+    """Find the languages requested through the CLI arguments.
+
+    .. note::
+
+        Default language is set to 'bash'.
+
+    :param dict argdict: Dictionary of the CLI arguments.
+
+    :return: list of language names
+    :rtype: list
+    """
+    languages = ['bash']  # Default script language is set to bash.
+    if argdict.get('language'):
+        languages = [language.strip() for language in argdict['language'][0].split(',')]
+    return languages
+
+
 def get_input_type(args):
     """Find input handler with its corresponding parameters based on CLI arguments.
 
@@ -102,6 +200,8 @@ def get_input(input_type, *options):
     :return: raw request
     :rtype: str
     """
+    from .input_handler import handlers  # mmap and urllib are not needed for --help, keep the startup fast.
+
     if input_type in handlers:
         if options:
             return handlers[input_type](*options)
@@ -125,12 +225,12 @@ def process_args(parser):
     :return: HTTPRequestTranslator instance
     :rtype: `HTTPRequestTranslator`
     """
+    from .interface import HttpRequestTranslator  # Not needed for --help, keep the startup fast.
+
     args = parser.parse_args()
     argdict = vars(args)
 
-    languages = ['bash']  # Default script language is set to bash.
-    if argdict.get('language'):
-        languages = map(lambda x: x.strip(), argdict['language'][0].split(','))
+    languages = get_languages(argdict)
 
     input_type, options = get_input_type(args)
     if not input_type:
@@ -144,6 +244,139 @@ def process_args(parser):
         languages=languages,
         proxy=args.proxy,
         search_string=args.search_string,
-        data=args.data)
+        data=args.data,
+        body_file=args.body_file,
+        form_dir=args.form_dir,
+        repeat=args.repeat,
+        concurrency=args.concurrency,
+        keep_alive=args.keep_alive,
+        first_match=args.first_match)
 
     return hrt_obj
+
+
+def process_interactive_args(parser):
+    """Process the arguments provided to the translator CLI in interactive mode and run the session until ^D or ^C.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+    """
+    from .session import InteractiveSession  # Only the interactive mode needs it, keep the startup fast.
+
+    args = parser.parse_args()
+    session = InteractiveSession(
+        languages=get_languages(vars(args)),
+        proxy=args.proxy,
+        search_string=args.search_string,
+        data=args.data,
+        body_file=args.body_file,
+        form_dir=args.form_dir,
+        repeat=args.repeat,
+        concurrency=args.concurrency,
+        keep_alive=args.keep_alive,
+        first_match=args.first_match)
+    try:
+        session.run()
+    except KeyboardInterrupt:
+        pass
+    print("\nThanks for using the interactive mode! Exiting!")
+
+
+def process_watch_args(parser):
+    """Process the arguments provided to the translator CLI in watch mode and translate the request files again each
+    time they change, until interrupted.
+
+    The `--body-file` and `--form-dir` arguments are rejected, the bodies of all the request files would be written to
+    the same paths. So are request files which the scripts of the others would overwrite.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+    """
+    from .watcher import check_output_paths, get_watcher, watch_files  # Only the watch mode needs them.
+
+    args = parser.parse_args()
+    if args.body_file or args.form_dir:
+        parser.error("argument --watch/-w: not allowed with argument --body-file or --form-dir")
+    filepaths = ([args.file] if args.file else []) + args.watch
+    if not filepaths:
+        parser.print_help()
+        sys.exit(-1)
+    languages = get_languages(vars(args))
+    try:
+        check_output_paths(filepaths, languages)
+    except ValueError as error:
+        parser.error("argument --watch/-w: %s" % error)
+    sys.stderr.write("Watching %s\n" % ', '.join(filepaths))
+    try:
+        watch_files(
+            filepaths,
+            languages=languages,
+            watcher=get_watcher(filepaths, polling=args.poll),
+            proxy=args.proxy,
+            search_string=args.search_string,
+            data=args.data,
+            repeat=args.repeat,
+            concurrency=args.concurrency,
+            keep_alive=args.keep_alive,
+            first_match=args.first_match)
+    except KeyboardInterrupt:
+        pass
+
+
+def process_batch_args(parser):
+    """Process the arguments provided to the translator CLI in batch mode and translate all the requests.
+
+    The throughput of the batch is reported on stderr. The `--body-file` and `--form-dir` arguments are rejected, the
+    bodies of all the requests would be written to the same paths.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+
+    :raises OSError, IOError: When an input file fails to open or an output file fails to be written.
+
+    :return: Statistics of the batch.
+    :rtype: :class:`hrt.batch.BatchStats`
+    """
+    from .batch import run_batch  # Only the batch mode needs it, keep the startup fast.
+    from .request import VOLATILE_FIELDS
+
+    args = parser.parse_args()
+    if args.body_file or args.form_dir:
+        parser.error("argument --batch/-b: not allowed with argument --body-file or --form-dir")
+    stats = run_batch(
+        args.batch,
+        languages=get_languages(vars(args)),
+        output_dir=args.output_dir,
+        proxy=args.proxy,
+        search_string=args.search_string,
+        data=args.data,
+        jobs=args.jobs,
+        dedup=args.dedup,
+        volatile_fields=VOLATILE_FIELDS.union(name.strip().lower() for name in args.volatile),
+        repeat=args.repeat,
+        concurrency=args.concurrency,
+        keep_alive=args.keep_alive,
+        first_match=args.first_match)
+    sys.stderr.write("%s\n" % stats)
+    return stats
+
+
+def process_serve_args(parser):
+    """Process the arguments provided to the translator CLI in daemon mode and serve until interrupted.
+
+    The `--language`, `--proxy`, `--search_string` and `--data` arguments are the defaults of the translation requests.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+    """
+    if sys.version_info < (3, 7):
+        parser.error("argument --serve: requires Python 3.7+")
+    from .server import TranslationServer  # asyncio is not available on Python 2.
+
+    args = parser.parse_args()
+    server = TranslationServer(
+        languages=get_languages(vars(args)),
+        proxy=args.proxy,
+        search_string=args.search_string,
+        data=args.data)
+    if args.unix_socket:
+        sys.stderr.write("Listening on %s\n" % args.unix_socket)
+    else:
+        sys.stderr.write("Listening on http://127.0.0.1:%d\n" % args.port)
+    server.serve_forever(port=args.port, path=args.unix_socket)
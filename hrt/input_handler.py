@@ -1,4 +1,16 @@
+import io
+import mmap
+import os
 import sys
+from contextlib import closing
+try:
+    from urlparse import urlparse
+    from urllib import urlencode
+except ImportError:
+    from urllib.parse import urlparse, urlencode
+
+from .parser import RawRequest, iter_raw_requests
+from .util import LazyPattern
 
 
 try:
@@ -21,13 +33,163 @@ def callback_interactive():
 def callback_file(filepath):
     raw_request = ''
     try:
-        raw_request = open(filepath).read()
+        with io.open(filepath) as fp:
+            raw_request = fp.read()
     except (OSError, IOError) as e:
         sys.stderr.write("error: Failed to open '%s'\n\n" % filepath)
         raise e
     return raw_request
 
 
+def iter_file_requests(filepath, yield_errors=False):
+    """Reads the raw requests of a file one at a time, parsing them directly over the memory mapped file.
+
+    The pages of the file are loaded by the OS as they are parsed, so files larger than the available memory can be
+    read.
+
+    :param str filepath: Path to a file of concatenated raw HTTP requests.
+    :param bool yield_errors: Whether the error of a malformed request is yielded in place of the request, see
+        :func:`hrt.parser.iter_raw_requests`.
+
+    :raises OSError, IOError: When the file fails to open.
+    :raises ValueError: When a chunked body is malformed and `yield_errors` is not set.
+
+    :return: Generator of :class:`hrt.parser.RawRequest`, and of `ValueError` when `yield_errors` is set.
+    :rtype: generator
+    """
+    with open(filepath, 'rb') as fp:
+        if not os.fstat(fp.fileno()).st_size:  # Empty files cannot be mapped.
+            return
+        with closing(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)) as buffer:
+            for raw_request in iter_raw_requests(buffer, yield_errors=yield_errors):
+                yield raw_request
+
+
+# Beginning of the array of entries of a HAR file.
+re_har_entries = LazyPattern(r'"entries"\s*:\s*\[')
+# Separators between the entries of a HAR file.
+re_har_separator = LazyPattern(r'[\s,]*')
+# Size of the blocks read from a HAR file.
+HAR_CHUNK_SIZE = 64 * 1024
+
+
+def iter_har_entries(fp):
+    """Reads the entries of a HAR file one at a time, without loading the whole document in memory.
+
+    :param file fp: Text stream of the HAR file.
+
+    :raises ValueError: When the HAR file is malformed.
+
+    :return: Generator of HAR entries.
+    :rtype: generator
+    """
+    from json import JSONDecoder  # Only HAR files need it, keep the startup fast.
+
+    decoder = JSONDecoder()
+    buffer = ''
+    # Look for the array of entries.
+    while True:
+        chunk = fp.read(HAR_CHUNK_SIZE)
+        buffer += chunk
+        match = re_har_entries.search(buffer)
+        if match:
+            buffer = buffer[match.end():]
+            break
+        if not chunk:
+            raise ValueError("HAR Malformed. No entries found.")
+        buffer = buffer[-len('"entries" : ['):]  # Keep what might be the beginning of a split key.
+    # Decode the entries one by one from the position of the next one, reading more of the file when an entry is
+    # incomplete.
+    position = 0
+    eof = False
+    while True:
+        position = re_har_separator.match(buffer, position).end()
+        if buffer.startswith(']', position):
+            break
+        try:
+            entry, position = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise ValueError("HAR Malformed. Please Enter a Valid HAR file.")
+            # Decode again once the closing brace of the entry may have been read, and at least as much as the
+            # incomplete entry: an entry spanning many blocks is decoded a logarithmic number of times, not once per
+            # block.
+            chunks = [buffer[position:]]
+            size = length = len(chunks[0])
+            closed = False
+            while not eof and (not closed or size < 2 * length):
+                chunk = fp.read(HAR_CHUNK_SIZE)
+                eof = not chunk
+                closed = closed or '}' in chunk
+                chunks.append(chunk)
+                size += len(chunk)
+            buffer = ''.join(chunks)
+            position = 0
+            continue
+        yield entry
+
+
+def har_entry_to_request(entry):
+    """Converts a HAR entry to a raw request.
+
+    HTTP/2 pseudo-headers are dropped and a 'Host' header is added when missing.
+
+    :param dict entry: HAR entry.
+
+    :raises ValueError: When the HAR entry is malformed.
+
+    :return: Raw request of the entry.
+    :rtype: :class:`hrt.parser.RawRequest`
+    """
+    try:
+        request = entry['request']
+        method = request['method']
+        url = request['url']
+    except (KeyError, TypeError):
+        raise ValueError("HAR entry Malformed. Please Enter a Valid HAR file.")
+    version = request.get('httpVersion', '')
+    if not version.upper().startswith('HTTP/'):  # e.g. 'h2' or empty.
+        version = 'HTTP/1.1'
+    header_lines = []
+    has_host = False
+    for header in request.get('headers', []):
+        if header['name'].startswith(':'):  # HTTP/2 pseudo-header.
+            continue
+        has_host = has_host or header['name'].lower() == 'host'
+        header_lines.append('%s: %s' % (header['name'], header['value']))
+    if not has_host:
+        header_lines.insert(0, 'Host: %s' % urlparse(url).netloc)
+    post_data = request.get('postData') or {}
+    data = post_data.get('text')
+    if data is None:
+        data = urlencode([(param['name'], param.get('value', '')) for param in post_data.get('params', [])])
+    return RawRequest('%s %s %s' % (method, url, version), header_lines, data)
+
+
+def callback_har(filepath):
+    """Reads the requests of a HAR file incrementally.
+
+    Only the batch mode reads HAR files, see :func:`hrt.batch.iter_batch_input`. Unlike the callbacks of `handlers`,
+    which return a single raw request, it yields every request of the file.
+
+    :param str filepath: Path of the HAR file.
+
+    :raises OSError, IOError: When file fails to open.
+    :raises ValueError: When the HAR file is malformed.
+
+    :return: Generator of :class:`hrt.parser.RawRequest`.
+    :rtype: generator
+    """
+    try:
+        fp = io.open(filepath, encoding='utf-8-sig')
+    except (OSError, IOError) as e:
+        sys.stderr.write("error: Failed to open '%s'\n\n" % filepath)
+        raise e
+    with fp:
+        for entry in iter_har_entries(fp):
+            yield har_entry_to_request(entry)
+
+
 def callback_inline(raw_request):
     return raw_request
 
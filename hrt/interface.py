@@ -1,28 +1,105 @@
-try:
-    from urlparse import urlparse
-except ImportError:
-    from urllib.parse import urlparse
+import io
+import os
+from collections import deque, namedtuple
+from itertools import islice
 
-from .plugin_manager import generate_script
+from .parser import (
+    ParsedRequest, RawRequest, get_multipart_boundary, iter_multipart, parse_compact_request, split_raw_request)
+from .plugin_manager import get_script_class, render_script
+from .request import VOLATILE_FIELDS, FormPart, fingerprint_request, prepare_request
 from .url import get_url, check_valid_url, check_valid_port
+from .util import LazyPattern
+
+
+#: Outcome of translating one request of a batch: ``codes`` is set on success, ``error`` otherwise. When the request
+#: is a duplicate, ``duplicate_of`` is the index of the request it shares its outcome with.
+BatchResult = namedtuple('BatchResult', ['index', 'source', 'codes', 'error', 'duplicate_of'])
+BatchResult.__new__.__defaults__ = (None,)
+
+#: Number of requests sent at once to a worker process of a parallel batch.
+BATCH_CHUNK_SIZE = 64
+
+#: Translator class and options of the parallel batch handled by the current worker process.
+_worker_state = {}
+
+#: Characters replaced in the names of the files of a multipart body.
+_re_unsafe_filename = LazyPattern(r'[^\w.-]')
+
+
+def _get_form_file_path(form_dir, index, filename):
+    """Path of the file a file part of a multipart body is written to.
+
+    :param str form_dir: Directory the files are written to.
+    :param int index: Position of the part in the body, keeps the paths of the parts distinct.
+    :param str filename: File name of the part, as sent by the client.
+
+    :return: The path of the file.
+    :rtype: str
+    """
+    name = _re_unsafe_filename.sub('_', filename.replace('\\', '/').rsplit('/', 1)[-1]).lstrip('.')
+    return os.path.join(form_dir, '%d-%s' % (index, name or 'part'))
+
+
+def _init_worker(cls, options):
+    """Initializes a worker process of a parallel batch and warms up the templates of the batch's languages.
+
+    :param class cls: Translator class translating the requests.
+    :param dict options: Options of the batch passed to :meth:`HttpRequestTranslator._translate`.
+    """
+    _worker_state['cls'] = cls
+    _worker_state['options'] = options
+    for language in options['languages']:
+        try:
+            script_class = get_script_class(language)
+        except ValueError:  # Reported for each request of the batch.
+            continue
+        script_class.load_attributes(script_class)
+
+
+def _translate_worker(item):
+    """Translates one request of a parallel batch in a worker process.
+
+    :param tuple item: Position of the request in the batch and request.
+
+    :return: Outcome of the translation.
+    :rtype: :class:`BatchResult`
+    """
+    index, request = item
+    return _worker_state['cls']._translate(index, request, **_worker_state['options'])
 
 
 class HttpRequestTranslator(object):
 
     """Main Interface for the tool."""
 
-    def __init__(self, languages=['bash'], request=None, proxy=None, search_string='', data=None):
+    def __init__(self, languages=['bash'], request=None, proxy=None, search_string='', data=None, body_file=None,
+                 repeat=None, concurrency=None, keep_alive=None, first_match=False, form_dir=None):
         """Initialises all the parameters of the object.
 
         :param list languages: list of languages in which request's code is to be generated.
-        :param str request: raw request, for which code has to be generated
+        :param str request: raw request, for which code has to be generated, or :class:`hrt.parser.RawRequest`, or
+            :class:`hrt.parser.ParsedRequest` already parsed, which is updated with the options.
         :param str proxy: custom proxy, if required in the code.
         :param str search_string: search phrase(can be regex too) to be searched in the response.
         :param str data: data string to be sent along with the header.
+        :param str body_file: path of the file the body is written to, so that large bodies are read from it by the
+            generated code instead of being embedded in it.
+        :param int repeat: number of times the load testing scripts send the request.
+        :param int concurrency: number of requests the load testing scripts keep in flight at the same time.
+        :param bool keep_alive: whether the load testing scripts reuse the connections between the requests.
+        :param bool first_match: whether the search of the response stops at the first match.
+        :param str form_dir: directory the files of a multipart/form-data body are written to, so that the generated
+            code uploads them from there as a form instead of embedding the whole body.
         """
         self.languages = languages
         self.request = request
         self.data = data
+        self.body_file = body_file
+        self.repeat = repeat
+        self.concurrency = concurrency
+        self.keep_alive = keep_alive
+        self.first_match = first_match
+        self.form_dir = form_dir
         self.proxy = proxy
         self.search_string = search_string
 
@@ -30,10 +107,35 @@ class HttpRequestTranslator(object):
         self._extract_request_details()
 
     def _extract_request_details(self):
-        self.headers, self.details = self._parse_request()
+        # The header lines are split once, the scripts render the pairs of the parsed request.
+        if isinstance(self.request, ParsedRequest):  # Already parsed, e.g. to be fingerprinted.
+            self.parsed = self.request
+        else:
+            raw_request = self.request
+            if not isinstance(raw_request, RawRequest):
+                raw_request = split_raw_request(raw_request)
+            self.parsed = parse_compact_request(raw_request)
+        self.headers, self.details = list(self.parsed.header_lines), self.parsed.details
 
         if self.data:
-            self.details['data'] = self.data
+            self.details['data'] = self.parsed.data = self.data
+
+        if self.form_dir and self.details['data']:
+            self._extract_form_parts()
+
+        if self.body_file and self.details['data']:
+            self.details['data_file'] = self.body_file
+
+        for option in ('repeat', 'concurrency'):
+            value = getattr(self, option)
+            if value is not None:
+                if value < 1:
+                    raise ValueError("The %s must be a positive number." % option)
+                self.details[option] = value
+        if self.keep_alive is not None:
+            self.details['keep_alive'] = self.keep_alive
+        if self.first_match:
+            self.details['first_match'] = True
 
         if self.proxy:
             # If proxy already doesn't starts with http and is like 127.0.0.1:8010
@@ -47,88 +149,242 @@ class HttpRequestTranslator(object):
                 raise ValueError("Proxy provided is invalid.")
             if not check_valid_url(self.details['proxy_host']) or not check_valid_port(self.details['proxy_port']):
                 raise ValueError("Proxy provided is invalid.")
+            self.parsed.proxy_host, self.parsed.proxy_port = self.details['proxy_host'], self.details['proxy_port']
+
+    def _extract_form_parts(self):
+        """Splits a multipart/form-data body in the parts of the form sent by the generated code.
+
+        The parts are set in the 'form_parts' detail, the files being uploaded from `form_dir`. A body which is not
+        multipart, or malformed, is sent as is.
+        """
+        boundary = get_multipart_boundary(self.headers)
+        if not boundary:
+            return
+        form_parts = []
+        try:
+            for index, part in enumerate(iter_multipart(self.details['data'], boundary)):
+                if part.filename is None:
+                    form_parts.append(FormPart(part.name or '', part.data, None, None, None))
+                else:
+                    form_parts.append(FormPart(
+                        part.name or '',
+                        None,
+                        _get_form_file_path(self.form_dir, index, part.filename),
+                        part.filename,
+                        part.content_type or 'application/octet-stream'))
+        except ValueError:  # Not a multipart body, sent as is.
+            return
+        self.form_boundary = boundary
+        self.details['form_parts'] = tuple(form_parts)
+
+    def _write_form_files(self):
+        """Writes the files of the multipart body to the paths of the 'form_parts' detail, one part at a time.
+
+        :raises IOError: When a file cannot be written.
+        """
+        parts = iter_multipart(self.details['data'], self.form_boundary)
+        for part, form_part in zip(parts, self.details['form_parts']):
+            if form_part.path is not None:
+                with io.open(form_part.path, 'w', encoding='utf-8', newline='') as form_file:
+                    form_file.write(part.data)
+
+    def write_files(self):
+        """Writes the files read by the generated code: the body file and the files of a multipart body sent as a form.
+
+        :raises IOError: When a file cannot be written.
+        """
+        if self.details.get('data_file'):
+            with io.open(self.details['data_file'], 'w', encoding='utf-8', newline='') as body_file:
+                body_file.write(self.details['data'])
+        if self.details.get('form_parts'):
+            self._write_form_files()
 
     def generate_code(self):
         """Generates code for all the languages defined in the object.
 
+        The request is prepared once and every language renders its script from it. When a body file is set, the body
+        is written to it once for all the languages, and so are the files of a multipart body sent as a form.
+
+        :raises ValueError: When URL is invalid or a language is not supported.
+        :raises IOError: When the body file or the files of the form cannot be written.
+
         :return: A dictionary of language name and respective code.
         :rtype: dict
         """
-        self._parse_request()
         all_code = {}
+        if not self.languages:
+            return all_code
+        prepared = prepare_request(
+            self.headers, self.details, self.search_string, header_pairs=self.parsed.header_pairs)
+        self.write_files()
         for language in self.languages:
-            all_code[language] = generate_script(language, self.headers, self.details, self.search_string)
+            all_code[language] = render_script(language, prepared)
         return all_code
 
-    def _parse_request(self):
-        """Parses Raw HTTP request into separate dictionaries for headers and body and other parameters.
+    @classmethod
+    def translate_batch(cls, requests, languages=['bash'], proxy=None, search_string='', data=None, jobs=1,
+                        dedup=False, volatile_fields=VOLATILE_FIELDS, repeat=None, concurrency=None, keep_alive=None,
+                        first_match=False):
+        """Translates many raw requests, parsing each of them only once.
+
+        A malformed request does not stop the batch, its error is reported in the corresponding result instead. A
+        request already found malformed while reading the input is given as its `ValueError`.
+
+        When deduplicating, the requests having the same canonical form (see :func:`hrt.request.canonicalize_request`)
+        are translated once: the duplicates share the outcome of the first one.
+
+        :param iterable requests: raw requests (or :class:`hrt.parser.RawRequest`, or `ValueError`), optionally in
+            tuples of source name and raw request.
+        :param list languages: list of languages in which requests' code is to be generated.
+        :param str proxy: custom proxy, if required in the code.
+        :param str search_string: search phrase(can be regex too) to be searched in the response.
+        :param str data: data string to be sent along with the header.
+        :param int jobs: Number of worker processes sharing the batch. The requests are translated in the current
+            process when lower than 2.
+        :param bool dedup: whether the duplicate requests are translated only once.
+        :param set volatile_fields: lower case names of the headers and parameters ignored when deduplicating.
+        :param int repeat: number of times the load testing scripts send each request.
+        :param int concurrency: number of requests the load testing scripts keep in flight at the same time.
+        :param bool keep_alive: whether the load testing scripts reuse the connections between the requests.
+        :param bool first_match: whether the search of the responses stops at the first match.
+
+        :return: Generator of :class:`BatchResult`, in the order of `requests`.
+        :rtype: generator
+        """
+        options = dict(
+            languages=list(languages),
+            proxy=proxy,
+            search_string=search_string,
+            data=data,
+            repeat=repeat,
+            concurrency=concurrency,
+            keep_alive=keep_alive,
+            first_match=first_match)
+        if dedup:
+            return cls._translate_unique(requests, options, jobs, volatile_fields)
+        return cls._translate_all(enumerate(requests), options, jobs)
+
+    @classmethod
+    def _translate_all(cls, items, options, jobs=1):
+        """Translates the requests of a batch.
+
+        :param iterable items: Tuples of position in the batch and request.
+        :param dict options: Options of the batch passed to :meth:`_translate`.
+        :param int jobs: Number of worker processes sharing the batch.
+
+        :return: Generator of :class:`BatchResult`, in the order of `items`.
+        :rtype: generator
+        """
+        if jobs < 2:
+            for index, request in items:
+                yield cls._translate(index, request, **options)
+            return
+        import multiprocessing  # Only parallel batches need it, keep the startup fast.
+
+        pool = multiprocessing.Pool(jobs, _init_worker, (cls, options))
+        try:
+            while True:
+                # Feed the pool window by window so that the whole batch is never held in memory.
+                window = list(islice(items, jobs * BATCH_CHUNK_SIZE * 4))
+                if not window:
+                    break
+                for result in pool.imap(_translate_worker, window, BATCH_CHUNK_SIZE):
+                    yield result
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    @classmethod
+    def _translate_unique(cls, requests, options, jobs=1, volatile_fields=VOLATILE_FIELDS):
+        """Translates the requests of a batch, once per canonical form.
+
+        The requests are parsed and fingerprinted in the current process, only the first request of each fingerprint is
+        translated, from its parse. The outcome of the first requests is kept to be shared with their duplicates.
+
+        :param iterable requests: raw requests, optionally in tuples of source name and raw request.
+        :param dict options: Options of the batch passed to :meth:`_translate`.
+        :param int jobs: Number of worker processes sharing the batch.
+        :param set volatile_fields: lower case names of the headers and parameters ignored when deduplicating.
+
+        :return: Generator of :class:`BatchResult`, in the order of `requests`.
+        :rtype: generator
+        """
+        first_indexes = {}  # Index of the first request, by fingerprint.
+        first_results = {}  # Outcome of the first requests, by index.
+        pending = deque()  # Position, source and index of the first request of the requests read so far.
+
+        def unique_requests():
+            for index, request in enumerate(requests):
+                source, raw_request = cls._split_source(request)
+                try:
+                    if isinstance(raw_request, ValueError):  # Malformed request of the input.
+                        raise raw_request
+                    parsed = parse_compact_request(raw_request)
+                    details = parsed.details
+                    if options['data']:  # The body of every request is replaced, see `_extract_request_details`.
+                        details['data'] = options['data']
+                    fingerprint = fingerprint_request(None, details, volatile_fields, parsed.header_pairs)
+                except ValueError:  # Reported when translated.
+                    parsed = raw_request
+                    fingerprint = index
+                first = first_indexes.setdefault(fingerprint, index)
+                pending.append((index, source, first))
+                if first == index:
+                    yield index, (source, parsed)
 
-        :param str request: Raw HTTP request.
+        for result in cls._translate_all(unique_requests(), options, jobs):
+            # The first requests are translated in order, the duplicates read before are already resolved.
+            while pending:
+                index, source, first = pending.popleft()
+                if index == result.index:
+                    break
+                yield first_results[first]._replace(index=index, source=source, duplicate_of=first)
+            first_results[result.index] = result
+            yield result
+        for index, source, first in pending:
+            yield first_results[first]._replace(index=index, source=source, duplicate_of=first)
 
-        :raises ValueError: When request passed in malformed.
+    @staticmethod
+    def _split_source(request):
+        """Splits the source name of a request of a batch from the request.
 
-        :return: A tuple of two dictionaries where the first one is the headers and the second the details.
+        :param request: raw request (or :class:`hrt.parser.RawRequest`), optionally in a tuple of source name and raw
+            request.
+
+        :return: Tuple of source name, ``None`` if missing, and request.
         :rtype: tuple
         """
-        headers_lines = self.request.splitlines()
-        if not headers_lines:
-            raise ValueError("Request Malformed. Please Enter a Valid HTTP request.")
-        new_request_method = headers_lines.pop(0)
-        # Headers
-        host = ''
-        header_list = []
-        while headers_lines:
-            line = headers_lines.pop(0)
-            if not line.strip('\r\n'):  # Empty line? Therefore the headers are over and the content is starting.
-                break
-            header_list.append(line)
-            try:
-                header, value = line.split(":", 1)
-                # stripping one left blank space from value induced after split.
-                if value.startswith(' '):
-                    value = value[1:]
-            except ValueError:
-                raise ValueError("Headers Malformed. Please Enter a Valid HTTP request.")
-            if header.lower() == "host":
-                host = value.strip()  # Keep hostname for further checks
-        # Data
-        data = ''
-        if headers_lines:
-            data = ''.join(headers_lines)
-        # Details
-        details_dict = {}
-        details_dict['data'] = data
-        details_dict['method'] = new_request_method.split(' ', 1)[0].strip()
-        details_dict['Host'] = host
-        # Not using whatever stored in parsed_request for the reason to keep the request as original as possible
-        try:  # try to split the path from request if one is passed.
-            proto_ver = new_request_method.split(' ', 2)[2].split('/', 1)
-            details_dict['protocol'] = proto_ver[0].strip()
-            details_dict['version'] = proto_ver[1].strip()
-            details_dict['path'] = new_request_method.split(' ', 2)[1].strip()
-        except IndexError:
-            details_dict['path'] = ""
-            try:
-                proto_ver = new_request_method.split(' ', 2)[1].split('/', 1)
-            except IndexError:  # Failed to get protocol and version.
-                raise ValueError("Request Malformed. Please Enter a Valid HTTP request.")
-            details_dict['protocol'] = proto_ver[0].strip()
-            details_dict['version'] = proto_ver[1].strip()
-        # Parse the GET Path to update it to only contain the relative path and not whole url
-        # scheme://netloc/path;parameters?query#fragment
-        # Eg: Path=https://google.com/robots.txt to /robots.txt
-        scheme, netloc, path, params, query, frag = urlparse(details_dict['path'])
-        if params:
-            path = path + ";" + params
-        if query:
-            path = path + "?" + query
-        if frag:
-            path = path + "#" + frag
-        details_dict['path'] = path
-        # If scheme is specified in GET Path and Header 'Host' Field doesn't already starts with it
-        if scheme and not host.startswith(scheme):
-            details_dict['pre_scheme'] = scheme + "://"  # Store the scheme defined in GET path for later checks
-        else:
-            details_dict['pre_scheme'] = ''
+        if isinstance(request, tuple) and not isinstance(request, RawRequest):
+            return request
+        return None, request
 
-        return header_list, details_dict
+    @classmethod
+    def _translate(cls, index, request, languages=['bash'], proxy=None, search_string='', data=None, repeat=None,
+                   concurrency=None, keep_alive=None, first_match=False):
+        """Translates one request of a batch.
+
+        :param int index: Position of the request in the batch.
+        :param request: raw request (or :class:`hrt.parser.RawRequest`, or :class:`hrt.parser.ParsedRequest`),
+            optionally in a tuple of source name and raw request.
+
+        :return: Outcome of the translation.
+        :rtype: :class:`BatchResult`
+        """
+        source, request = cls._split_source(request)
+        if isinstance(request, ValueError):  # Malformed request of the input, see :func:`hrt.parser.iter_raw_requests`.
+            return BatchResult(index, source, None, request)
+        try:
+            codes = cls(
+                request=request,
+                languages=languages,
+                proxy=proxy,
+                search_string=search_string,
+                data=data,
+                repeat=repeat,
+                concurrency=concurrency,
+                keep_alive=keep_alive,
+                first_match=first_match).generate_code()
+        except ValueError as e:
+            return BatchResult(index, source, None, e)
+        return BatchResult(index, source, codes, None)
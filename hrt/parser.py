@@ -0,0 +1,661 @@
+"""
+
+:synopsis: Incremental parser for raw HTTP requests read from a byte stream.
+
+"""
+
+from collections import namedtuple
+from io import BytesIO
+try:
+    from sys import intern
+except ImportError:
+    pass  # Python 2.x, intern is a builtin.
+try:
+    from urlparse import urlsplit
+except ImportError:
+    from urllib.parse import urlsplit
+
+from .util import re_headers_end, re_request_line
+
+
+#: Raw request split in its three parts without further parsing: the request line, the list of header lines and the
+#: body.
+RawRequest = namedtuple('RawRequest', ['request_line', 'header_lines', 'data'])
+
+#: Part of a multipart/form-data body: the name of its field, its file name (``None`` for a plain field), its content
+#: type (empty if missing) and its data.
+BodyPart = namedtuple('BodyPart', ['name', 'filename', 'content_type', 'data'])
+
+#: Maximum number of pairs of header name and value shared between the parsed requests.
+HEADER_PAIRS_CACHE_SIZE = 4096
+
+#: Pairs of interned header name and value, by header line, shared by the parsed requests having the same header
+#: lines. Emptied when full, a lost entry only costs the split of its line again.
+_header_pairs_cache = {}
+
+
+class ParsedRequest(object):
+
+    """Compact representation of a parsed raw HTTP request.
+
+    The header lines are split once by the parser in pairs of name and value. The names are interned and the pairs are
+    shared, so that the requests of a corpus having the same header lines only keep references to them.
+    :attr:`header_lines`, :attr:`headers` and :attr:`details` rebuild the header lines and the details dictionary
+    returned by :func:`parse_raw_request`.
+
+    :ivar str method: Method of the request, e.g. 'GET'.
+    :ivar str path: Relative path of the request, with its query and fragment.
+    :ivar str protocol: Protocol of the request, e.g. 'HTTP'.
+    :ivar str version: Version of the protocol, e.g. '1.1'.
+    :ivar str pre_scheme: Scheme of the absolute target of the request, e.g. 'https://', empty if not needed.
+    :ivar str host: Value of the 'Host' header, empty if missing.
+    :ivar tuple header_pairs: Pairs of header name and value, e.g. ('Host', ' google.com').
+    :ivar str data: Body of the request.
+    :ivar str proxy_host: Proxy the request is sent through, with its scheme, ``None`` if not set.
+    :ivar str proxy_port: Port of the proxy, ``None`` if not set.
+    """
+
+    __slots__ = (
+        'method', 'path', 'protocol', 'version', 'pre_scheme', 'host', 'header_pairs', 'data', 'proxy_host',
+        'proxy_port')
+
+    def __init__(self, method, path, protocol, version, pre_scheme, host, header_pairs, data='', proxy_host=None,
+                 proxy_port=None):
+        self.method = method
+        self.path = path
+        self.protocol = protocol
+        self.version = version
+        self.pre_scheme = pre_scheme
+        self.host = host
+        self.header_pairs = header_pairs
+        self.data = data
+        self.proxy_host = proxy_host
+        self.proxy_port = proxy_port
+
+    @classmethod
+    def from_details(cls, headers, details):
+        """Builds a parsed request from a list of header lines and a details dictionary.
+
+        :param list headers: Headers list containing fields like 'Host', 'User-Agent', etc.
+        :param dict details: Request specific details dictionary like body and method of the request.
+
+        :raises ValueError: When a header line is malformed.
+
+        :return: The parsed request.
+        :rtype: :class:`ParsedRequest`
+        """
+        _, header_pairs = _split_header_lines(headers)
+        return cls(
+            details.get('method', ''),
+            details.get('path', ''),
+            details.get('protocol', ''),
+            details.get('version', ''),
+            details.get('pre_scheme', ''),
+            details.get('Host', ''),
+            header_pairs,
+            details.get('data', ''),
+            details.get('proxy_host'),
+            details.get('proxy_port'))
+
+    @property
+    def header_names(self):
+        """Names of the headers, e.g. 'Host'.
+
+        :rtype: tuple
+        """
+        return tuple([header for header, _ in self.header_pairs])
+
+    @property
+    def header_values(self):
+        """Values of the headers, in the order of the names, e.g. ' google.com'.
+
+        :rtype: tuple
+        """
+        return tuple([value for _, value in self.header_pairs])
+
+    @property
+    def header_lines(self):
+        """Header lines of the request, e.g. 'Host: google.com'.
+
+        :rtype: tuple
+        """
+        return tuple([header + ':' + value for header, value in self.header_pairs])
+
+    @property
+    def headers(self):
+        """Header lines of the request, e.g. 'Host: google.com'.
+
+        :rtype: list
+        """
+        return [header + ':' + value for header, value in self.header_pairs]
+
+    @property
+    def details(self):
+        """Details dictionary of the request, as returned by :func:`parse_raw_request`.
+
+        :rtype: dict
+        """
+        details_dict = {
+            'data': self.data,
+            'method': self.method,
+            'Host': self.host,
+            'protocol': self.protocol,
+            'version': self.version,
+            'path': self.path,
+            'pre_scheme': self.pre_scheme,
+        }
+        if self.proxy_host is not None:
+            details_dict['proxy_host'] = self.proxy_host
+            details_dict['proxy_port'] = self.proxy_port
+        return details_dict
+
+    def __eq__(self, other):
+        if not isinstance(other, ParsedRequest):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%s)' % (
+            self.__class__.__name__, ', '.join('%s=%r' % (name, getattr(self, name)) for name in self.__slots__))
+
+
+def _parse_request_line(request_line):
+    """Splits the request line of a raw HTTP request in its method, path, protocol and version.
+
+    When the path is missing, e.g. 'GET HTTP/1.1', the path is empty.
+
+    :param str request_line: Request line of the request, e.g. 'GET /robots.txt HTTP/1.1'.
+
+    :raises ValueError: When the protocol and version are missing.
+
+    :return: A tuple of the method, path, protocol and version.
+    :rtype: tuple
+    """
+    method, _, target = request_line.partition(' ')
+    path, space, protocol = target.partition(' ')
+    if space:
+        protocol, slash, version = protocol.partition('/')
+        if slash:
+            return method.strip(), path.strip(), protocol.strip(), version.strip()
+    # No path, the target is the protocol and version.
+    protocol, slash, version = path.partition('/')
+    if not slash:  # Failed to get protocol and version.
+        raise ValueError("Request Malformed. Please Enter a Valid HTTP request.")
+    return method.strip(), '', protocol.strip(), version.strip()
+
+
+def _split_target(target, host):
+    """Splits the target of a raw HTTP request in its relative path and the scheme it is sent with.
+
+    :param str target: Target of the request, e.g. '/robots.txt' or 'https://google.com/robots.txt'.
+    :param str host: Value of the 'Host' header, empty if missing.
+
+    :return: A tuple of the relative path, with its query and fragment, and of the scheme, empty if not needed.
+    :rtype: tuple
+    """
+    # Parse the GET Path to update it to only contain the relative path and not whole url
+    # scheme://netloc/path;parameters?query#fragment
+    # Eg: Path=https://google.com/robots.txt to /robots.txt
+    scheme, netloc, path, query, frag = urlsplit(target)
+    if query:
+        path = path + "?" + query
+    if frag:
+        path = path + "#" + frag
+    # If scheme is specified in GET Path and Header 'Host' Field doesn't already starts with it, store the scheme
+    # defined in GET path for later checks
+    if scheme and not host.startswith(scheme):
+        return path, scheme + "://"
+    return path, ''
+
+
+def _get_details(request_line, host, data):
+    """Builds the details of a raw HTTP request from its parts.
+
+    :param str request_line: Request line of the request, e.g. 'GET /robots.txt HTTP/1.1'.
+    :param str host: Value of the 'Host' header, empty if missing.
+    :param str data: Body of the request.
+
+    :raises ValueError: When the request line is malformed.
+
+    :return: The details of the request.
+    :rtype: dict
+    """
+    method, target, protocol, version = _parse_request_line(request_line)
+    path, pre_scheme = _split_target(target, host)
+    return {
+        'data': data,
+        'method': method,
+        'Host': host,
+        'protocol': protocol,
+        'version': version,
+        'path': path,
+        'pre_scheme': pre_scheme,
+    }
+
+
+def _get_host(header_lines):
+    """Checks the header lines of a raw HTTP request and extracts its host.
+
+    :param iterable header_lines: Header lines of the request, e.g. 'Host: google.com'.
+
+    :raises ValueError: When a header line is malformed.
+
+    :return: The value of the 'Host' header, empty if missing.
+    :rtype: str
+    """
+    host = ''
+    for line in header_lines:
+        if ':' not in line:
+            raise ValueError("Headers Malformed. Please Enter a Valid HTTP request.")
+        if line[4:5] == ':' and line[:4].lower() == 'host':
+            host = line[5:].strip()  # Keep hostname for further checks
+    return host
+
+
+def _split_header_lines(header_lines):
+    """Checks the header lines of a raw HTTP request, splits them in pairs of name and value and extracts its host.
+
+    The names are interned, and the pairs are shared with the requests having the same header lines.
+
+    :param iterable header_lines: Header lines of the request, e.g. 'Host: google.com'.
+
+    :raises ValueError: When a header line is malformed.
+
+    :return: A tuple of the value of the 'Host' header, empty if missing, and of the pairs of header name and value.
+    :rtype: tuple
+    """
+    host = ''
+    pairs = []
+    cache = _header_pairs_cache
+    for line in header_lines:
+        pair = cache.get(line)
+        if pair is None:
+            header, colon, value = line.partition(':')
+            if not colon:
+                raise ValueError("Headers Malformed. Please Enter a Valid HTTP request.")
+            pair = (intern(header), value)
+            if len(cache) >= HEADER_PAIRS_CACHE_SIZE:
+                cache.clear()
+            cache[line] = pair
+        if len(pair[0]) == 4 and pair[0].lower() == 'host':
+            host = pair[1].strip()  # Keep hostname for further checks
+        pairs.append(pair)
+    return host, tuple(pairs)
+
+
+def parse_request(request_line, header_lines, data=''):
+    """Parses the parts of a raw HTTP request into a list of headers and a dictionary of details.
+
+    :param str request_line: Request line of the request, e.g. 'GET /robots.txt HTTP/1.1'.
+    :param iterable header_lines: Header lines of the request, e.g. 'Host: google.com'.
+    :param str data: Body of the request.
+
+    :raises ValueError: When request passed in malformed.
+
+    :return: A tuple of two dictionaries where the first one is the headers and the second the details.
+    :rtype: tuple
+    """
+    header_list = list(header_lines)
+    return header_list, _get_details(request_line, _get_host(header_list), data)
+
+
+def parse_raw_request(request, encoding='utf-8'):
+    """Parses a raw HTTP request into a list of headers and a dictionary of details.
+
+    :param request: Raw HTTP request, as text or bytes.
+    :type request: str or bytes
+    :param str encoding: Encoding used to decode `request` when given as bytes.
+
+    :raises ValueError: When request passed in malformed.
+
+    :return: A tuple of two dictionaries where the first one is the headers and the second the details.
+    :rtype: tuple
+    """
+    request_line, header_lines, data = split_raw_request(request, encoding)
+    return header_lines, _get_details(request_line, _get_host(header_lines), data)
+
+
+def parse_compact_request(request, encoding='utf-8'):
+    """Parses a raw HTTP request into its compact representation.
+
+    :param request: Raw HTTP request, as text or bytes, or :class:`RawRequest`.
+    :type request: str or bytes or RawRequest
+    :param str encoding: Encoding used to decode `request` when given as bytes.
+
+    :raises ValueError: When request passed in malformed.
+
+    :return: The parsed request.
+    :rtype: :class:`ParsedRequest`
+    """
+    if not isinstance(request, RawRequest):
+        request = split_raw_request(request, encoding)
+    host, header_pairs = _split_header_lines(request.header_lines)
+    method, target, protocol, version = _parse_request_line(request.request_line)
+    path, pre_scheme = _split_target(target, host)
+    return ParsedRequest(method, path, protocol, version, pre_scheme, host, header_pairs, request.data)
+
+
+def split_raw_request(request, encoding='utf-8'):
+    """Splits a raw HTTP request in its request line, header lines and body.
+
+    The end of the headers is searched once, accepting any mix of LF, CRLF and bare CR line breaks, then the header
+    lines are split from each other and the body is a single slice of `request` keeping its line breaks, without the
+    leading and trailing ones. A body sent with the chunked transfer coding is decoded, unless it is not validly
+    chunked.
+
+    :param request: Raw HTTP request, as text or bytes.
+    :type request: str or bytes
+    :param str encoding: Encoding used to decode `request` when given as bytes.
+
+    :raises ValueError: When request is empty.
+
+    :return: The parts of the request.
+    :rtype: :class:`RawRequest`
+    """
+    if isinstance(request, bytes):
+        request = request.decode(encoding, 'replace')
+    start = 0
+    while request.startswith(('\r', '\n'), start):  # Skip the leading blank lines.
+        start += 1
+    if start == len(request):
+        raise ValueError("Request Malformed. Please Enter a Valid HTTP request.")
+    # Empty line? Therefore the headers are over and the content is starting.
+    match = re_headers_end.search(request, start)
+    if match is not None:
+        end, body_start = match.span()
+    elif '\n' not in request:  # Bare CR line breaks.
+        end = request.find('\r\r', start)
+        body_start = end + 2
+    else:
+        end = -1
+    if end < 0:
+        lines = request[start:].splitlines()
+        data = ''
+    else:
+        lines = request[start:end].splitlines()
+        data = request[body_start:].strip('\r\n')
+        if is_chunked(lines[1:]):
+            try:
+                data = decode_chunked(data, encoding)
+            except ValueError:  # Body pasted already decoded, keep it as is.
+                pass
+    return RawRequest(lines[0], lines[1:], data)
+
+
+def is_chunked(header_lines):
+    """Checks whether the body of a raw HTTP request is sent with the chunked transfer coding.
+
+    :param iterable header_lines: Header lines of the request, e.g. 'Transfer-Encoding: chunked'.
+
+    :rtype: bool
+    """
+    for line in header_lines:
+        header, _, value = line.partition(':')
+        if header.strip().lower() == 'transfer-encoding' and 'chunked' in value.lower():
+            return True
+    return False
+
+
+def iter_chunks(stream, strict=False):
+    """Decodes a body sent with the chunked transfer coding, one chunk at a time. The trailers are skipped.
+
+    :param file stream: Binary stream positioned right after the blank line ending the headers. It is left right after
+        the body.
+    :param bool strict: Whether a truncated body is an error. Otherwise, the chunks read so far are kept.
+
+    :raises ValueError: When a chunk size is malformed, or the body is truncated in strict mode.
+
+    :return: Generator of the data of the chunks.
+    :rtype: generator
+    """
+    while True:
+        line = stream.readline()
+        if not line:  # Truncated capture.
+            break
+        try:
+            size = int(line.split(b';', 1)[0].strip(), 16)
+        except ValueError:
+            raise ValueError("Chunked body Malformed. Please Enter a Valid HTTP request.")
+        if not size:
+            while stream.readline().strip(b'\r\n'):  # Skip the trailers.
+                pass
+            return
+        chunk = stream.read(size)
+        if len(chunk) < size:  # Truncated capture.
+            yield chunk
+            break
+        yield chunk
+        stream.readline()  # CRLF ending the chunk.
+    if strict:
+        raise ValueError("Chunked body Truncated. Please Enter a Valid HTTP request.")
+
+
+def decode_chunked(data, encoding='utf-8'):
+    """Decodes a body sent with the chunked transfer coding.
+
+    The chunk sizes count bytes, so the body is encoded back before being decoded.
+
+    :param str data: Chunked body.
+    :param str encoding: Encoding of the body.
+
+    :raises ValueError: When a chunk size is malformed or the body is truncated.
+
+    :return: The decoded body.
+    :rtype: str
+    """
+    return b''.join(iter_chunks(BytesIO(data.encode(encoding)), strict=True)).decode(encoding, 'replace')
+
+
+def _parse_header_value(value):
+    """Splits a header value in its main value and its parameters, e.g. 'form-data; name="file"'.
+
+    :param str value: Value of the header.
+
+    :return: A tuple of the lower cased main value and of the parameters by lower cased name, unquoted.
+    :rtype: tuple
+    """
+    main, _, rest = value.partition(';')
+    parameters = {}
+    while rest:
+        name, _, rest = rest.partition('=')
+        rest = rest.lstrip()
+        if rest.startswith('"'):  # Quoted value, may contain semicolons.
+            end = rest.find('"', 1)
+            while end > 0 and rest[end - 1] == '\\':
+                end = rest.find('"', end + 1)
+            if end < 0:
+                end = len(rest)
+            parameter = rest[1:end].replace('\\"', '"')
+            rest = rest[end + 1:].partition(';')[2]
+        else:
+            parameter, _, rest = rest.partition(';')
+            parameter = parameter.strip()
+        parameters[name.strip().lower()] = parameter
+    return main.strip().lower(), parameters
+
+
+def get_multipart_boundary(header_lines):
+    """Boundary of a multipart/form-data body, from the 'Content-Type' header of the request.
+
+    :param iterable header_lines: Header lines of the request, e.g. 'Content-Type: multipart/form-data; boundary=x'.
+
+    :return: The boundary, ``None`` when the body is not multipart/form-data.
+    :rtype: str
+    """
+    for line in header_lines:
+        header, _, value = line.partition(':')
+        if header.strip().lower() == 'content-type':
+            content_type, parameters = _parse_header_value(value)
+            if content_type == 'multipart/form-data' and parameters.get('boundary'):
+                return parameters['boundary']
+            return None
+    return None
+
+
+def iter_multipart(data, boundary):
+    """Splits a multipart/form-data body in its parts, one part at a time.
+
+    The body is scanned as the parts are consumed, the data of each part is a slice of `data`.
+
+    :param str data: Multipart body.
+    :param str boundary: Boundary of the parts, see :func:`get_multipart_boundary`.
+
+    :raises ValueError: When the body does not start with the boundary.
+
+    :return: Generator of :class:`BodyPart`.
+    :rtype: generator
+    """
+    delimiter = '--' + boundary
+    position = data.find(delimiter)
+    if position < 0:
+        raise ValueError("Multipart body Malformed. Please Enter a Valid HTTP request.")
+    while True:
+        position += len(delimiter)
+        if data.startswith('--', position):  # Closing delimiter.
+            return
+        end = data.find('\n', position)
+        if end < 0:  # Truncated capture.
+            return
+        line_break = '\r\n' if data[end - 1] == '\r' else '\n'
+        position = end + 1
+        # Headers of the part
+        end = data.find(line_break + line_break, position - len(line_break))
+        if end < 0:
+            return
+        name = filename = None
+        content_type = ''
+        for line in data[position:end].split(line_break):
+            header, _, value = line.partition(':')
+            header = header.strip().lower()
+            if header == 'content-disposition':
+                _, parameters = _parse_header_value(value)
+                name = parameters.get('name', '')
+                filename = parameters.get('filename')
+            elif header == 'content-type':
+                content_type = value.strip()
+        position = end + 2 * len(line_break)
+        # Data of the part, up to the next delimiter.
+        end = data.find(line_break + delimiter, position)
+        if end < 0:  # Truncated capture, keep what has been read so far.
+            yield BodyPart(name, filename, content_type, data[position:])
+            return
+        yield BodyPart(name, filename, content_type, data[position:end])
+        position = end + len(line_break)
+
+
+def iter_raw_requests(stream, encoding='utf-8', yield_errors=False):
+    """Splits the concatenated raw HTTP requests of a binary stream, one request at a time.
+
+    The end of the body of a request is found with its 'Content-Length' header or its chunked transfer coding. When
+    the request has neither, the body lasts until the next request line or the end of the stream. A request whose
+    chunked body is malformed is skipped up to the next request line, so that the next requests can still be read.
+
+    Only the request being read is held in memory, so arbitrarily large streams can be processed.
+
+    :param file stream: Binary stream of raw HTTP requests (a text stream is accepted too).
+    :param str encoding: Encoding used to decode the requests.
+    :param bool yield_errors: Whether the error of a malformed request is yielded in place of the request, instead of
+        being raised.
+
+    :raises ValueError: When a chunked body is malformed and `yield_errors` is not set.
+
+    :return: Generator of :class:`RawRequest`, and of `ValueError` for the malformed requests when `yield_errors` is
+        set.
+    :rtype: generator
+    """
+    def decode(line):
+        if isinstance(line, bytes):
+            return line.decode(encoding, 'replace')
+        return line
+
+    def read_until_request_line():
+        # Lines up to the next request line, kept in `pending`, or the end of the stream.
+        lines = []
+        while True:
+            line = stream.readline()
+            if not line:
+                return lines, None
+            if re_request_line.match(decode(line)):
+                return lines, line
+            lines.append(decode(line))
+
+    pending = None
+    while True:
+        # Request line, skipping the blank lines between two requests.
+        request_line = pending if pending is not None else stream.readline()
+        pending = None
+        while request_line and not request_line.strip():
+            request_line = stream.readline()
+        if not request_line:
+            break
+        # Headers
+        header_lines = []
+        content_length = None
+        chunked = False
+        while True:
+            line = stream.readline()
+            line = decode(line).rstrip('\r\n')
+            if not line:  # Empty line? Therefore the headers are over and the content is starting.
+                break
+            header_lines.append(line)
+            header, _, value = line.partition(':')
+            header = header.strip().lower()
+            if header == 'content-length':
+                try:
+                    content_length = int(value.strip())
+                except ValueError:
+                    pass
+            elif header == 'transfer-encoding' and 'chunked' in value.lower():
+                chunked = True
+        # Data
+        if chunked:
+            try:
+                data = decode(b''.join(iter_chunks(stream)))
+            except ValueError as error:
+                _, pending = read_until_request_line()
+                if not yield_errors:
+                    raise
+                yield error
+                continue
+        elif content_length is not None:
+            data = decode(stream.read(content_length))
+        else:
+            body_lines, pending = read_until_request_line()
+            data = ''.join(body_lines).strip('\r\n')
+        yield RawRequest(decode(request_line).rstrip('\r\n'), header_lines, data)
+
+
+def iter_requests(stream, encoding='utf-8'):
+    """Parses the concatenated raw HTTP requests of a binary stream, one request at a time.
+
+    :param file stream: Binary stream of raw HTTP requests (a text stream is accepted too).
+    :param str encoding: Encoding used to decode the requests.
+
+    :raises ValueError: When a request is malformed.
+
+    :return: Generator of tuples of headers list and details dictionary, as returned by :func:`parse_request`.
+    :rtype: generator
+    """
+    for raw_request in iter_raw_requests(stream, encoding=encoding):
+        yield parse_request(*raw_request)
+
+
+def iter_compact_requests(stream, encoding='utf-8'):
+    """Parses the concatenated raw HTTP requests of a binary stream into their compact representation.
+
+    :param file stream: Binary stream of raw HTTP requests (a text stream is accepted too).
+    :param str encoding: Encoding used to decode the requests.
+
+    :raises ValueError: When a request is malformed.
+
+    :return: Generator of :class:`ParsedRequest`.
+    :rtype: generator
+    """
+    for raw_request in iter_raw_requests(stream, encoding=encoding):
+        yield parse_compact_request(raw_request)
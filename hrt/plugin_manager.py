@@ -1,12 +1,90 @@
 from __future__ import print_function
 
-from .base import AbstractScript
-from .script import BashScript, PHPScript, PythonScript, RubyScript
+from importlib import import_module
+
+from .request import prepare_request
+
+
+#: Entry point group of the script classes of third-party languages, e.g. in a `setup.py`::
+#:
+#:     entry_points={'hrt.scripts': ['lua = hrt_lua.script:LuaScript']}
+ENTRY_POINT_GROUP = 'hrt.scripts'
+
+#: Script classes of the built-in languages, by language name. Imported when the language is first requested.
+BUILTIN_SCRIPTS = {
+    'bash': 'hrt.script:BashScript',
+    'bash_parallel': 'hrt.script:BashParallelScript',
+    'php': 'hrt.script:PHPScript',
+    'python': 'hrt.script:PythonScript',
+    'python_asyncio': 'hrt.script:PythonAsyncioScript',
+    'python_load': 'hrt.script:PythonLoadScript',
+    'ruby': 'hrt.script:RubyScript',
+}
+
+#: Script classes of the languages, by language name: classes, 'module:class' paths or entry points.
+_registry = dict(BUILTIN_SCRIPTS)
+#: Script classes already imported, by language name.
+_script_classes = {}
+#: Whether the entry points of the third-party languages are in `_registry` yet.
+_entry_points_loaded = False
+
+
+def _iter_entry_points():
+    """Entry points of the script classes of the installed third-party languages.
+
+    :return: List of entry points, having a `name` and a `load` method.
+    :rtype: list
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python < 3.8
+        try:
+            from pkg_resources import iter_entry_points
+        except ImportError:
+            return []
+        return list(iter_entry_points(ENTRY_POINT_GROUP))
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, 'select'):  # Python 3.10+
+        return list(all_entry_points.select(group=ENTRY_POINT_GROUP))
+    return list(all_entry_points.get(ENTRY_POINT_GROUP, []))
+
+
+def _load_entry_points():
+    """Adds the third-party languages to the registry, once. The built-in and registered languages take precedence."""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    for entry_point in _iter_entry_points():
+        _registry.setdefault(entry_point.name.strip().lower(), entry_point)
+
+
+def register_script(script_name, script_class):
+    """Registers the script class of a language, replacing the previous one.
+
+    :param str script_name: Language name, e.g. 'lua'.
+    :param script_class: Script class, or its 'module:class' path imported when the language is first requested.
+    """
+    script_name = script_name.strip().lower()
+    _registry[script_name] = script_class
+    _script_classes.pop(script_name, None)
+
+
+def get_languages():
+    """Returns the names of all the available languages, third-party ones included.
+
+    :return: Sorted list of language names.
+    :rtype: list
+    """
+    _load_entry_points()
+    return sorted(_registry)
 
 
 def get_script_class(script_name):
     """Returns the class of the script.
 
+    The module of the class is imported when the language is first requested.
+
     :param str script_name: language name of the script class which we want to import
 
     :raises ValueError: When the script is not supported.
@@ -15,11 +93,23 @@ def get_script_class(script_name):
     :rtype: :class:`AbstractScript`
     """
     script_name = script_name.strip().lower()
-
-    for script_class in AbstractScript.__subclasses__():
-        if script_name == script_class.__language__:
-            return script_class
-    raise ValueError("The {} language is not supported.".format(script_name))
+    try:
+        return _script_classes[script_name]
+    except KeyError:
+        pass
+    if script_name not in _registry:
+        _load_entry_points()
+        if script_name not in _registry:
+            raise ValueError("The {} language is not supported.".format(script_name))
+    script_class = _registry[script_name]
+    if not isinstance(script_class, type):
+        if hasattr(script_class, 'load'):  # Entry point
+            script_class = script_class.load()
+        else:  # 'module:class' path
+            module_name, _, class_name = script_class.partition(':')
+            script_class = getattr(import_module(module_name), class_name)
+    _script_classes[script_name] = script_class
+    return script_class
 
 
 def generate_script(script, headers, details, search_string=None):
@@ -30,8 +120,20 @@ def generate_script(script, headers, details, search_string=None):
     :param dict details: Details information
     :param str search_string: string to be searched for in the response for given request
 
+    :return: A combined string of generated code
+    :rtype: `str`
+    """
+    return render_script(script, prepare_request(headers, details, search_string))
+
+
+def render_script(script, prepared):
+    """Returns the script code for an already prepared HTTP request in script language
+
+    :param str script: Name of the language for which script is to be generated
+    :param `PreparedRequest` prepared: Request prepared by :func:`hrt.request.prepare_request`
+
     :return: A combined string of generated code
     :rtype: `str`
     """
     class_script = get_script_class(script.strip().lower())
-    return class_script(headers=headers, details=details, search=search_string).generate_script()
+    return class_script(prepared=prepared).generate_script()
@@ -0,0 +1,288 @@
+"""
+
+:synopsis: Define the language independent representation of a request shared by all the scripts.
+
+"""
+
+from collections import namedtuple
+try:
+    from urllib import quote, urlencode
+    from urlparse import parse_qsl
+except ImportError:
+    from urllib.parse import quote, urlencode, parse_qsl
+
+from .url import create_valid_url
+
+
+#: Names of the headers and parameters masked when canonicalizing a request, their values change from one capture of
+#: the same request to the next.
+VOLATILE_FIELDS = frozenset([
+    'cookie', 'date', 'if-modified-since', 'if-none-match', 'x-request-id', 'x-csrf-token', 'x-xsrf-token',
+    'csrf_token', 'csrfmiddlewaretoken', '_'])
+
+#: Value replacing the volatile fields of a canonical request.
+MASK = '*'
+
+#: Part of a multipart form sent by the scripts (see the 'form_parts' detail): the name of its field, and either its
+#: value for a plain field, or the path of the file uploaded with its file name and content type.
+FormPart = namedtuple('FormPart', ['name', 'value', 'path', 'filename', 'content_type'])
+
+#: Names of the headers describing a multipart body, dropped by the scripts building the form themselves.
+FORM_HEADERS = frozenset(['content-type', 'content-length'])
+
+#: Lower cased methods whose body is sent in the query of the URL, see :func:`encode_url`.
+URL_ENCODED_METHODS = frozenset(['head', 'options', 'get'])
+
+
+def escape(value):
+    """Escape the double quotes of a value to be embedded in a double quoted string literal.
+
+    :param str value: Value to escape.
+
+    :return: Escaped value.
+    :rtype: str
+    """
+    return value.replace('"', '\\"')
+
+
+def escape_literal(value):
+    """Escape a value to be embedded in a double quoted string literal of Python: the backslashes, the double quotes
+    and the line breaks, so that a multi-line body stays on the line of its literal.
+
+    :param str value: Value to escape.
+
+    :return: Escaped value.
+    :rtype: str
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\r', '\\r').replace('\n', '\\n')
+
+
+def escape_php(value):
+    """Escape a value to be embedded in a double quoted string literal of PHP, see :func:`escape_literal`. The dollar
+    signs are escaped too, they would start the interpolation of a variable.
+
+    :param str value: Value to escape.
+
+    :return: Escaped value.
+    :rtype: str
+    """
+    return escape_literal(value).replace('$', '\\$')
+
+
+def escape_ruby(value):
+    """Escape a value to be embedded in a double quoted string literal of Ruby, see :func:`escape_literal`. The hash
+    signs are escaped too, they would start the interpolation of an expression.
+
+    :param str value: Value to escape.
+
+    :return: Escaped value.
+    :rtype: str
+    """
+    return escape_literal(value).replace('#', '\\#')
+
+
+def split_headers(headers):
+    """Split header lines in pairs of name and value.
+
+    :param iterable headers: Header lines, e.g. 'Host: google.com'.
+
+    :raises ValueError: When a header line has no colon.
+
+    :return: List of pairs of header name and value, e.g. ('Host', ' google.com').
+    :rtype: list
+    """
+    pairs = []
+    for item in headers:
+        header, value = item.split(':', 1)
+        pairs.append((header, value))
+    return pairs
+
+
+def escape_headers(headers, escape_function=escape):
+    """Split and escape header lines.
+
+    :param iterable headers: Header lines, e.g. 'Host: google.com'.
+    :param function escape_function: Escaping scheme applied to the names and values.
+
+    :raises ValueError: When a header line has no colon.
+
+    :return: List of pairs of escaped header name and value.
+    :rtype: list
+    """
+    return [(escape_function(header), escape_function(value)) for header, value in split_headers(headers)]
+
+
+class PreparedRequest(namedtuple('PreparedRequest', ['headers', 'details', 'url', 'search', 'header_pairs',
+                                                     'escape_cache'])):
+
+    """Immutable representation of a request, computed once and rendered by the script of every language.
+
+    :ivar tuple headers: Header lines of the request, e.g. 'Host: google.com'.
+    :ivar dict details: Request specific details dictionary like body and method of the request. Must not be modified.
+    :ivar str url: Encoded URL of the request.
+    :ivar str search: String to search for in the response to the request.
+    :ivar tuple header_pairs: Pairs of header name and value, e.g. ('Host', ' google.com').
+    :ivar dict escape_cache: Escaped headers and body, by escaping scheme. Filled by :meth:`escaped_headers` and
+        :meth:`escaped_data`.
+    """
+
+    __slots__ = ()
+
+    def escaped_headers(self, escape_function=escape):
+        """Headers escaped with an escaping scheme, computed once per scheme.
+
+        :param function escape_function: Escaping scheme applied to the names and values.
+
+        :return: Pairs of escaped header name and value.
+        :rtype: tuple
+        """
+        key = ('headers', escape_function)
+        try:
+            return self.escape_cache[key]
+        except KeyError:
+            pairs = tuple((escape_function(header), escape_function(value)) for header, value in self.header_pairs)
+            return self.escape_cache.setdefault(key, pairs)
+
+    def escaped_data(self, escape_function=escape):
+        """Body escaped with an escaping scheme, computed once per scheme.
+
+        :param function escape_function: Escaping scheme applied to the body.
+
+        :return: Escaped body.
+        :rtype: str
+        """
+        key = ('data', escape_function)
+        try:
+            return self.escape_cache[key]
+        except KeyError:
+            return self.escape_cache.setdefault(key, escape_function(self.details.get('data', '')))
+
+
+def create_url(details):
+    """Create valid URL.
+
+    :param dict details: Request specific details dictionary like 'Host', 'pre_scheme' and 'path'.
+
+    :raises ValueError: When URL is invalid.
+
+    :return: Created URL.
+    :rtype: str
+    """
+    return create_valid_url(details.get('Host', ''), details.get('pre_scheme', ''), details.get('path', ''))
+
+
+def encode_url(url, details):
+    """Check if the URL of the HTTP request needs encoding.
+
+    :param str url: URL to encode if needed.
+    :param dict details: Request specific details dictionary like body and method of the request.
+
+    :return: Encoded URL if encoding is needed.
+    :rtype: str
+    """
+    encoded_url = url
+    if details.get('data') and (details.get('method', '').lower() in URL_ENCODED_METHODS):
+        encoded_url += quote(details['data'], '')
+    return encoded_url
+
+
+def prepare_request(headers, details, search=None, header_pairs=None):
+    """Prepare a request once so that the scripts of all the languages can be rendered from it.
+
+    :param list headers: Headers list containing fields like 'Host', 'User-Agent', etc.
+    :param dict details: Request specific details dictionary like body and method of the request.
+    :param str search: String to search for in the response to the request.
+    :param tuple header_pairs: Pairs of header name and value of `headers` when already split, e.g. by
+        :func:`hrt.parser.parse_compact_request`.
+
+    :raises ValueError: When URL is invalid, invalid `headers` or `details` values.
+
+    :return: The prepared request.
+    :rtype: :class:`PreparedRequest`
+    """
+    if not headers:
+        raise ValueError("'headers' cannot be equal to '%s'" % headers)
+    elif not details:
+        raise ValueError("'details' cannot be equal to '%s'" % details)
+    return PreparedRequest(
+        headers=tuple(headers),
+        details=dict(details),
+        url=encode_url(create_url(details), details),
+        search=search,
+        header_pairs=tuple(split_headers(headers)) if header_pairs is None else tuple(header_pairs),
+        escape_cache={})
+
+
+def _canonicalize_parameters(query, volatile_fields):
+    """Sort urlencoded parameters and mask the volatile ones.
+
+    :param str query: Urlencoded parameters, e.g. 'b=2&a=1'.
+    :param set volatile_fields: Lower case names of the parameters to mask.
+
+    :return: Canonical urlencoded parameters.
+    :rtype: str
+    """
+    parameters = [
+        (name, MASK if name.lower() in volatile_fields else value)
+        for name, value in parse_qsl(query, keep_blank_values=True)]
+    return urlencode(sorted(parameters))
+
+
+def canonicalize_request(headers, details, volatile_fields=VOLATILE_FIELDS, header_pairs=None):
+    """Canonical form of a request, identical for the captures of a same request.
+
+    The header names are lower cased, the headers and the parameters of the query and of urlencoded bodies are sorted,
+    and the values of the volatile headers and parameters are masked.
+
+    :param list headers: Headers list containing fields like 'Host', 'User-Agent', etc.
+    :param dict details: Request specific details dictionary like body and method of the request.
+    :param set volatile_fields: Lower case names of the headers and parameters to mask.
+    :param tuple header_pairs: Pairs of header name and value of `headers` when already split, `headers` is then
+        not used.
+
+    :raises ValueError: When a header line has no colon.
+
+    :return: Canonical method, scheme, host, path, query, headers and body of the request.
+    :rtype: tuple
+    """
+    canonical_headers = []
+    form = False
+    for header, value in split_headers(headers) if header_pairs is None else header_pairs:
+        header = header.strip().lower()
+        value = value.strip()
+        if header == 'content-type' and 'x-www-form-urlencoded' in value.lower():
+            form = True
+        canonical_headers.append((header, MASK if header in volatile_fields else value))
+    canonical_headers.sort()
+    path, _, query = details.get('path', '').partition('?')
+    data = details.get('data', '')
+    if form and data:
+        data = _canonicalize_parameters(data, volatile_fields)
+    return (
+        details.get('method', '').strip().upper(),
+        details.get('pre_scheme', ''),
+        details.get('Host', '').lower(),
+        path,
+        _canonicalize_parameters(query, volatile_fields),
+        tuple(canonical_headers),
+        data)
+
+
+def fingerprint_request(headers, details, volatile_fields=VOLATILE_FIELDS, header_pairs=None):
+    """Hash of the canonical form of a request, see :func:`canonicalize_request`.
+
+    :param list headers: Headers list containing fields like 'Host', 'User-Agent', etc.
+    :param dict details: Request specific details dictionary like body and method of the request.
+    :param set volatile_fields: Lower case names of the headers and parameters to mask.
+    :param tuple header_pairs: Pairs of header name and value of `headers` when already split, `headers` is then
+        not used.
+
+    :raises ValueError: When a header line has no colon.
+
+    :return: Hexadecimal SHA-1 digest.
+    :rtype: str
+    """
+    import hashlib  # Only batch deduplication needs it, keep the startup fast.
+
+    canonical = canonicalize_request(headers, details, volatile_fields, header_pairs)
+    return hashlib.sha1(repr(canonical).encode('utf-8')).hexdigest()
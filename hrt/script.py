@@ -5,6 +5,33 @@
 """
 
 from .base import AbstractScript
+from .request import escape_literal, escape_php, escape_ruby, split_headers
+
+
+#: Sections of the scripts generating the headers in their beginning, see
+#: :attr:`hrt.base.AbstractScript.__sections__`. Their request section only depends on the search.
+HEADERS_FIRST_SECTIONS = AbstractScript.__sections__[:-1] + (('request', frozenset(['search'])),)
+
+#: Default number of times the load testing scripts send the request.
+DEFAULT_REPEAT = 100
+#: Default number of requests the load testing scripts keep in flight at the same time.
+DEFAULT_CONCURRENCY = 10
+
+
+def get_load_options(details):
+    """Load testing options of a request, with defaults for the missing ones.
+
+    :param dict details: Request specific details dictionary, optionally with 'repeat', 'concurrency' and
+        'keep_alive'.
+
+    :return: Tuple of the number of requests to send, of the number of requests in flight at the same time and of
+        whether the connections are reused.
+    :rtype: tuple
+    """
+    repeat = details.get('repeat') or DEFAULT_REPEAT
+    concurrency = min(details.get('concurrency') or DEFAULT_CONCURRENCY, repeat)
+    keep_alive = details.get('keep_alive') is not False
+    return repeat, concurrency, keep_alive
 
 
 class BashScript(AbstractScript):
@@ -15,15 +42,41 @@ class BashScript(AbstractScript):
     """
 
     __language__ = 'bash'
+    __extension__ = 'sh'
 
     def _generate_request(self):
         code = self.code_nosearch.format(
             method=self.details.get('method', ''),
             url=self.url,
             headers=self._generate_headers())
+        if self.search and self.code_search:  # The response of the command is piped to the search.
+            code += self._generate_search(self.search)
         return code
 
 
+class BashParallelScript(BashScript):
+
+    """Extended `BashScript` class for Bash script code generation, sending the request many times in parallel.
+    Fills code variables for the request from `bash_parallel_template`.
+    Overrides `_generate_begin` method to generate the load testing options.
+    Overrides `_generate_request` method to place the search before the requests are sent.
+    """
+
+    __language__ = 'bash_parallel'
+    __extension__ = 'parallel.sh'
+
+    def _generate_begin(self):
+        repeat, concurrency, keep_alive = get_load_options(self.details)
+        return self.code_begin.format(repeat=repeat, concurrency=concurrency, keep_alive=int(keep_alive))
+
+    def _generate_request(self):
+        return self.code_nosearch.format(
+            method=self.details.get('method', ''),
+            url=self.url,
+            headers=self._generate_headers(),
+            search=self._generate_search(self.search) if self.search else '')
+
+
 class PHPScript(AbstractScript):
 
     """Extended `AbstractScript` class for PHP script code generation.
@@ -32,6 +85,9 @@ class PHPScript(AbstractScript):
     """
 
     __language__ = 'php'
+    __extension__ = 'php'
+    __sections__ = HEADERS_FIRST_SECTIONS
+    escape = staticmethod(escape_php)
 
     def _generate_begin(self):
         return self.code_begin.format(url=self.url) + self._generate_headers()
@@ -45,11 +101,60 @@ class PythonScript(AbstractScript):
     """
 
     __language__ = 'python'
+    __extension__ = 'py'
+    __sections__ = HEADERS_FIRST_SECTIONS
+    escape = staticmethod(escape_literal)
 
     def _generate_begin(self):
         return self.code_begin.format(url=self.url, headers=str(self.headers))
 
 
+class PythonLoadScript(PythonScript):
+
+    """Extended `PythonScript` class for load testing Python script code generation.
+    Fills code variables for the request from `python_load_template`, the other ones are inherited from
+    `python_template`.
+    Overrides `_generate_begin` method to generate the load testing options.
+    """
+
+    __language__ = 'python_load'
+    __extension__ = 'load.py'
+
+    def _generate_begin(self):
+        repeat, concurrency, keep_alive = get_load_options(self.details)
+        return self.code_begin.format(
+            url=self.url,
+            headers=str(self.headers),
+            repeat=repeat,
+            concurrency=concurrency,
+            keep_alive=keep_alive)
+
+
+class PythonAsyncioScript(PythonScript):
+
+    """Extended `PythonScript` class for asyncio Python script code generation, replaying the request concurrently.
+    Fills code variables for the request from `python_asyncio_template`.
+    Overrides `_generate_begin` method to generate the load testing options and the headers pairs.
+    """
+
+    __language__ = 'python_asyncio'
+    __extension__ = 'asyncio.py'
+
+    def _generate_begin(self):
+        repeat, concurrency, keep_alive = get_load_options(self.details)
+        if self.prepared is not None:
+            header_pairs = self.prepared.header_pairs
+        else:
+            header_pairs = split_headers(self.headers)
+        return self.code_begin.format(
+            url=self.url,
+            method=self.details.get('method', '').strip().upper(),
+            headers=str([(header, value.strip()) for header, value in header_pairs]),
+            repeat=repeat,
+            concurrency=concurrency,
+            keep_alive=keep_alive)
+
+
 class RubyScript(AbstractScript):
 
     """Extended `AbstractScript` class for Ruby script code generation.
@@ -58,6 +163,9 @@ class RubyScript(AbstractScript):
     """
 
     __language__ = 'ruby'
+    __extension__ = 'rb'
+    __sections__ = HEADERS_FIRST_SECTIONS
+    escape = staticmethod(escape_ruby)
 
     def _generate_begin(self):
         code = self.code_begin.format(url=self.url, method=self.details.get('method', '').strip().lower())
@@ -0,0 +1,231 @@
+"""
+
+:synopsis: Long-running translation daemon answering over a local HTTP or Unix socket API.
+
+Translating through the daemon avoids paying the interpreter start-up, the imports and the loading of the templates on
+every request. Requires Python 3.7+ for :mod:`asyncio`.
+
+Send a raw request to translate::
+
+    POST /translate HTTP/1.1
+    Content-Type: application/json
+
+    {"request": "GET / HTTP/1.1\\nHost: foo.bar", "languages": ["bash", "python"]}
+
+The answer maps each language to its generated code, or holds an ``error`` message with an error status, e.g. 400
+for a malformed request or 413 for a request larger than :data:`MAX_BODY_SIZE`.
+
+"""
+
+import asyncio
+import json
+
+from .interface import HttpRequestTranslator
+from .plugin_manager import get_languages, get_script_class
+
+
+DEFAULT_PORT = 8010
+
+#: Size of the largest translation request accepted, in bytes. Larger ones are answered with a 413 status.
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+HTTP_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+    500: 'Internal Server Error'}
+
+
+class TranslationServer(object):
+
+    """Translation daemon keeping the translator, the templates and the script classes loaded."""
+
+    def __init__(self, languages=['bash'], proxy=None, search_string='', data=None, max_body_size=MAX_BODY_SIZE):
+        """Initialize the daemon and warm up the templates of every language.
+
+        :param list languages: Default list of languages, used when a translation request specifies none.
+        :param str proxy: Default custom proxy.
+        :param str search_string: Default search phrase(can be regex too) to be searched in the response.
+        :param str data: Default data string to be sent along with the header.
+        :param int max_body_size: Size of the largest translation request accepted, in bytes.
+        """
+        self.defaults = dict(languages=list(languages), proxy=proxy, search_string=search_string, data=data)
+        self.max_body_size = max_body_size
+        self.server = None
+        for language in get_languages():
+            script_class = get_script_class(language)
+            script_class.load_attributes(script_class)
+
+    def translate(self, payload):
+        """Translate the request of a JSON payload.
+
+        :param bytes payload: JSON object with the raw 'request' and optionally 'languages' (list or comma separated
+            string), 'proxy', 'search_string' and 'data'.
+
+        :return: Tuple of HTTP status and JSON serializable answer.
+        :rtype: tuple
+        """
+        try:
+            kwargs = self._get_options(json.loads(payload.decode('utf-8')))
+            codes = HttpRequestTranslator(**kwargs).generate_code()
+        except ValueError as e:  # Including malformed JSON.
+            return 400, {'error': str(e)}
+        return 200, codes
+
+    def _get_options(self, options):
+        """Check the fields of a translation request and merge them with the defaults of the daemon.
+
+        :param options: Decoded JSON payload.
+
+        :raises ValueError: When the payload is not an object, 'request' is missing or a field has the wrong type.
+
+        :return: Keyword arguments of :class:`hrt.interface.HttpRequestTranslator`.
+        :rtype: dict
+        """
+        if not isinstance(options, dict):
+            raise ValueError("The payload must be a JSON object.")
+        if options.get('request') is None:
+            raise ValueError("'request' is missing.")
+        kwargs = dict(self.defaults)
+        kwargs.update((key, options[key]) for key in kwargs if options.get(key) is not None)
+        for key in ('request', 'proxy', 'search_string', 'data'):
+            value = options.get(key)
+            if value is not None and not isinstance(value, str):
+                raise ValueError("'%s' must be a string." % key)
+        languages = kwargs['languages']
+        if isinstance(languages, str):  # e.g. 'bash,python' like on the CLI.
+            languages = [language.strip() for language in languages.split(',')]
+        elif not isinstance(languages, list) or not all(isinstance(language, str) for language in languages):
+            raise ValueError("'languages' must be a list of strings or a comma separated string.")
+        kwargs.update(request=options['request'], languages=languages)
+        return kwargs
+
+    async def _read_request(self, reader):
+        """Read the request line and the headers of an HTTP request from a client.
+
+        :raises ValueError: When a line is longer than the limit of the reader.
+
+        :return: Tuple of request line and headers dictionary with lower case names, ``None`` when the client closed
+            the connection.
+        :rtype: tuple
+        """
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line.strip():
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return request_line.decode('latin-1').strip(), headers
+
+    async def _answer(self, loop, reader, request_line, headers):
+        """Read the body of a translation request and translate it.
+
+        :param loop: Event loop running the daemon.
+        :param `asyncio.StreamReader` reader: Stream of the client's requests, positioned at the body.
+        :param str request_line: Request line of the request, e.g. 'POST /translate HTTP/1.1'.
+        :param dict headers: Headers of the request, with lower case names.
+
+        :return: Tuple of HTTP status, JSON serializable answer and whether the rest of the stream can still be read.
+        :rtype: tuple
+        """
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            return 400, {'error': "Invalid Content-Length."}, False
+        if length > self.max_body_size:  # Not read, the connection is closed instead.
+            return 413, {'error': "The request is larger than %d bytes." % self.max_body_size}, False
+        body = await reader.readexactly(length)
+        parts = request_line.split(' ')
+        method, path = parts[0], parts[1] if len(parts) > 1 else ''
+        if path.split('?', 1)[0] != '/translate':
+            return 404, {'error': "Unknown path '%s'." % path}, True
+        if method != 'POST':
+            return 405, {'error': "Only POST is supported."}, True
+        # Translate in a worker thread so that a large request does not stall the other clients.
+        status, answer = await loop.run_in_executor(None, self.translate, body)
+        return status, answer, True
+
+    async def handle(self, reader, writer):
+        """Answer the translation requests of a client connection, until it is closed.
+
+        A request failing to be read or translated is answered with an error status, the connection is only closed
+        when the rest of its stream cannot be read.
+
+        :param `asyncio.StreamReader` reader: Stream of the client's requests.
+        :param `asyncio.StreamWriter` writer: Stream of the answers to the client.
+        """
+        loop = asyncio.get_event_loop()  # The running loop, `asyncio.get_running_loop` requires Python 3.7+.
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except ValueError:  # Line longer than the limit of the reader, the end of the request is unknown.
+                    request_line, headers = '', {}
+                    status, answer, readable = 400, {'error': "Request line or header too long."}, False
+                else:
+                    if request is None:
+                        break
+                    request_line, headers = request
+                    try:
+                        status, answer, readable = await self._answer(loop, reader, request_line, headers)
+                    except (asyncio.IncompleteReadError, ConnectionError):
+                        raise
+                    except Exception as e:  # Answered, so that the client does not wait for it forever.
+                        status, answer, readable = 500, {'error': '%s: %s' % (e.__class__.__name__, e)}, False
+                content = json.dumps(answer).encode('utf-8')
+                keep_alive = (
+                    readable and headers.get('connection', '').lower() != 'close'
+                    and not request_line.endswith('/1.0'))
+                writer.write((
+                    "HTTP/1.1 %d %s\r\n"
+                    "Content-Type: application/json\r\n"
+                    "Content-Length: %d\r\n"
+                    "Connection: %s\r\n"
+                    "\r\n" % (status, HTTP_REASONS[status], len(content), 'keep-alive' if keep_alive else 'close')
+                ).encode('latin-1') + content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT, path=None):
+        """Start listening for clients.
+
+        :param str host: Address to bind to, when listening on TCP.
+        :param int port: Port to bind to, when listening on TCP.
+        :param str path: Path of the Unix socket to listen on instead of TCP.
+
+        :return: The listening server.
+        :rtype: `asyncio.AbstractServer`
+        """
+        if path:
+            self.server = await asyncio.start_unix_server(self.handle, path=path)
+        else:
+            self.server = await asyncio.start_server(self.handle, host=host, port=port)
+        return self.server
+
+    def serve_forever(self, host='127.0.0.1', port=DEFAULT_PORT, path=None):
+        """Serve the translation requests until interrupted.
+
+        :param str host: Address to bind to, when listening on TCP.
+        :param int port: Port to bind to, when listening on TCP.
+        :param str path: Path of the Unix socket to listen on instead of TCP.
+        """
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(self.start(host=host, port=port, path=path))
+        try:
+            loop.run_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.close()
+            loop.run_until_complete(self.server.wait_closed())
+            loop.close()
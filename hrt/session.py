@@ -0,0 +1,253 @@
+"""
+
+:synopsis: Interactive session translating a request as it is edited.
+
+"""
+
+from __future__ import print_function
+
+import sys
+try:
+    input = raw_input  # Python 2.x
+except NameError:
+    pass  # Python 3.x
+
+from .interface import HttpRequestTranslator
+from .plugin_manager import get_script_class
+from .request import URL_ENCODED_METHODS, prepare_request
+
+
+#: Edits of the request read by :meth:`InteractiveSession.run`, one per line.
+EDIT_HELP = (
+    "Edit the request (press ^D or ^C to quit):\n"
+    "    Name: value    sets a header, 'Name:' removes it\n"
+    "    :body          enters a new body\n"
+    "    :request       enters a new raw request\n")
+
+
+def read_lines(read_line=input):
+    """Reads lines up to ^D.
+
+    :param function read_line: Reads a line, raising `EOFError` at ^D.
+
+    :return: The lines read, without leading and trailing blank lines.
+    :rtype: str
+    """
+    lines = []
+    while True:
+        try:
+            lines.append(read_line().rstrip('\r\n'))
+        except EOFError:
+            break
+    return '\n'.join(lines).strip()
+
+
+class InteractiveSession(object):
+
+    """Interactive session keeping the parsed request and the sections of its scripts between the edits.
+
+    An edit of the request only generates again the sections of the scripts depending on the edited parts of the
+    request, see :attr:`hrt.base.AbstractScript.__sections__`. The other sections are reused as they are.
+    """
+
+    def __init__(self, languages=['bash'], **options):
+        """Initialises the session, without request.
+
+        :param list languages: list of languages in which request's code is to be generated.
+        :param options: Options of :class:`hrt.interface.HttpRequestTranslator` other than the request and the
+            languages, e.g. 'proxy' or 'search_string'.
+        """
+        self.languages = languages
+        self.options = options
+        self.translator = None
+        self.prepared = None
+        self.sections = {}
+
+    def load(self, raw_request):
+        """Parses a new request and generates all the sections of its scripts.
+
+        :param str raw_request: Raw HTTP request.
+
+        :raises ValueError: When the request is malformed, its URL is invalid or a language is not supported.
+        :raises IOError: When the body file or the files of the form cannot be written.
+
+        :return: A dictionary of language name and respective code.
+        :rtype: dict
+        """
+        translator = HttpRequestTranslator(request=raw_request, languages=self.languages, **self.options)
+        prepared = prepare_request(
+            translator.headers, translator.details, translator.search_string,
+            header_pairs=translator.parsed.header_pairs)
+        codes = self._render(prepared)
+        self.translator = translator
+        translator.write_files()
+        return codes
+
+    def set_header(self, name, value=None):
+        """Sets the value of a header of the request, or removes it.
+
+        :param str name: Name of the header, case insensitive.
+        :param str value: New value of the header, added at the end of the headers when missing. ``None`` removes
+            the header.
+
+        :raises ValueError: When no request is loaded or the URL of the edited request is invalid.
+
+        :return: A dictionary of language name and respective code.
+        :rtype: dict
+        """
+        parsed = self._get_translator().parsed
+        name = name.strip()
+        header_pairs = list(parsed.header_pairs)
+        positions = [
+            position for position, (header, _) in enumerate(header_pairs) if header.strip().lower() == name.lower()]
+        if value is None:
+            for position in reversed(positions):
+                del header_pairs[position]
+        elif positions:
+            header_pairs[positions[0]] = (header_pairs[positions[0]][0], ' ' + value.strip())
+        else:
+            header_pairs.append((name, ' ' + value.strip()))
+        details = self.translator.details
+        changed = set(['headers'])
+        if name.lower() == 'host':  # The URL is made from the host.
+            details = dict(details, Host='' if value is None else value.strip())
+            changed.add('url')
+        return self._update(tuple(header_pairs), details, changed)
+
+    def set_body(self, data):
+        """Sets the body of the request.
+
+        A body edited by hand is sent as is, not as the form of the captured multipart body.
+
+        :param str data: New body of the request.
+
+        :raises ValueError: When no request is loaded or the URL of the edited request is invalid.
+        :raises IOError: When the body file cannot be written.
+
+        :return: A dictionary of language name and respective code.
+        :rtype: dict
+        """
+        translator = self._get_translator()
+        details = dict(translator.details, data=data)
+        changed = set(['body'])
+        if details.pop('form_parts', None):  # The headers describing the body are sent again.
+            changed.add('headers')
+        details.pop('data_file', None)
+        if translator.body_file and data:
+            details['data_file'] = translator.body_file
+        if details.get('method', '').lower() in URL_ENCODED_METHODS:  # The body is sent in the URL.
+            changed.add('url')
+        codes = self._update(translator.parsed.header_pairs, details, changed)
+        translator.write_files()
+        return codes
+
+    def run(self, read_line=input, write=None):
+        """Loop of the interactive mode: reads a raw request, then its edits, one per line, until ^D.
+
+        The code of the request is written after each edit. A malformed request or edit is reported, and the session
+        goes on with the previous request. The edits are described by :data:`EDIT_HELP`.
+
+        :param function read_line: Reads a line, taking the prompt, and raises `EOFError` at ^D.
+        :param function write: Writes the output of the session, to the standard output by default.
+        """
+        write = write or sys.stdout.write
+        edit = ':request'
+        while True:
+            try:
+                codes = self._edit(edit, read_line, write)
+            except (ValueError, IOError) as error:
+                write("%s\n" % error)
+                write(EDIT_HELP)
+            else:
+                if codes:
+                    write(''.join(codes.values()) + '\n')
+                if edit == ':request':
+                    write(EDIT_HELP)
+            try:
+                edit = read_line('>>> ').strip()
+            except EOFError:
+                return
+
+    def _edit(self, edit, read_line, write):
+        """Applies an edit read by :meth:`run`, see :data:`EDIT_HELP`.
+
+        :return: A dictionary of language name and respective code, ``None`` for an empty edit.
+        :rtype: dict
+        """
+        if edit == ':request':
+            write("Enter raw request (press ^D to finish or ^C to quit)\n")
+            return self.load(read_lines(read_line))
+        if edit == ':body':
+            write("Enter request body/parameters (press ^D to finish or ^C to quit)\n")
+            return self.set_body(read_lines(read_line))
+        if edit.startswith(':') or (edit and ':' not in edit):
+            raise ValueError("Unknown edit '%s'." % edit)
+        if edit:
+            name, _, value = edit.partition(':')
+            return self.set_header(name, value.strip() or None)
+        return None
+
+    def _get_translator(self):
+        """Translator of the request loaded in the session.
+
+        :raises ValueError: When no request is loaded.
+
+        :rtype: :class:`hrt.interface.HttpRequestTranslator`
+        """
+        if self.translator is None:
+            raise ValueError("Enter a request first.")
+        return self.translator
+
+    def _update(self, header_pairs, details, changed):
+        """Prepares the edited request, generates again the sections depending on its changed parts, and keeps it.
+
+        :param tuple header_pairs: Pairs of header name and value of the edited request.
+        :param dict details: Details of the edited request.
+        :param set changed: Changed parts of the request, see :attr:`hrt.base.AbstractScript.__sections__`.
+
+        :raises ValueError: When the URL of the edited request is invalid.
+
+        :return: A dictionary of language name and respective code.
+        :rtype: dict
+        """
+        translator = self.translator
+        headers = [header + ':' + value for header, value in header_pairs]
+        if 'url' in changed:
+            prepared = prepare_request(headers, details, translator.search_string, header_pairs=header_pairs)
+        else:
+            # The escaped headers or body of the previous request are still valid when they did not change.
+            escape_cache = dict(
+                (key, value) for key, value in self.prepared.escape_cache.items()
+                if not (key[0] == 'headers' and 'headers' in changed or key[0] == 'data' and 'body' in changed))
+            prepared = self.prepared._replace(
+                headers=tuple(headers), details=dict(details), header_pairs=header_pairs, escape_cache=escape_cache)
+        codes = self._render(prepared, changed)
+        translator.headers, translator.details = headers, details
+        parsed = translator.parsed
+        parsed.header_pairs = tuple(header_pairs)
+        parsed.host, parsed.data = details.get('Host', ''), details.get('data', '')
+        return codes
+
+    def _render(self, prepared, changed=None):
+        """Generates the sections of the scripts depending on the changed parts of the request, and assembles them.
+
+        :param `PreparedRequest` prepared: Request prepared by :func:`hrt.request.prepare_request`.
+        :param set changed: Changed parts of the request, all the sections are generated when ``None``.
+
+        :raises ValueError: When a language is not supported or the method of the request is not.
+
+        :return: A dictionary of language name and respective code.
+        :rtype: dict
+        """
+        all_sections = {}
+        all_code = {}
+        for language in self.languages:
+            script_class = get_script_class(language)
+            sections = {} if changed is None else dict(self.sections.get(language, {}))
+            names = [name for name, parts in script_class.__sections__ if name not in sections or parts & changed]
+            if names:
+                sections.update(script_class(prepared=prepared).generate_sections(names))
+            all_sections[language] = sections
+            all_code[language] = ''.join([sections[name] for name, _ in script_class.__sections__])
+        self.prepared, self.sections = prepared, all_sections
+        return all_code
@@ -11,7 +11,19 @@ code_proxy = " -x {proxy}"
 code_post = """ --data "{data}" """
 
 
-code_search = """ | egrep --color " {search_string} |$" """
+code_post_file = """ --data-binary "@{data_file}" """
+
+
+code_form = """{parts}"""
+
+
+code_form_field = """ --form-string "{name}={value}" """
+
+
+code_form_file = """ --form "{name}=@{path};filename={filename};type={content_type}" """
+
+
+code_search = """ --no-buffer | if [ {first_match} = 1 ]; then grep -E -o -m 1 "{search_string}"; else grep -E -o "{search_string}"; fi"""
 
 
 code_nosearch = """ -v --request {method} {url} {headers} --include"""
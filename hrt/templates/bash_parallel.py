@@ -0,0 +1,86 @@
+code_begin = """#!/usr/bin/env bash
+# Number of times the request is sent
+REPEAT={repeat}
+# Number of requests in flight at the same time
+CONCURRENCY={concurrency}
+# Reuse the connections between the requests (requires curl 7.67+)
+KEEP_ALIVE={keep_alive}
+# Timing of every request: status code, connect, first byte and total times in seconds
+TIMING='%{{http_code}} %{{time_connect}} %{{time_starttransfer}} %{{time_total}}\\n'
+
+OPTIONS=(--silent --show-error"""
+
+
+code_header = """ --header "{header}:{value}" """
+
+
+code_proxy = " -x {proxy}"
+
+
+code_post = """ --data "{data}" """
+
+
+code_post_file = """ --data-binary "@{data_file}" """
+
+
+code_search = """
+# Searched in every response as it is received, without keeping the responses
+SEARCH="{search_string}"
+# Stop receiving a response at its first match
+FIRST_MATCH={first_match}
+
+search_request() {{
+    # The response goes to the search through fd 3 and the timing through fd 4, the number of matching lines is
+    # added once both are done so that the timing and the matches of a request are printed on the same line
+    local grep_options=(-E -c) matches result
+    if [ "$FIRST_MATCH" = 1 ]; then
+        grep_options+=(-m 1)
+    fi
+    result=$({{
+        matches=$(curl "${{OPTIONS[@]}}" --no-buffer --output /dev/fd/3 --write-out "$TIMING" "$URL" 3>&1 >&4 \\
+            | grep "${{grep_options[@]}}" "$SEARCH")
+        echo "$matches"
+    }} 4>&1)
+    echo $result
+}}
+"""
+
+
+code_nosearch = """ --request {method} {headers})
+URL='{url}'
+{search}
+send_requests() {{
+    if declare -F search_request > /dev/null; then
+        # A curl process per request, its response piped to the search
+        local running=0
+        for _ in $(seq "$REPEAT"); do
+            search_request &
+            if [ $((++running)) -ge "$CONCURRENCY" ]; then
+                wait -n
+                running=$((running - 1))
+            fi
+        done
+        wait
+    elif [ "$KEEP_ALIVE" = 1 ]; then
+        # A single curl process sending the requests over its pool of connections
+        local urls=()
+        for _ in $(seq "$REPEAT"); do
+            urls+=(--output /dev/null "$URL")
+        done
+        curl --no-progress-meter --parallel --parallel-max "$CONCURRENCY" "${{OPTIONS[@]}}" --write-out "$TIMING" "${{urls[@]}}"
+    else
+        # A curl process, hence a connection, per request
+        seq "$REPEAT" | xargs -P "$CONCURRENCY" -I{{}} \\
+            curl "${{OPTIONS[@]}}" --output /dev/null --write-out "$TIMING" "$URL"
+    fi
+}}
+
+echo 'status connect first_byte total'
+send_requests | awk '
+    {{ print; total += $4; if (NR == 1 || $4 < min) min = $4; if ($4 > max) max = $4 }}
+    NF > 4 {{ searched = 1; if ($5 > 0) matched++ }}
+    END {{
+        if (NR) printf "%d request(s) in total time: min %.3fs, avg %.3fs, max %.3fs\\n", NR, min, total / NR, max
+        if (searched) printf "Matched in %d response(s)\\n", matched
+    }}'
+"""
@@ -29,29 +29,61 @@ curl_setopt($ch, CURLOPT_POSTFIELDS, $content);
 """
 
 
+code_post_file = """
+$content = file_get_contents("{data_file}");
+curl_setopt($ch, CURLOPT_POST, 1);
+curl_setopt($ch, CURLOPT_POSTFIELDS, $content);
+"""
+
+
+code_form = """
+$content = array();{parts}
+curl_setopt($ch, CURLOPT_POST, 1);
+curl_setopt($ch, CURLOPT_POSTFIELDS, $content);
+"""
+
+
+code_form_field = """
+$content["{name}"] = "{value}";"""
+
+
+code_form_file = """
+$content["{name}"] = new CURLFile("{path}", "{content_type}", "{filename}");"""
+
+
 code_search = """
 curl_setopt($ch, CURLOPT_HTTPHEADER, $headers);
-$response = curl_exec($ch);
-
-if (curl_errno($ch)) {{
- print curl_error($ch);
-}} else {{
- curl_close($ch);
-}}
-print $response;
 $string = "{search_string}";
-// Blindly copied from http://stackoverflow.com/questions/10778318/test-if-a-string-is-regex
 // Checks if the passed string is a regex or a simple string
-if( preg_match("/^\/.+\/[a-z]*$/i",$string)) {{
-    if (preg_match($string, $response, $match)) {{
-        print 'Found a match!';
-    }}
+if (!preg_match("/^\\/.+\\/[a-z]*$/i", $string)) {{
+    $string = '/' . preg_quote($string, '/') . '/';
 }}
-else {{
-    if (strpos($response,$string) !== false) {{
-        print 'Found a match!';
+$first_match = {first_match};
+$tail = '';
+$matches = 0;
+// Search the response as it is received, without keeping it in memory
+curl_setopt($ch, CURLOPT_WRITEFUNCTION, function ($ch, $chunk) use ($string, $first_match, &$tail, &$matches) {{
+    $text = $tail . $chunk;
+    $position = 0;
+    while (preg_match($string, $text, $match, PREG_OFFSET_CAPTURE, $position) && $match[0][0] !== '') {{
+        print 'Matched item: ' . $match[0][0] . "\\n";
+        $matches++;
+        $position = $match[0][1] + strlen($match[0][0]);
+        if ($first_match) {{
+            return 0;  // Aborts the transfer
+        }}
     }}
+    // Keep the end of the chunk, in case a match spans the next one
+    $tail = (string) substr($text, max($position, strlen($text) - 4096));
+    return strlen($chunk);
+}});
+curl_exec($ch);
+
+if (curl_errno($ch) && !($first_match && $matches)) {{
+ print curl_error($ch);
 }}
+curl_close($ch);
+print "Matched $matches item(s)\\n";
 """
 
 
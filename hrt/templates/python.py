@@ -33,6 +33,35 @@ code_post = """
 """
 
 
+code_post_file = """
+    # Sets request method to POST, the body is streamed from the file while sending
+    body_file = open("{data_file}", 'rb')
+    body_file.seek(0, 2)
+    curl_handler.setopt(curl_handler.POST, 1)
+    curl_handler.setopt(curl_handler.POSTFIELDSIZE, body_file.tell())
+    body_file.seek(0)
+    curl_handler.setopt(curl_handler.READDATA, body_file)
+"""
+
+
+code_form = """
+    # Sets request method to POST, the files are streamed while sending
+    curl_handler.setopt(curl_handler.HTTPPOST, [{parts}
+    ])
+"""
+
+
+code_form_field = """
+        ("{name}", "{value}"),"""
+
+
+code_form_file = """
+        ("{name}", (
+            curl_handler.FORM_FILE, "{path}",
+            curl_handler.FORM_FILENAME, "{filename}",
+            curl_handler.FORM_CONTENTTYPE, "{content_type}")),"""
+
+
 code_https = """
     curl_handler.setopt(pycurl.SSL_VERIFYPEER, 1)
     curl_handler.setopt(pycurl.SSL_VERIFYHOST, 2)
@@ -42,33 +71,32 @@ code_https = """
 
 
 code_search = """
+    # Search the response as it is received, without keeping it in memory
+    pattern = re.compile(r"{search_string}")
+    first_match = {first_match}
+    state = {{'tail': '', 'matches': 0}}
+
+    def search(chunk):
+        text = state['tail'] + chunk.decode('iso-8859-1')
+        end = 0
+        for match in pattern.finditer(text):
+            print('Matched item: ', match.group(0))
+            state['matches'] += 1
+            end = match.end()
+            if first_match:
+                return 0  # Aborts the transfer
+        # Keep the end of the chunk, in case a match spans the next one
+        state['tail'] = text[max(end, len(text) - 4096):]
+
+    curl_handler.setopt(curl_handler.WRITEFUNCTION, search)
     try:
         curl_handler.perform()
-    except pycurl.error, error:
-        print('An error occurred: ', error)
+    except pycurl.error as error:
+        if not (first_match and state['matches']):
+            print('An error occurred: ', error)
     curl_handler.close()
 
-    body = buffer.getvalue()
-    # Body is a string on Python 2 and a byte string on Python 3.
-    # If we know the encoding, we can always decode the body and
-    # end up with a Unicode string.
-    response = body.decode('iso-8859-1')
-
-    match = re.findall(r"{search_string}", str(response))
-    try:
-        from termcolor import colored
-        lib_available = True
-    except ImportError:
-        lib_available = False
-    if match:
-        for item in match:
-            if lib_available:
-                replace_string = colored(match[item], 'green')
-                response = re.sub(match[item], replace_string, str(response))
-            else:
-                print("Matched item: ",item)
-
-    print(response)
+    print('Matched %d item(s)' % state['matches'])
 
 
 if __name__ == '__main__':
@@ -79,7 +107,7 @@ if __name__ == '__main__':
 code_nosearch = """
     try:
         curl_handler.perform()
-    except pycurl.error, error:
+    except pycurl.error as error:
         print('An error occurred: ', error)
     curl_handler.close()
 
@@ -0,0 +1,169 @@
+code_begin = """#!/usr/bin/env python3
+# Requires Python 3.7+ and aiohttp
+import asyncio
+import math
+import re
+import time
+
+import aiohttp
+
+# Number of times the request is sent
+REPEAT = {repeat}
+# Number of requests in flight at the same time
+CONCURRENCY = {concurrency}
+# Reuse the connections between the requests
+KEEP_ALIVE = {keep_alive}
+
+METHOD = '{method}'
+URL = '{url}'
+HEADERS = {headers}
+OPTIONS = {{}}
+"""
+
+
+code_proxy = """
+OPTIONS['proxy'] = '{proxy}'
+"""
+
+
+code_post = """
+OPTIONS['data'] = "{data}".encode('utf-8')
+"""
+
+
+code_post_file = """
+with open("{data_file}", 'rb') as body_file:
+    OPTIONS['data'] = body_file.read()
+"""
+
+
+# A form is consumed by the request sending it, the multipart body is sent as captured instead.
+code_form = ''
+
+
+# Certificates are verified by default.
+code_https = ''
+
+
+code_search = """
+# Searched in every response as it is received, without keeping the responses in memory
+SEARCH = re.compile(r"{search_string}")
+# Stop receiving a response at its first match
+FIRST_MATCH = {first_match}
+
+
+async def search(response):
+    # Number of matches in the response, keeping the end of each chunk in case a match spans the next one
+    tail = ''
+    matches = 0
+    async for chunk in response.content.iter_any():
+        text = tail + chunk.decode('iso-8859-1')
+        end = 0
+        for match in SEARCH.finditer(text):
+            matches += 1
+            end = match.end()
+            if FIRST_MATCH:
+                return matches  # The connection is closed without reading the rest of the response
+        tail = text[max(end, len(text) - 4096):]
+    return matches
+
+
+async def worker(session, requests, stats):
+    for _ in requests:
+        start = time.perf_counter()
+        try:
+            async with session.request(METHOD, URL, headers=HEADERS, **OPTIONS) as response:
+                matches = await search(response)
+        except aiohttp.ClientError as error:
+            print('An error occurred: ', error)
+            continue
+        stats['latencies'].append(time.perf_counter() - start)
+        stats['statuses'][response.status] = stats['statuses'].get(response.status, 0) + 1
+        if matches:
+            stats['matched'] += 1
+
+
+def percentile(latencies, percent):
+    # Nearest-rank percentile of sorted latencies, in milliseconds
+    return latencies[max(0, int(math.ceil(percent / 100.0 * len(latencies))) - 1)] * 1000
+
+
+async def main():
+    stats = {{'latencies': [], 'statuses': {{}}, 'matched': 0}}
+    # Every request is a pending item of the same iterator shared by the workers
+    requests = iter(range(REPEAT))
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY, force_close=not KEEP_ALIVE)
+    start = time.perf_counter()
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*[worker(session, requests, stats) for _ in range(CONCURRENCY)])
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(stats['latencies'])
+    print('%d request(s) in %.3fs: %.1f requests/second, %d failed' % (
+        REPEAT, elapsed, REPEAT / elapsed, REPEAT - len(latencies)))
+    for status in sorted(stats['statuses']):
+        print('HTTP %s: %d' % (status, stats['statuses'][status]))
+    if latencies:
+        print('Latency (ms): min %.1f, p50 %.1f, p90 %.1f, p99 %.1f, max %.1f' % (
+            latencies[0] * 1000,
+            percentile(latencies, 50),
+            percentile(latencies, 90),
+            percentile(latencies, 99),
+            latencies[-1] * 1000))
+    print('Matched in %d response(s)' % stats['matched'])
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
+"""
+
+
+code_nosearch = """
+
+async def worker(session, requests, stats):
+    for _ in requests:
+        start = time.perf_counter()
+        try:
+            async with session.request(METHOD, URL, headers=HEADERS, **OPTIONS) as response:
+                # The response is read as it is received, without being kept
+                async for _ in response.content.iter_any():
+                    pass
+        except aiohttp.ClientError as error:
+            print('An error occurred: ', error)
+            continue
+        stats['latencies'].append(time.perf_counter() - start)
+        stats['statuses'][response.status] = stats['statuses'].get(response.status, 0) + 1
+
+
+def percentile(latencies, percent):
+    # Nearest-rank percentile of sorted latencies, in milliseconds
+    return latencies[max(0, int(math.ceil(percent / 100.0 * len(latencies))) - 1)] * 1000
+
+
+async def main():
+    stats = {'latencies': [], 'statuses': {}}
+    # Every request is a pending item of the same iterator shared by the workers
+    requests = iter(range(REPEAT))
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY, force_close=not KEEP_ALIVE)
+    start = time.perf_counter()
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*[worker(session, requests, stats) for _ in range(CONCURRENCY)])
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(stats['latencies'])
+    print('%d request(s) in %.3fs: %.1f requests/second, %d failed' % (
+        REPEAT, elapsed, REPEAT / elapsed, REPEAT - len(latencies)))
+    for status in sorted(stats['statuses']):
+        print('HTTP %s: %d' % (status, stats['statuses'][status]))
+    if latencies:
+        print('Latency (ms): min %.1f, p50 %.1f, p90 %.1f, p99 %.1f, max %.1f' % (
+            latencies[0] * 1000,
+            percentile(latencies, 50),
+            percentile(latencies, 90),
+            percentile(latencies, 99),
+            latencies[-1] * 1000))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
+"""
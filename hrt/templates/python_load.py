@@ -0,0 +1,175 @@
+code_begin = """#!/usr/bin/python
+from __future__ import print_function
+import re
+import time
+import pycurl
+
+# Number of times the request is sent
+REPEAT = {repeat}
+# Number of requests in flight at the same time
+CONCURRENCY = {concurrency}
+# Reuse the connections between the requests, each handler keeping its connection open for its next request
+KEEP_ALIVE = {keep_alive}
+
+
+def configure(curl_handler):
+    curl_handler.setopt(curl_handler.URL, '{url}')
+    curl_handler.setopt(curl_handler.HTTPHEADER, {headers})
+    # Follow redirects
+    curl_handler.setopt(curl_handler.FOLLOWLOCATION, True)
+    if not KEEP_ALIVE:
+        curl_handler.setopt(curl_handler.FORBID_REUSE, 1)
+        curl_handler.setopt(curl_handler.FRESH_CONNECT, 1)
+"""
+
+
+code_post_file = """
+    # Sets request method to POST, the body is streamed from the file while sending. Each handler opens the file once
+    # and rewinds it for its next requests, the file is closed with the handler.
+    if getattr(curl_handler, 'body_file', None) is None:
+        curl_handler.body_file = open("{data_file}", 'rb')
+    body_file = curl_handler.body_file
+    body_file.seek(0, 2)
+    curl_handler.setopt(curl_handler.POST, 1)
+    curl_handler.setopt(curl_handler.POSTFIELDSIZE, body_file.tell())
+    body_file.seek(0)
+    curl_handler.setopt(curl_handler.READDATA, body_file)
+"""
+
+
+code_search = """
+
+# Searched in every response as it is received, without keeping the responses in memory
+SEARCH = re.compile(r"{search_string}")
+# Stop receiving a response at its first match
+FIRST_MATCH = {first_match}
+
+
+def searcher(state):
+    def search(chunk):
+        text = state['tail'] + chunk.decode('iso-8859-1')
+        end = 0
+        for match in SEARCH.finditer(text):
+            state['matches'] += 1
+            end = match.end()
+            if FIRST_MATCH:
+                return 0  # Aborts the transfer
+        # Keep the end of the chunk, in case a match spans the next one
+        state['tail'] = text[max(end, len(text) - 4096):]
+    return search
+
+
+def main():
+    # The handlers and their connections are reused from one request to the next
+    multi_handler = pycurl.CurlMulti()
+    handlers = [pycurl.Curl() for _ in range(min(CONCURRENCY, REPEAT))]
+    free_handlers = list(handlers)
+    sent = done = failed = matched = 0
+    statuses = {{}}
+    start = time.time()
+    while done < REPEAT:
+        while free_handlers and sent < REPEAT:
+            curl_handler = free_handlers.pop()
+            configure(curl_handler)
+            curl_handler.state = {{'tail': '', 'matches': 0}}
+            curl_handler.setopt(curl_handler.WRITEFUNCTION, searcher(curl_handler.state))
+            multi_handler.add_handle(curl_handler)
+            sent += 1
+        while multi_handler.perform()[0] == pycurl.E_CALL_MULTI_PERFORM:
+            pass
+        while True:
+            queued, succeeded, errors = multi_handler.info_read()
+            for curl_handler, error_number, error in errors:
+                if FIRST_MATCH and curl_handler.state['matches']:  # Aborted at its first match
+                    succeeded.append(curl_handler)
+                    continue
+                print('An error occurred: ', error)
+                multi_handler.remove_handle(curl_handler)
+                free_handlers.append(curl_handler)
+                done += 1
+                failed += 1
+            for curl_handler in succeeded:
+                status = curl_handler.getinfo(pycurl.RESPONSE_CODE)
+                statuses[status] = statuses.get(status, 0) + 1
+                if curl_handler.state['matches']:
+                    matched += 1
+                multi_handler.remove_handle(curl_handler)
+                free_handlers.append(curl_handler)
+                done += 1
+            if not queued:
+                break
+        multi_handler.select(1.0)
+    elapsed = time.time() - start
+    for curl_handler in handlers:
+        curl_handler.close()
+        if getattr(curl_handler, 'body_file', None) is not None:
+            curl_handler.body_file.close()
+    multi_handler.close()
+
+    print('%d request(s) in %.3fs: %.1f requests/second, %d failed' % (REPEAT, elapsed, REPEAT / elapsed, failed))
+    for status in sorted(statuses):
+        print('HTTP %s: %d' % (status, statuses[status]))
+    print('Matched in %d response(s)' % matched)
+
+
+if __name__ == '__main__':
+    main()
+"""
+
+
+code_nosearch = """
+
+def discard(chunk):
+    # The responses are not kept
+    pass
+
+
+def main():
+    # The handlers and their connections are reused from one request to the next
+    multi_handler = pycurl.CurlMulti()
+    handlers = [pycurl.Curl() for _ in range(min(CONCURRENCY, REPEAT))]
+    free_handlers = list(handlers)
+    sent = done = failed = 0
+    statuses = {}
+    start = time.time()
+    while done < REPEAT:
+        while free_handlers and sent < REPEAT:
+            curl_handler = free_handlers.pop()
+            configure(curl_handler)
+            curl_handler.setopt(curl_handler.WRITEFUNCTION, discard)
+            multi_handler.add_handle(curl_handler)
+            sent += 1
+        while multi_handler.perform()[0] == pycurl.E_CALL_MULTI_PERFORM:
+            pass
+        while True:
+            queued, succeeded, errors = multi_handler.info_read()
+            for curl_handler in succeeded:
+                status = curl_handler.getinfo(pycurl.RESPONSE_CODE)
+                statuses[status] = statuses.get(status, 0) + 1
+                multi_handler.remove_handle(curl_handler)
+                free_handlers.append(curl_handler)
+                done += 1
+            for curl_handler, error_number, error in errors:
+                print('An error occurred: ', error)
+                multi_handler.remove_handle(curl_handler)
+                free_handlers.append(curl_handler)
+                done += 1
+                failed += 1
+            if not queued:
+                break
+        multi_handler.select(1.0)
+    elapsed = time.time() - start
+    for curl_handler in handlers:
+        curl_handler.close()
+        if getattr(curl_handler, 'body_file', None) is not None:
+            curl_handler.body_file.close()
+    multi_handler.close()
+
+    print('%d request(s) in %.3fs: %.1f requests/second, %d failed' % (REPEAT, elapsed, REPEAT / elapsed, failed))
+    for status in sorted(statuses):
+        print('HTTP %s: %d' % (status, statuses[status]))
+
+
+if __name__ == '__main__':
+    main()
+"""
@@ -29,44 +29,58 @@ code_post = """
 """
 
 
+code_post_file = """
+    body: File.binread("{data_file}")
+"""
+
+
+# Typhoeus sends a multipart body when one of the values is a file, named after the file on disk.
+code_form = """
+    body: {{{parts}
+    }}
+"""
+
+
+code_form_field = """
+        "{name}" => "{value}","""
+
+
+code_form_file = """
+        "{name}" => File.open("{path}"),"""
+
+
 code_search = """
 }}
+pattern = /{search_string}/
+first_match = {first_match} == 1
+tail = ''
+matches = 0
 req = Typhoeus::Request.new(url, options)
+req.on_headers do |response|
+  puts "Response #{{response.code}}:"
+end
+# Search the response as it is received, without keeping it in memory
+req.on_body do |chunk|
+  text = tail + chunk.dup.force_encoding('ISO-8859-1')
+  position = 0
+  while (matched = pattern.match(text, position)) && !matched[0].empty?
+    puts "Matched item: #{{matched[0]}}"
+    matches += 1
+    position = matched.end(0)
+    break if first_match
+  end
+  # Keep the end of the chunk, in case a match spans the next one
+  tail = text[[position, text.length - 4096].max..-1]
+  :abort if first_match && matches > 0
+end
 req.on_complete do |response|
-  if response.success?
-    puts 'Response #{{response.code}}:'
-    begin
-        require 'colorize'
-        lib_available = true
-    rescue LoadError
-        lib_available = false
-    end
-
-    matched = response.body.match /{search_string}/
-
-    original = response.body
-    if matched then
-        if lib_available then
-            for i in 0..matched.length
-                original.gsub! /#{{matched[i]}}/, "#{{matched[i]}}".green
-            end
-        else
-            for i in 0..matched.length
-                puts 'Matched item: #{{matched[i]}}'
-            end
-        end
-    end
-    puts original
-
-  elsif response.timed_out?
+  if response.timed_out?
     puts 'Request Timed Out!'
-  elsif response.code == 0
+  elsif response.code == 0 && !(first_match && matches > 0)
     # Could not get an http response, something's wrong.
     puts response.return_message
-  else
-    # Received a non-successful http response.
-    puts 'HTTP request failed: ' + response.code.to_s
   end
+  puts "Matched #{{matches}} item(s)"
 end
 
 req.run
@@ -5,12 +5,10 @@ try:
     input = raw_input  # Python 2.x
 except NameError:
     pass  # Python 3.x
-try:
-    from urlparse import urlparse
-except ImportError:
-    from urllib.parse import urlparse
 
+from .parser import parse_raw_request
 from .plugin_manager import generate_script
+from .session import InteractiveSession
 from .url import get_url, check_valid_url
 
 
@@ -31,7 +29,7 @@ def process_arguments(args):
         script_list = []  # If --language option is not used.
     if args.interactive:
         try:
-            take_headers(script_list)
+            run_interactive(script_list)
         except KeyboardInterrupt:
             print("\nThanks for using the interactive mode! Exiting!")
             sys.exit(0)
@@ -82,13 +80,42 @@ def process_arguments(args):
     return argdict
 
 
+def run_interactive(script_list):
+    """Loop of the interactive mode: takes the headers and the body of a request and prints its code, until an empty
+    request is entered.
+
+    The request is kept between the iterations. When only the body changed, only the code sending the body is
+    generated again.
+
+    :param list script_list: List of names of the languages for which script is to be generated.
+    """
+    session = InteractiveSession(script_list or ['bash'])
+    previous_headers = None
+    while True:
+        headers = take_headers(script_list)
+        body = take_body(headers, script_list)
+        if not headers and not body:
+            return
+        try:
+            if headers != previous_headers:
+                session.load("".join(headers))
+                previous_headers = headers
+            codes = session.set_body("".join(body).strip())
+        except ValueError:
+            previous_headers = None
+            print("Please Enter a Vaild Request!")
+            continue
+        for script in session.languages:
+            print(codes[script])
+
+
 def take_headers(script_list):
     """Takes Request headers while interactive mode is active
 
     :param list script_list: List of names of the languages for which script is to be generated.
 
     :return: Raw Request Headers passed in the interactive session.
-    :rtype: `str`
+    :rtype: `list`
     """
     headers = []
     print("Enter request headers (Ctrl+D to finish/Ctrl+C to quit).")
@@ -97,19 +124,17 @@ def take_headers(script_list):
             uentered = input(">>> ")
             headers.append(uentered + "\n")
         except EOFError:
-            take_body(headers, script_list)
-    return headers
+            return headers
 
 
 def take_body(headers, script_list):
     """Takes Request body while interactive mode is active.
-    Also prints the generated code for languages passed in `script_list` on console.
 
-    :param str headers: Raw request headers feeded in the interactive session.
+    :param list headers: Raw request headers feeded in the interactive session.
     :param list script_list: List of names of the languages for which script is to be generated.
 
     :return: Body for the request passed in interactive session.
-    :rtype: `str`
+    :rtype: `list`
     """
     body = []
     print("\nEnter request body/parameters (Ctrl+D to finish/Ctrl+C to quit).")
@@ -118,84 +143,4 @@ def take_body(headers, script_list):
             uentered = input(">>> ")
             body.append(uentered + "\n")
         except EOFError:
-            try:
-                headers, details = parse_raw_request("".join(headers))
-                details['data'] = "".join(body).strip()
-                if not script_list:
-                    print(generate_script('bash', headers, details))
-                else:
-                    for script in script_list:
-                        print(generate_script(script, headers, details))
-            except ValueError:
-                print("Please Enter a Vaild Request!")
-            take_headers(script_list)
-    return body
-
-
-def parse_raw_request(request):
-    """Parses Raw HTTP request into separate dictionaries for headers and body and other parameters.
-
-    :param str request: Raw HTTP request.
-
-    :raises ValueError: When request passed in malformed.
-
-    :return: A tuple of two dictionaries where the first one is the headers and the second the details.
-    :rtype: tuple
-    """
-    headers_lines = request.splitlines()
-    if not headers_lines:
-        raise ValueError("Request Malformed. Please Enter a Valid HTTP request.")
-    new_request_method = headers_lines.pop(0)
-    # Headers
-    header_list = []
-    while headers_lines:
-        line = headers_lines.pop(0)
-        if not line.strip('\r\n'):  # Empty line? Therefore the headers are over and the content is starting.
-            break
-        header_list.append(line)
-        try:
-            header, value = line.split(":", 1)
-        except IndexError:
-            raise ValueError("Headers Malformed. Please Enter a Valid HTTP request.")
-        if header.lower() == "host":
-            host = value.strip()  # Keep hostname for further checks
-    # Data
-    data = ''
-    if headers_lines:
-        data = ''.join(headers_lines)
-    # Details
-    details_dict = {}
-    details_dict['data'] = data
-    details_dict['method'] = new_request_method.split(' ', 1)[0].strip()
-    details_dict['Host'] = host
-    # Not using whatever stored in parsed_request for the reason to keep the request as original as possible
-    try:  # try to split the path from request if one is passed.
-        proto_ver = new_request_method.split(' ', 2)[2].split('/', 1)
-        details_dict['protocol'] = proto_ver[0].strip()
-        details_dict['version'] = proto_ver[1].strip()
-        details_dict['path'] = new_request_method.split(' ', 2)[1].strip()
-    except IndexError:
-        details_dict['path'] = ""
-        try:
-            proto_ver = new_request_method.split(' ', 2)[1].split('/', 1)
-        except IndexError:  # Failed to get protocol and version.
-            raise ValueError("Request Malformed. Please Enter a Valid HTTP request.")
-        details_dict['protocol'] = proto_ver[0].strip()
-        details_dict['version'] = proto_ver[1].strip()
-    # Parse the GET Path to update it to only contain the relative path and not whole url
-    # scheme://netloc/path;parameters?query#fragment
-    # Eg: Path=https://google.com/robots.txt to /robots.txt
-    scheme, netloc, path, params, query, frag = urlparse(details_dict['path'])
-    if params:
-        path = path + ";" + params
-    if query:
-        path = path + "?" + query
-    if frag:
-        path = path + "#" + frag
-    details_dict['path'] = path
-    # If scheme is specified in GET Path and Header 'Host' Field doesn't already starts with it
-    if scheme and not host.startswith(scheme):
-        details_dict['pre_scheme'] = scheme + "://"  # Store the scheme defined in GET path for later checks
-    else:
-        details_dict['pre_scheme'] = ''
-    return (header_list, details_dict)
+            return body
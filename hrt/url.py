@@ -1,10 +1,16 @@
 
-try:
-    from urlparse import urlparse
-except ImportError:
-    from urllib.parse import urlparse
+from .util import LazyPattern, LRUCache
+from .validators import check_host, get_netloc
 
-from .util import re_ipv4_address, re_ipv6_address, re_domain
+
+# Protocols guessed from the port of a host.
+PORT_PROTOCOL = {'443': 'https', '22': 'ssh', '21': 'ftp', '20': 'ftp', '113': 'irc', '80': 'http'}
+
+# Beginning of a path which may still belong to the network location of a URL, e.g. 'file.txt' in 'file.txt/a'.
+re_path_netloc = LazyPattern(r'[^/?#]*')
+
+#: URLs already built by :func:`create_valid_url`, by host, protocol and beginning of the path.
+url_cache = LRUCache(maxsize=4096)
 
 
 def check_valid_url(url):
@@ -15,26 +21,20 @@ def check_valid_url(url):
     :return: ``True`` if `url` is valid, ``False`` otherwise.
     :rtype: bool
     """
-    _, netloc, _, _, _, _ = urlparse(url)
-    if not netloc:  # No protocol specified and urlparse assumed it was a relative path.
+    netloc = get_netloc(url)
+    if not netloc:  # No protocol specified, therefore a relative path.
         return False
     if not netloc.startswith('['):  # URL without IPv6 e.g. [::1]
         if ':' in netloc:
             netloc, port = netloc.rsplit(':', 1)
             if port and not check_valid_port(port):
                 return False
-        if re_ipv4_address.match(netloc):
-            return True
-        if re_domain.match(netloc):
-            return True
     else:
         if not netloc.endswith(']'):  # Is there a port specified? e.g. [::1]:443
             netloc, port = netloc.rsplit(':', 1)
             if port and not check_valid_port(port):
                 return False
-        if re_ipv6_address.match(netloc[1:-1]):
-            return True
-    return False
+    return check_host(netloc)
 
 
 def check_valid_port(port):
@@ -67,19 +67,46 @@ def get_url(host, pre_protocol=None):
     :return: URL with domain and protocol (e.g. https://google.com).
     :rtype: str
     """
-    port_protocol = {'443': 'https', '22': 'ssh', '21': 'ftp', '20': 'ftp', '113': 'irc', '80': 'http'}
     protocol = ''
     url = host.strip()
     if not url.startswith('['):  # A port is specified in the domain and without IPV6
         if ':' in url:
             _, port = url.rsplit(':', 1)
-            if port in port_protocol:  # Do we know the protocol?
-                protocol = port_protocol[port] + '://'
+            if port in PORT_PROTOCOL:  # Do we know the protocol?
+                protocol = PORT_PROTOCOL[port] + '://'
     else:
         if not url.endswith(']'):   # IPV6 url with Port, [::1]:443
             _, port = url.rsplit(':', 1)
-            if port in port_protocol:  # Do we know the protocol?
-                protocol = port_protocol[port] + '://'
+            if port in PORT_PROTOCOL:  # Do we know the protocol?
+                protocol = PORT_PROTOCOL[port] + '://'
     # If GET path already specifies a protocol, give preference to that
     protocol = pre_protocol or protocol or 'http://'  # Default protocol set to http
     return protocol + url
+
+
+def create_valid_url(host, pre_protocol='', path=''):
+    """Generate the URL of a request and verify that it is valid.
+
+    The URL of a host is built and validated once, then served from :data:`url_cache`.
+
+    :param str host: Host from which to generate the URL (e.g. google.com:443).
+    :param str pre_protocol: Protocol passed in the GET Path, see :func:`get_url`.
+    :param str path: Path of the request (e.g. /robots.txt).
+
+    :raises ValueError: When URL is invalid.
+
+    :return: URL with protocol, domain and path (e.g. https://google.com/robots.txt).
+    :rtype: str
+    """
+    # Only the beginning of the path preceding '/', '?' or '#' can change the network location of the URL.
+    key = (host, pre_protocol, re_path_netloc.match(path).group())
+    cached = url_cache.get(key)
+    if cached is None:
+        base_url = get_url(host, pre_protocol)
+        cached = (base_url, check_valid_url(base_url + key[2]))
+        url_cache.set(key, cached)
+    base_url, valid = cached
+    url = base_url + path
+    if not valid:
+        raise ValueError("Invalid URL '%s'." % url)
+    return url
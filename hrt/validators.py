@@ -0,0 +1,134 @@
+"""
+
+:synopsis: Linear time validation of the hosts of URLs.
+
+"""
+
+import re
+
+from .util import LazyPattern
+
+
+# Network location of a URL, e.g. 'google.com:443' in 'https://google.com:443/robots.txt'.
+re_netloc = LazyPattern(r'^(?:[A-Z][A-Z0-9+.-]*:)?//([^/?#]*)', re.IGNORECASE)
+# Label of a domain name other than the top level one, e.g. 'www' or 'google'.
+re_label = LazyPattern(r'^[A-Z0-9][A-Z0-9-]{0,62}\Z', re.IGNORECASE)
+# Top level label of a domain name, e.g. 'com'.
+re_top_label = LazyPattern(r'^[A-Z0-9-]{2,}\Z', re.IGNORECASE)
+# Colon separated groups of one to four hexadecimal digits, e.g. 'fe80:0:1'. Deterministic, hence linear.
+re_hex_groups = LazyPattern(r'^[0-9A-Fa-f]{1,4}(?::[0-9A-Fa-f]{1,4})*\Z')
+# Same groups compressed with a single '::', e.g. 'fe80::1' or '::'. Only backtracks by one group before the '::'.
+re_compressed_groups = LazyPattern(
+    r'^(?:[0-9A-Fa-f]{1,4}(?::[0-9A-Fa-f]{1,4})*)?::(?:[0-9A-Fa-f]{1,4}(?::[0-9A-Fa-f]{1,4})*)?\Z')
+
+# Decimal representations of a byte, without leading zeros.
+OCTETS = frozenset(str(i) for i in range(256))
+
+#: Maximum number of labels remembered by :func:`check_label`.
+LABEL_CACHE_SIZE = 4096
+_label_cache = {}
+_top_label_cache = {}
+
+
+def get_netloc(url):
+    """Extract the network location of a URL, like :func:`urlparse.urlsplit` without parsing the rest of the URL.
+
+    :param str url: URL, e.g. 'https://google.com:443/robots.txt'.
+
+    :return: Network location of `url`, or an empty string when it has none.
+    :rtype: str
+    """
+    match = re_netloc.match(url)
+    if match:
+        return match.group(1)
+    return ''
+
+
+def check_ipv4(host):
+    """Verify that a host is an IPv4 address in dotted decimal notation, without leading zeros.
+
+    :param str host: Host to validate, e.g. '127.0.0.1'.
+
+    :return: ``True`` if `host` is valid, ``False`` otherwise.
+    :rtype: bool
+    """
+    parts = host.split('.')
+    return len(parts) == 4 and parts[0] in OCTETS and parts[1] in OCTETS and parts[2] in OCTETS and parts[3] in OCTETS
+
+
+def check_ipv6(host):
+    """Verify that a host is an IPv6 address, without the surrounding brackets.
+
+    The address may be compressed with '::' and may end with an embedded IPv4 address.
+
+    :param str host: Host to validate, e.g. '::1' or '::ffff:127.0.0.1'.
+
+    :return: ``True`` if `host` is valid, ``False`` otherwise.
+    :rtype: bool
+    """
+    groups = 8
+    if '.' in host:  # Embedded IPv4 address, worth two groups.
+        host, colon, ipv4 = host.rpartition(':')
+        if not host or not check_ipv4(ipv4):
+            return False
+        if host.endswith(':'):  # The address ends with '::' before the IPv4 address.
+            host += ':'
+        groups = 6
+    if '::' in host:  # '::' stands for at least one group.
+        if not re_compressed_groups.match(host):
+            return False
+        return host.count(':') - host.startswith('::') - host.endswith('::') < groups
+    return host.count(':') == groups - 1 and re_hex_groups.match(host) is not None
+
+
+def check_label(label, top=False):
+    """Verify that a label of a domain name is valid. Results are memoized.
+
+    :param str label: Label to validate, e.g. 'google'.
+    :param bool top: Whether `label` is the top level label of the domain name.
+
+    :return: ``True`` if `label` is valid, ``False`` otherwise.
+    :rtype: bool
+    """
+    cache = _top_label_cache if top else _label_cache
+    try:
+        return cache[label]
+    except KeyError:
+        pass
+    valid = bool((re_top_label if top else re_label).match(label))
+    if len(cache) >= LABEL_CACHE_SIZE:
+        cache.clear()
+    cache[label] = valid
+    return valid
+
+
+def check_domain(host):
+    """Verify that a host is a domain name made of at least two labels.
+
+    :param str host: Host to validate, e.g. 'www.google.com'.
+
+    :return: ``True`` if `host` is valid, ``False`` otherwise.
+    :rtype: bool
+    """
+    if host.endswith('.'):
+        host = host[:-1]
+    labels = host.split('.')
+    if len(labels) < 2 or not check_label(labels[-1], top=True):
+        return False
+    for label in labels[:-1]:
+        if not check_label(label):
+            return False
+    return True
+
+
+def check_host(host):
+    """Verify that the host of a URL is a valid domain name, IPv4 address or bracketed IPv6 address.
+
+    :param str host: Host to validate, without port.
+
+    :return: ``True`` if `host` is valid, ``False`` otherwise.
+    :rtype: bool
+    """
+    if host.startswith('['):
+        return host.endswith(']') and check_ipv6(host[1:-1])
+    return check_ipv4(host) or check_domain(host)
@@ -0,0 +1,325 @@
+"""
+
+:synopsis: Translate request files again each time they change.
+
+"""
+
+import errno
+import io
+import os
+import select
+import struct
+import sys
+import time
+
+from .input_handler import callback_file
+from .interface import HttpRequestTranslator
+from .plugin_manager import get_script_class
+
+
+#: Interval between two scans of the watched files when inotify is not available, in seconds.
+POLL_INTERVAL = 0.01
+
+# Events of the inotify API, see inotify(7): a file written then closed, or moved over, e.g. by an editor saving it.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+# Header of an inotify event: watch descriptor, mask, cookie and length of the name following it.
+_inotify_event = struct.Struct('iIII')
+# Size of the buffer the inotify events are read in, room for many events of long file names.
+_INOTIFY_BUFFER_SIZE = 64 * 1024
+
+
+def _load_inotify():
+    """Functions of the inotify API of the C library.
+
+    :raises OSError: When inotify is not available, e.g. on another platform than Linux.
+
+    :return: The C library.
+    :rtype: `ctypes.CDLL`
+    """
+    try:
+        import ctypes
+        import ctypes.util
+    except ImportError:  # Some minimal Python builds have no ctypes.
+        raise OSError(errno.ENOSYS, "inotify is not available")
+    libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    try:
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except AttributeError:
+        raise OSError(errno.ENOSYS, "inotify is not available")
+    return libc
+
+
+def _get_errno():
+    """Error number of the last call to the C library."""
+    import ctypes
+    return ctypes.get_errno()
+
+
+class PollingWatcher(object):
+
+    """Watches files by comparing their modification time, size and inode at a regular interval."""
+
+    def __init__(self, filepaths, interval=POLL_INTERVAL):
+        """Starts watching files.
+
+        :param list filepaths: Paths of the files to watch.
+        :param float interval: Interval between two scans of the files, in seconds.
+        """
+        self.filepaths = list(filepaths)
+        self.interval = interval
+        self._stats = dict((filepath, self._stat(filepath)) for filepath in self.filepaths)
+
+    @staticmethod
+    def _stat(filepath):
+        """Signature of the content of a file.
+
+        :return: Tuple of the modification time, size and inode, ``None`` when the file does not exist.
+        :rtype: tuple
+        """
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size, stat.st_ino
+
+    def wait(self, timeout=None):
+        """Waits for some of the files to change.
+
+        :param float timeout: Maximum waiting time in seconds, forever if ``None``.
+
+        :return: Paths of the changed files, in the order they were given. Empty when the timeout expired.
+        :rtype: list
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            changed = []
+            for filepath in self.filepaths:
+                stat = self._stat(filepath)
+                if stat != self._stats[filepath]:
+                    self._stats[filepath] = stat
+                    if stat is not None:  # A removed file changes again when it is written back.
+                        changed.append(filepath)
+            if changed:
+                return changed
+            if deadline is not None and time.time() >= deadline:
+                return []
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class InotifyWatcher(object):
+
+    """Watches files with the inotify API of Linux.
+
+    The directories of the files are watched rather than the files themselves, so that a file replaced by an editor
+    saving it to a temporary file first is still watched.
+    """
+
+    def __init__(self, filepaths):
+        """Starts watching files.
+
+        :param list filepaths: Paths of the files to watch.
+
+        :raises OSError: When inotify is not available or a directory cannot be watched.
+        """
+        libc = _load_inotify()
+        self.filepaths = list(filepaths)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(_get_errno(), "inotify_init1 failed")
+        # Watched files by name, by watch descriptor of their directory.
+        self._names = {}
+        directories = {}
+        for filepath in self.filepaths:
+            directory, name = os.path.split(os.path.abspath(filepath))
+            directories.setdefault(directory, {})[name] = filepath
+        try:
+            for directory, names in directories.items():
+                watch = libc.inotify_add_watch(
+                    self._fd, directory.encode(sys.getfilesystemencoding()), IN_CLOSE_WRITE | IN_MOVED_TO)
+                if watch < 0:
+                    raise OSError(_get_errno(), "Failed to watch '%s'" % directory)
+                self._names.setdefault(watch, {}).update(names)
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self, timeout=None):
+        """Waits for some of the files to change.
+
+        :param float timeout: Maximum waiting time in seconds, forever if ``None``.
+
+        :return: Paths of the changed files. Empty when the timeout expired.
+        :rtype: list
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.time(), 0)
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return []
+            changed = self._read_events()
+            if changed:
+                return changed
+
+    def _read_events(self):
+        """Reads the pending events.
+
+        :return: Paths of the watched files changed by the events.
+        :rtype: list
+        """
+        try:
+            data = os.read(self._fd, _INOTIFY_BUFFER_SIZE)
+        except OSError as error:
+            if error.errno in (errno.EAGAIN, errno.EINTR):
+                return []
+            raise
+        changed = []
+        offset = 0
+        while offset < len(data):
+            watch, _, _, length = _inotify_event.unpack_from(data, offset)
+            offset += _inotify_event.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(sys.getfilesystemencoding(), 'replace')
+            offset += length
+            filepath = self._names.get(watch, {}).get(name)
+            if filepath is not None and filepath not in changed:
+                changed.append(filepath)
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def get_watcher(filepaths, polling=False, interval=POLL_INTERVAL):
+    """Watcher of files, using inotify when available and polling otherwise.
+
+    :param list filepaths: Paths of the files to watch.
+    :param bool polling: Whether to poll the files even if inotify is available, e.g. on network file systems.
+    :param float interval: Interval between two scans of the files when polling, in seconds.
+
+    :return: The watcher, having a `wait` method returning the paths of the changed files.
+    :rtype: :class:`InotifyWatcher` or :class:`PollingWatcher`
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(filepaths)
+        except OSError:
+            pass
+    return PollingWatcher(filepaths, interval)
+
+
+def get_output_path(filepath, language):
+    """Path of the script of a language generated for a request file, next to it, e.g. 'req.py' for 'req.txt'.
+
+    :param str filepath: Path of the request file.
+    :param str language: Name of the language.
+
+    :return: The path of the script, never the request file itself.
+    :rtype: str
+    """
+    extension = get_script_class(language).__extension__ or language
+    output_path = '%s.%s' % (os.path.splitext(filepath)[0], extension)
+    if output_path == filepath:
+        output_path = '%s.%s' % (filepath, extension)
+    return output_path
+
+
+def check_output_paths(filepaths, languages=['bash']):
+    """Checks that the scripts generated for request files overwrite neither the request files nor each other, e.g.
+    'req.py' generated for 'req.txt' when 'req.py' is also watched.
+
+    :param list filepaths: Paths of the request files.
+    :param list languages: list of languages in which request's code is to be generated.
+
+    :raises ValueError: When an output path is the path of a request file or of the script of another request file,
+        or a language is not supported.
+    """
+    inputs = set(os.path.abspath(filepath) for filepath in filepaths)
+    outputs = {}  # Request file of each output path.
+    for filepath in filepaths:
+        for language in languages:
+            output_path = os.path.abspath(get_output_path(filepath, language))
+            if output_path in inputs:
+                raise ValueError("The %s script of %s would overwrite the watched file %s." % (
+                    language, filepath, get_output_path(filepath, language)))
+            other = outputs.setdefault(output_path, filepath)
+            if other != filepath:
+                raise ValueError("The scripts of %s and %s would both be written to %s." % (
+                    other, filepath, get_output_path(filepath, language)))
+
+
+def translate_file(filepath, languages=['bash'], **options):
+    """Translates a request file and writes the scripts next to it, see :func:`get_output_path`.
+
+    :param str filepath: Path of the request file.
+    :param list languages: list of languages in which request's code is to be generated.
+    :param options: Options of :class:`hrt.interface.HttpRequestTranslator`, e.g. 'proxy' or 'search_string'.
+
+    :raises ValueError: When the request is malformed, its URL is invalid or a language is not supported.
+    :raises OSError, IOError: When the request file fails to open or a script fails to be written.
+
+    :return: Paths of the written scripts.
+    :rtype: list
+    """
+    codes = HttpRequestTranslator(request=callback_file(filepath), languages=languages, **options).generate_code()
+    output_paths = []
+    for language in languages:
+        output_path = get_output_path(filepath, language)
+        with io.open(output_path, 'w', encoding='utf-8') as fp:
+            fp.write(codes[language])
+        output_paths.append(output_path)
+    return output_paths
+
+
+def watch_files(filepaths, languages=['bash'], watcher=None, stream=None, timeout=None, **options):
+    """Translates request files, then translates again each file changing, until interrupted.
+
+    The script classes and templates loaded by the first translation are reused by the next ones. Every translation
+    is reported with its duration.
+
+    :param list filepaths: Paths of the request files.
+    :param list languages: list of languages in which request's code is to be generated.
+    :param watcher: Watcher of the files, see :func:`get_watcher`. Defaults to the best one available.
+    :param file stream: Stream where the translations are reported. Defaults to stderr.
+    :param float timeout: Stop when no file changed for this number of seconds, never if ``None``.
+    :param options: Options of :class:`hrt.interface.HttpRequestTranslator`, e.g. 'proxy' or 'search_string'.
+
+    :raises ValueError: When a script would overwrite a request file or another script, see
+        :func:`check_output_paths`.
+    """
+    check_output_paths(filepaths, languages)
+    stream = stream or sys.stderr
+    with watcher or get_watcher(filepaths) as watcher:
+        changed = list(filepaths)
+        while changed:
+            for filepath in changed:
+                start = time.time()
+                try:
+                    output_paths = translate_file(filepath, languages, **options)
+                except (ValueError, OSError, IOError) as error:
+                    stream.write("%s: %s\n" % (filepath, error))
+                else:
+                    stream.write("%s: wrote %s in %.1fms\n" % (
+                        filepath, ', '.join(output_paths), (time.time() - start) * 1000))
+                stream.flush()
+            changed = watcher.wait(timeout)
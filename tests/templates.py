@@ -23,33 +23,32 @@ def main():
 
 
 code_search_python = """
+    # Search the response as it is received, without keeping it in memory
+    pattern = re.compile(r"hello3131\\"you\\\\"are'awesome")
+    first_match = 0
+    state = {'tail': '', 'matches': 0}
+
+    def search(chunk):
+        text = state['tail'] + chunk.decode('iso-8859-1')
+        end = 0
+        for match in pattern.finditer(text):
+            print('Matched item: ', match.group(0))
+            state['matches'] += 1
+            end = match.end()
+            if first_match:
+                return 0  # Aborts the transfer
+        # Keep the end of the chunk, in case a match spans the next one
+        state['tail'] = text[max(end, len(text) - 4096):]
+
+    curl_handler.setopt(curl_handler.WRITEFUNCTION, search)
     try:
         curl_handler.perform()
-    except pycurl.error, error:
-        print('An error occurred: ', error)
+    except pycurl.error as error:
+        if not (first_match and state['matches']):
+            print('An error occurred: ', error)
     curl_handler.close()
 
-    body = buffer.getvalue()
-    # Body is a string on Python 2 and a byte string on Python 3.
-    # If we know the encoding, we can always decode the body and
-    # end up with a Unicode string.
-    response = body.decode('iso-8859-1')
-
-    match = re.findall(r"hello3131\\"you\\\\"are'awesome", str(response))
-    try:
-        from termcolor import colored
-        lib_available = True
-    except ImportError:
-        lib_available = False
-    if match:
-        for item in match:
-            if lib_available:
-                replace_string = colored(match[item], 'green')
-                response = re.sub(match[item], replace_string, str(response))
-            else:
-                print("Matched item: ",item)
-
-    print(response)
+    print('Matched %d item(s)' % state['matches'])
 
 
 if __name__ == '__main__':
@@ -88,7 +87,7 @@ def main():
 
     try:
         curl_handler.perform()
-    except pycurl.error, error:
+    except pycurl.error as error:
         print('An error occurred: ', error)
     curl_handler.close()
 
@@ -137,7 +136,7 @@ def main():
 
     try:
         curl_handler.perform()
-    except pycurl.error, error:
+    except pycurl.error as error:
         print('An error occurred: ', error)
     curl_handler.close()
 
@@ -172,42 +171,36 @@ options = {
 
 code_search_ruby = """
 }
+pattern = /hello3131\\"you\\\\"are'awesome/
+first_match = 0 == 1
+tail = ''
+matches = 0
 req = Typhoeus::Request.new(url, options)
+req.on_headers do |response|
+  puts "Response #{response.code}:"
+end
+# Search the response as it is received, without keeping it in memory
+req.on_body do |chunk|
+  text = tail + chunk.dup.force_encoding('ISO-8859-1')
+  position = 0
+  while (matched = pattern.match(text, position)) && !matched[0].empty?
+    puts "Matched item: #{matched[0]}"
+    matches += 1
+    position = matched.end(0)
+    break if first_match
+  end
+  # Keep the end of the chunk, in case a match spans the next one
+  tail = text[[position, text.length - 4096].max..-1]
+  :abort if first_match && matches > 0
+end
 req.on_complete do |response|
-  if response.success?
-    puts 'Response #{response.code}:'
-    begin
-        require 'colorize'
-        lib_available = true
-    rescue LoadError
-        lib_available = false
-    end
-
-    matched = response.body.match /hello3131\\"you\\\\"are'awesome/
-
-    original = response.body
-    if matched then
-        if lib_available then
-            for i in 0..matched.length
-                original.gsub! /#{matched[i]}/, "#{matched[i]}".green
-            end
-        else
-            for i in 0..matched.length
-                puts 'Matched item: #{matched[i]}'
-            end
-        end
-    end
-    puts original
-
-  elsif response.timed_out?
+  if response.timed_out?
     puts 'Request Timed Out!'
-  elsif response.code == 0
+  elsif response.code == 0 && !(first_match && matches > 0)
     # Could not get an http response, something's wrong.
     puts response.return_message
-  else
-    # Received a non-successful http response.
-    puts 'HTTP request failed: ' + response.code.to_s
   end
+  puts "Matched #{matches} item(s)"
 end
 
 req.run
@@ -289,7 +282,7 @@ code_begin_bash = """#!/usr/bin/env bash
 curl"""
 
 
-code_search_bash = """ | egrep --color " hello3131\\"you\\\\"are'awesome |$" """
+code_search_bash = """ --no-buffer | if [ 0 = 1 ]; then grep -E -o -m 1 "hello3131\\"you\\\\"are'awesome"; else grep -E -o "hello3131\\"you\\\\"are'awesome"; fi"""
 
 
 code_bash = """#!/usr/bin/env bash
@@ -317,27 +310,37 @@ $headers[] = "Host: google.com";
 
 code_search_php = """
 curl_setopt($ch, CURLOPT_HTTPHEADER, $headers);
-$response = curl_exec($ch);
-
-if (curl_errno($ch)) {
- print curl_error($ch);
-} else {
- curl_close($ch);
-}
-print $response;
 $string = "hello3131\\"you\\\\"are'awesome";
-// Blindly copied from http://stackoverflow.com/questions/10778318/test-if-a-string-is-regex
 // Checks if the passed string is a regex or a simple string
-if( preg_match("/^\/.+\/[a-z]*$/i",$string)) {
-    if (preg_match($string, $response, $match)) {
-        print 'Found a match!';
-    }
+if (!preg_match("/^\\/.+\\/[a-z]*$/i", $string)) {
+    $string = '/' . preg_quote($string, '/') . '/';
 }
-else {
-    if (strpos($response,$string) !== false) {
-        print 'Found a match!';
+$first_match = 0;
+$tail = '';
+$matches = 0;
+// Search the response as it is received, without keeping it in memory
+curl_setopt($ch, CURLOPT_WRITEFUNCTION, function ($ch, $chunk) use ($string, $first_match, &$tail, &$matches) {
+    $text = $tail . $chunk;
+    $position = 0;
+    while (preg_match($string, $text, $match, PREG_OFFSET_CAPTURE, $position) && $match[0][0] !== '') {
+        print 'Matched item: ' . $match[0][0] . "\\n";
+        $matches++;
+        $position = $match[0][1] + strlen($match[0][0]);
+        if ($first_match) {
+            return 0;  // Aborts the transfer
+        }
     }
+    // Keep the end of the chunk, in case a match spans the next one
+    $tail = (string) substr($text, max($position, strlen($text) - 4096));
+    return strlen($chunk);
+});
+curl_exec($ch);
+
+if (curl_errno($ch) && !($first_match && $matches)) {
+ print curl_error($ch);
 }
+curl_close($ch);
+print "Matched $matches item(s)\\n";
 """
 
 
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from hrt import batch
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.raw_requests = "GET /a HTTP/1.1\n"\
+                            "Host: foo.bar\n"\
+                            "\n"\
+                            "POST /b HTTP/1.1\n"\
+                            "Host: foo.bar\n"\
+                            "\n"\
+                            "x=1\n"\
+                            "\n"\
+                            "GET /c HTTP/1.1\n"\
+                            "Host\n"
+        with open(os.path.join(self.tmp_dir, 'capture.txt'), 'w') as fp:
+            fp.write(self.raw_requests)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    ###
+    # batch.iter_batch_input
+    ###
+    def test_iter_batch_input_directory(self):
+        sources = [source for source, _ in batch.iter_batch_input(self.tmp_dir)]
+        self.assertEqual(sources, ['capture.0', 'capture.1', 'capture.2'])
+
+    ###
+    # batch.run_batch
+    ###
+    def test_run_batch_output_dir(self):
+        output_dir = os.path.join(self.tmp_dir, 'out')
+        stats = batch.run_batch(
+            os.path.join(self.tmp_dir, 'capture.txt'), languages=['bash', 'python'], output_dir=output_dir)
+        self.assertEqual(stats.total, 3)
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(
+            sorted(os.listdir(output_dir)),
+            ['capture.0.py', 'capture.0.sh', 'capture.1.py', 'capture.1.sh'])
+        with open(os.path.join(output_dir, 'capture.0.sh')) as fp:
+            self.assertEqual(
+                fp.read(),
+                '#!/usr/bin/env bash\ncurl -v --request GET http://foo.bar/a  --header "Host: foo.bar"  --include')
+
+    def test_run_batch_malformed_chunked(self):
+        with open(os.path.join(self.tmp_dir, 'capture.txt'), 'a') as fp:
+            fp.write("\nPOST /d HTTP/1.1\nHost: foo.bar\nTransfer-Encoding: chunked\n\nzz\nx=1\n"
+                     "GET /e HTTP/1.1\nHost: foo.bar\n")
+        output_dir = os.path.join(self.tmp_dir, 'out')
+        for dedup in (False, True):
+            stats = batch.run_batch(
+                os.path.join(self.tmp_dir, 'capture.txt'), languages=['bash'], output_dir=output_dir, dedup=dedup)
+            self.assertEqual((stats.total, stats.failed), (5, 2))
+            self.assertEqual(
+                sorted(os.listdir(output_dir)), ['capture.0.sh', 'capture.1.sh', 'capture.4.sh'])
+
+    def test_run_batch_load_options(self):
+        output_dir = os.path.join(self.tmp_dir, 'out')
+        batch.run_batch(
+            os.path.join(self.tmp_dir, 'capture.txt'), languages=['python_load'], output_dir=output_dir, repeat=7,
+            concurrency=3, keep_alive=False)
+        with open(os.path.join(output_dir, 'capture.0.load.py')) as fp:
+            code = fp.read()
+        self.assertIn('REPEAT = 7', code)
+        self.assertIn('CONCURRENCY = 3', code)
+        self.assertIn('KEEP_ALIVE = False', code)
+
+    def test_run_batch_dedup(self):
+        with open(os.path.join(self.tmp_dir, 'capture.txt'), 'a') as fp:
+            fp.write("\nGET /a HTTP/1.1\nhost: foo.bar\n\nGET /a HTTP/1.1\nHost: foo.bar\n")
+        output_dir = os.path.join(self.tmp_dir, 'out')
+        stats = batch.run_batch(
+            os.path.join(self.tmp_dir, 'capture.txt'), languages=['bash'], output_dir=output_dir, dedup=True)
+        self.assertEqual((stats.total, stats.failed, stats.duplicates), (5, 1, 2))
+        self.assertEqual(
+            sorted(os.listdir(output_dir)), ['capture.0.sh', 'capture.1.sh', 'capture.3.sh', 'capture.4.sh'])
+        with open(os.path.join(output_dir, 'capture.0.sh')) as first, open(os.path.join(output_dir, 'capture.4.sh')) as duplicate:
+            self.assertEqual(first.read(), duplicate.read())
+        self.assertIn('2 duplicate(s)', str(stats))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules of hrt imported by `bin/hrt --help`, the others are imported by the modes needing them.
+STARTUP_MODULES = ['hrt', 'hrt.cli']
+
+# Modules of the standard library only needed once a mode runs, which must not slow down the startup.
+LAZY_MODULES = ['asyncio', 'json', 'mmap', 'multiprocessing', 'urllib.parse']
+
+
+def import_times():
+    """Import times of `bin/hrt --help`, as reported by `python -X importtime`.
+
+    :return: Cumulative import time in microseconds, by module name. Nested imports are only counted in the module
+        importing them.
+    :rtype: dict
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    process = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', os.path.join(ROOT, 'bin', 'hrt'), '--help'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env)
+    _, stderr = process.communicate()
+    times = {}
+    for line in stderr.decode('utf-8').splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "-X importtime requires Python 3.7+")
+class TestStartup(unittest.TestCase):
+
+    ###
+    # bin/hrt
+    ###
+    def test_startup_modules(self):
+        # The modules imported rather than the import time, which depends on the load of the machine.
+        imported = set(name.strip() for name in import_times())
+        self.assertEqual(
+            sorted(name for name in imported if name == 'hrt' or name.startswith('hrt.')), STARTUP_MODULES)
+
+    def test_lazy_imports(self):
+        imported = set(name.strip() for name in import_times())
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, imported, "'%s' is imported at startup" % module)
+
+
+class TestBatchArgs(unittest.TestCase):
+
+    ###
+    # cli.process_batch_args
+    ###
+    def test_batch_body_file(self):
+        # Every request of the batch would write its body to the same file.
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        for option in ('--body-file', '--form-dir'):
+            process = subprocess.Popen(
+                [sys.executable, os.path.join(ROOT, 'bin', 'hrt'), '--batch', ROOT, option, 'body'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env)
+            _, stderr = process.communicate()
+            self.assertEqual(process.returncode, 2)
+            self.assertIn(b'not allowed with argument --body-file or --form-dir', stderr)
+
+
+
+class TestWatchArgs(unittest.TestCase):
+
+    ###
+    # cli.process_watch_args
+    ###
+    def test_watch_body_file(self):
+        # Every watched request file would write its body to the same file.
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        for option in ('--body-file', '--form-dir'):
+            process = subprocess.Popen(
+                [sys.executable, os.path.join(ROOT, 'bin', 'hrt'), '--watch', 'req.txt', option, 'body'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env)
+            _, stderr = process.communicate()
+            self.assertEqual(process.returncode, 2)
+            self.assertIn(b'not allowed with argument --body-file or --form-dir', stderr)
+
+    def test_watch_output_collision(self):
+        # The python script of req.txt would overwrite req.py.
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, 'bin', 'hrt'), '--watch', 'req.txt', 'req.py', '-l', 'python'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env)
+        _, stderr = process.communicate()
+        self.assertEqual(process.returncode, 2)
+        self.assertIn(b'would overwrite the watched file', stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,12 @@
+import io
+import json
+import os
+import shutil
+import tempfile
 import unittest
 
 from hrt import input_handler
+from hrt.parser import RawRequest
 
 
 class TestCLIInput(unittest.TestCase):
@@ -29,5 +35,116 @@ class TestCLIInput(unittest.TestCase):
         pass
 
 
+class TestFileInput(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.tmp_dir, 'requests.txt')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    ###
+    # input_handler.callback_file
+    ###
+    def test_callback_file(self):
+        with open(self.filepath, 'w') as fp:
+            fp.write("GET / HTTP/1.1\nHost: foo.bar\n")
+        self.assertEqual(input_handler.callback_file(self.filepath), "GET / HTTP/1.1\nHost: foo.bar\n")
+
+    ###
+    # input_handler.iter_file_requests
+    ###
+    def test_iter_file_requests(self):
+        with open(self.filepath, 'wb') as fp:
+            fp.write(
+                b"POST /a HTTP/1.1\r\n"
+                b"Host: foo.bar\r\n"
+                b"Content-Length: 3\r\n"
+                b"\r\n"
+                b"x=1"
+                b"GET /b HTTP/1.1\r\n"
+                b"Host: foo.bar\r\n")
+        self.assertEqual(
+            list(input_handler.iter_file_requests(self.filepath)),
+            [
+                RawRequest('POST /a HTTP/1.1', ['Host: foo.bar', 'Content-Length: 3'], 'x=1'),
+                RawRequest('GET /b HTTP/1.1', ['Host: foo.bar'], ''),
+            ])
+
+    def test_iter_file_requests_empty(self):
+        open(self.filepath, 'wb').close()
+        self.assertEqual(list(input_handler.iter_file_requests(self.filepath)), [])
+
+
+class TestHarInput(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.har = {
+            'log': {
+                'version': '1.2',
+                'pages': [{'title': 'entries', 'comment': '"entries": ['}],
+                'entries': [
+                    {
+                        'request': {
+                            'method': 'GET',
+                            'url': 'https://foo.bar/robots.txt?a=b',
+                            'httpVersion': 'HTTP/1.1',
+                            'headers': [{'name': 'Host', 'value': 'foo.bar'}, {'name': 'Accept', 'value': '*/*'}],
+                        }
+                    },
+                    {
+                        'request': {
+                            'method': 'POST',
+                            'url': 'https://foo.bar/login',
+                            'httpVersion': 'h2',
+                            'headers': [{'name': ':authority', 'value': 'foo.bar'}],
+                            'postData': {'params': [{'name': 'user', 'value': 'b\u00e9a'}]},
+                        }
+                    },
+                ]
+            }
+        }
+        self.filepath = os.path.join(self.tmp_dir, 'capture.har')
+        with io.open(self.filepath, 'w', encoding='utf-8') as fp:
+            fp.write(json.dumps(self.har, indent=2, ensure_ascii=False))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    ###
+    # input_handler.iter_har_entries
+    ###
+    def test_iter_har_entries_small_chunks(self):
+        chunk_size = input_handler.HAR_CHUNK_SIZE
+        input_handler.HAR_CHUNK_SIZE = 7
+        try:
+            with io.open(self.filepath, encoding='utf-8') as fp:
+                self.assertEqual(list(input_handler.iter_har_entries(fp)), self.har['log']['entries'])
+        finally:
+            input_handler.HAR_CHUNK_SIZE = chunk_size
+
+    def test_iter_har_entries_malformed(self):
+        with self.assertRaises(ValueError):
+            list(input_handler.iter_har_entries(io.StringIO(u'{"log": {}}')))
+        with self.assertRaises(ValueError):
+            list(input_handler.iter_har_entries(io.StringIO(u'{"log": {"entries": [{"request": ')))
+
+    ###
+    # input_handler.callback_har
+    ###
+    def test_callback_har(self):
+        self.assertEqual(
+            list(input_handler.callback_har(self.filepath)),
+            [
+                RawRequest('GET https://foo.bar/robots.txt?a=b HTTP/1.1', ['Host: foo.bar', 'Accept: */*'], ''),
+                RawRequest('POST https://foo.bar/login HTTP/1.1', ['Host: foo.bar'], 'user=b%C3%A9a'),
+            ])
+
+    def test_har_entry_to_request_malformed(self):
+        self.assertRaises(ValueError, input_handler.har_entry_to_request, {'response': {}})
+
+
 if __name__ == '__main__':
     unittest.main()
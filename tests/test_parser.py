@@ -0,0 +1,342 @@
+import unittest
+from io import BytesIO
+
+from hrt import parser
+
+
+class TestParser(unittest.TestCase):
+
+    ###
+    # parser.iter_raw_requests
+    ###
+    def test_iter_raw_requests_content_length(self):
+        stream = BytesIO(
+            b"POST /a HTTP/1.1\r\n"
+            b"Host: foo.bar\r\n"
+            b"Content-Length: 15\r\n"
+            b"\r\n"
+            b"x=1\r\nGET / HTTP\r\n"
+            b"GET /b HTTP/1.1\r\n"
+            b"Host: foo.bar\r\n"
+            b"\r\n")
+        self.assertEqual(
+            list(parser.iter_raw_requests(stream)),
+            [
+                parser.RawRequest('POST /a HTTP/1.1', ['Host: foo.bar', 'Content-Length: 15'], 'x=1\r\nGET / HTTP'),
+                parser.RawRequest('GET /b HTTP/1.1', ['Host: foo.bar'], ''),
+            ])
+
+    def test_iter_raw_requests_chunked(self):
+        stream = BytesIO(
+            b"POST /a HTTP/1.1\r\n"
+            b"Host: foo.bar\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"\r\n"
+            b"3;ext=1\r\n"
+            b"x=1\r\n"
+            b"4\r\n"
+            b"&y=2\r\n"
+            b"0\r\n"
+            b"Trailer: value\r\n"
+            b"\r\n"
+            b"\r\n"
+            b"GET /b HTTP/1.1\r\n"
+            b"Host: foo.bar\r\n")
+        requests = list(parser.iter_raw_requests(stream))
+        self.assertEqual([request.data for request in requests], ['x=1&y=2', ''])
+        self.assertEqual(requests[1].request_line, 'GET /b HTTP/1.1')
+
+    def test_iter_raw_requests_chunked_malformed(self):
+        stream = BytesIO(
+            b"POST /a HTTP/1.1\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"\r\n"
+            b"zz\r\n")
+        with self.assertRaises(ValueError):
+            list(parser.iter_raw_requests(stream))
+
+    def test_iter_raw_requests_chunked_malformed_yield_errors(self):
+        stream = BytesIO(
+            b"POST /a HTTP/1.1\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"\r\n"
+            b"zz\r\n"
+            b"x=1\r\n"
+            b"GET /b HTTP/1.1\r\n"
+            b"Host: foo.bar\r\n")
+        requests = list(parser.iter_raw_requests(stream, yield_errors=True))
+        self.assertEqual(len(requests), 2)
+        self.assertIsInstance(requests[0], ValueError)
+        self.assertEqual(requests[1], parser.RawRequest('GET /b HTTP/1.1', ['Host: foo.bar'], ''))
+
+    def test_iter_raw_requests_no_framing(self):
+        stream = BytesIO(
+            b"POST /a\n"
+            b"Host: foo.bar\n"
+            b"\n"
+            b"x=1\n"
+            b"\n"
+            b"GET /b HTTP/1.1\n"
+            b"Host: foo.bar\n")
+        self.assertEqual(
+            list(parser.iter_raw_requests(stream)),
+            [
+                parser.RawRequest('POST /a', ['Host: foo.bar'], 'x=1'),
+                parser.RawRequest('GET /b HTTP/1.1', ['Host: foo.bar'], ''),
+            ])
+
+    def test_iter_raw_requests_no_framing_multiline_body(self):
+        stream = BytesIO(
+            b"POST /a\r\n"
+            b"Host: foo.bar\r\n"
+            b"\r\n"
+            b"x=1\r\n"
+            b"y=2\r\n"
+            b"\r\n")
+        self.assertEqual(list(parser.iter_raw_requests(stream))[0].data, 'x=1\r\ny=2')
+
+    def test_iter_raw_requests_empty(self):
+        self.assertEqual(list(parser.iter_raw_requests(BytesIO(b"\r\n\r\n"))), [])
+
+    ###
+    # parser.parse_raw_request
+    ###
+    def test_parse_raw_request(self):
+        self.assertEqual(
+            parser.parse_raw_request("\r\nPOST https://foo.bar/a;b?c=1 HTTP/1.1\r\nhost:foo.bar\r\nX: y\r\n\r\nx=1\n\ny=2\r\n"),
+            (
+                ['host:foo.bar', 'X: y'],
+                {
+                    'data': 'x=1\n\ny=2',
+                    'method': 'POST',
+                    'Host': 'foo.bar',
+                    'protocol': 'HTTP',
+                    'version': '1.1',
+                    'path': '/a;b?c=1',
+                    'pre_scheme': 'https://',
+                }
+            ))
+
+    def test_parse_raw_request_line_breaks(self):
+        expected = parser.parse_request('GET /a HTTP/1.1', ['Host: foo.bar'], 'x=1')
+        for line_break in ('\r\n', '\n', '\r'):
+            raw_request = line_break.join(['GET /a HTTP/1.1', 'Host: foo.bar', '', 'x=1'])
+            self.assertEqual(parser.parse_raw_request(raw_request), expected)
+            self.assertEqual(parser.parse_raw_request(raw_request.encode('utf-8')), expected)
+
+    def test_parse_raw_request_same_as_split(self):
+        for raw_request in ("GET /\nHost: foo.bar\n", "GET / HTTP//1.b", "POST /a\n\n\nx=1\n"):
+            self.assertEqual(
+                parser.parse_raw_request(raw_request), parser.parse_request(*parser.split_raw_request(raw_request)))
+
+    def test_parse_raw_request_missing_host(self):
+        self.assertEqual(parser.parse_raw_request("GET / HTTP/1.1\nAccept: */*")[1]['Host'], '')
+
+    def test_parse_raw_request_malformed(self):
+        for raw_request in ('', '\r\n\r\n', 'GET', 'GET / HTTP/1.1\nHost'):
+            with self.assertRaises(ValueError):
+                parser.parse_raw_request(raw_request)
+
+    ###
+    # parser.parse_compact_request
+    ###
+    def test_parse_compact_request(self):
+        raw_request = "POST https://foo.bar/a HTTP/1.1\r\nHost: foo.bar\r\nX-Header: y\r\n\r\nx=1"
+        parsed = parser.parse_compact_request(raw_request)
+        self.assertEqual(parsed.header_names, ('Host', 'X-Header'))
+        self.assertEqual(parsed.header_values, (' foo.bar', ' y'))
+        self.assertEqual(parsed.header_pairs, (('Host', ' foo.bar'), ('X-Header', ' y')))
+        self.assertEqual((parsed.headers, parsed.details), parser.parse_raw_request(raw_request))
+        self.assertEqual(parser.parse_compact_request(parser.split_raw_request(raw_request)), parsed)
+
+    def test_parse_compact_request_header_lines(self):
+        parsed = parser.parse_compact_request("GET /a HTTP/1.1\nHost: foo.bar\nX-Header: 1:2")
+        self.assertEqual(parsed.header_lines, ('Host: foo.bar', 'X-Header: 1:2'))
+        self.assertEqual(parsed.header_pairs, (('Host', ' foo.bar'), ('X-Header', ' 1:2')))
+
+    def test_parse_compact_request_shared_pairs(self):
+        first = parser.parse_compact_request("GET /a HTTP/1.1\nHost: foo.bar\nX-Header: y")
+        second = parser.parse_compact_request("GET /b HTTP/1.1\nHost: foo.bar\nX-Header: z")
+        self.assertIs(first.header_pairs[0], second.header_pairs[0])
+        self.assertIs(first.header_names[1], second.header_names[1])
+        self.assertEqual(second.header_values, (' foo.bar', ' z'))
+
+    def test_parse_compact_request_malformed(self):
+        with self.assertRaises(ValueError):
+            parser.parse_compact_request("GET / HTTP/1.1\nHost")
+
+    ###
+    # parser.ParsedRequest
+    ###
+    def test_parsed_request_from_details(self):
+        headers, details = parser.parse_raw_request("GET /a HTTP/1.1\nHost: foo.bar\nAccept: */*")
+        details.update(proxy_host='http://127.0.0.1', proxy_port='8080')
+        parsed = parser.ParsedRequest.from_details(headers, details)
+        self.assertEqual((parsed.headers, parsed.details), (headers, details))
+        self.assertNotEqual(parsed, parser.parse_compact_request("GET /a HTTP/1.1\nHost: foo.bar\nAccept: */*"))
+
+    def test_parsed_request_slots(self):
+        parsed = parser.parse_compact_request("GET /a HTTP/1.1\nHost: foo.bar")
+        with self.assertRaises(AttributeError):
+            parsed.extra = None
+
+    ###
+    # parser.split_raw_request
+    ###
+    def test_split_raw_request(self):
+        self.assertEqual(
+            parser.split_raw_request("POST /a HTTP/1.1\r\nHost: foo.bar\r\n\r\nx=1\n\ny=2\r\n"),
+            parser.RawRequest('POST /a HTTP/1.1', ['Host: foo.bar'], 'x=1\n\ny=2'))
+
+    def test_split_raw_request_no_body(self):
+        self.assertEqual(
+            parser.split_raw_request("GET /a HTTP/1.1\nHost: foo.bar"),
+            parser.RawRequest('GET /a HTTP/1.1', ['Host: foo.bar'], ''))
+
+    def test_split_raw_request_mixed_line_breaks(self):
+        self.assertEqual(
+            parser.split_raw_request("GET / HTTP/1.1\r\nHost: a.com\nAccept: */*\n\nbody"),
+            parser.RawRequest('GET / HTTP/1.1', ['Host: a.com', 'Accept: */*'], 'body'))
+        self.assertEqual(
+            parser.split_raw_request("GET / HTTP/1.1\nHost: a.com\r\nAccept: */*\r\n\r\nbody"),
+            parser.RawRequest('GET / HTTP/1.1', ['Host: a.com', 'Accept: */*'], 'body'))
+        self.assertEqual(
+            parser.split_raw_request("GET / HTTP/1.1\rHost: a.com\r\rbody"),
+            parser.RawRequest('GET / HTTP/1.1', ['Host: a.com'], 'body'))
+        _, details = parser.parse_raw_request("GET / HTTP/1.1\r\nHost: a.com\nAccept: */*\n\nbody")
+        self.assertEqual((details['Host'], details['data']), ('a.com', 'body'))
+
+    def test_split_raw_request_empty(self):
+        with self.assertRaises(ValueError):
+            parser.split_raw_request('')
+
+    ###
+    # parser.iter_compact_requests
+    ###
+    def test_iter_compact_requests(self):
+        stream = BytesIO(
+            b"GET /a HTTP/1.1\r\n"
+            b"Host: foo.bar\r\n"
+            b"\r\n"
+            b"POST /b HTTP/1.1\r\n"
+            b"Host: foo.bar\r\n"
+            b"Content-Length: 3\r\n"
+            b"\r\n"
+            b"x=1")
+        requests = list(parser.iter_compact_requests(stream))
+        self.assertEqual([(request.method, request.path, request.data) for request in requests], [
+            ('GET', '/a', ''), ('POST', '/b', 'x=1')])
+
+    ###
+    # parser.iter_chunks
+    ###
+    def test_iter_chunks(self):
+        stream = BytesIO(b"3;ext=1\r\nx=1\r\n4\r\n&y=2\r\n0\r\n\r\nGET / HTTP/1.1\r\n")
+        self.assertEqual(list(parser.iter_chunks(stream)), [b'x=1', b'&y=2'])
+        self.assertEqual(stream.readline(), b'GET / HTTP/1.1\r\n')
+
+    def test_iter_chunks_truncated(self):
+        self.assertEqual(list(parser.iter_chunks(BytesIO(b"3\r\nx=1\r\n"))), [b'x=1'])
+        with self.assertRaises(ValueError):
+            list(parser.iter_chunks(BytesIO(b"3\r\nx=1\r\n"), strict=True))
+
+    def test_iter_chunks_malformed(self):
+        with self.assertRaises(ValueError):
+            list(parser.iter_chunks(BytesIO(b"x=1\r\n")))
+
+    ###
+    # parser.decode_chunked
+    ###
+    def test_decode_chunked(self):
+        self.assertEqual(parser.decode_chunked("3\r\nx=1\n4\r\n&y=2\r\n0\r\n\r\n"), 'x=1&y=2')
+        self.assertEqual(parser.decode_chunked(u"2\r\n\u03a9\r\n0\r\n"), u"\u03a9")
+
+    def test_decode_chunked_malformed(self):
+        for data in ('abc', '3\r\nx=1\r\n'):
+            with self.assertRaises(ValueError):
+                parser.decode_chunked(data)
+
+    def test_parse_raw_request_chunked(self):
+        headers, details = parser.parse_raw_request(
+            "POST /a HTTP/1.1\nHost: foo.bar\nTransfer-Encoding: chunked\n\n3\nx=1\n0\n")
+        self.assertEqual(details['data'], 'x=1')
+        _, details = parser.parse_raw_request("POST /a HTTP/1.1\nHost: foo.bar\nTransfer-Encoding: chunked\n\nabc")
+        self.assertEqual(details['data'], 'abc')
+
+    ###
+    # parser.get_multipart_boundary
+    ###
+    def test_get_multipart_boundary(self):
+        self.assertEqual(
+            parser.get_multipart_boundary(['Host: foo.bar', 'content-type: Multipart/Form-Data; boundary="a b;c"']),
+            'a b;c')
+        self.assertIsNone(parser.get_multipart_boundary(['Content-Type: application/x-www-form-urlencoded']))
+        self.assertIsNone(parser.get_multipart_boundary(['Content-Type: multipart/form-data']))
+
+    ###
+    # parser.iter_multipart
+    ###
+    def test_iter_multipart(self):
+        data = (
+            '--XyZ\r\n'
+            'Content-Disposition: form-data; name="title"\r\n'
+            '\r\n'
+            'My "doc"\r\n'
+            '--XyZ\r\n'
+            'Content-Disposition: form-data; name="file"; filename="notes.txt"\r\n'
+            'Content-Type: text/plain\r\n'
+            '\r\n'
+            'line1\r\nline2\r\n'
+            '--XyZ--\r\n')
+        self.assertEqual(list(parser.iter_multipart(data, 'XyZ')), [
+            parser.BodyPart('title', None, '', 'My "doc"'),
+            parser.BodyPart('file', 'notes.txt', 'text/plain', 'line1\r\nline2'),
+        ])
+
+    def test_iter_multipart_lazy(self):
+        parts = parser.iter_multipart('--XyZ\nContent-Disposition: form-data; name="a"\n\n1\n--XyZ\nbroken', 'XyZ')
+        self.assertEqual(next(parts), parser.BodyPart('a', None, '', '1'))
+
+    def test_iter_multipart_truncated(self):
+        data = (
+            '--XyZ\nContent-Disposition: form-data; name="a"\n\n1\n'
+            '--XyZ\nContent-Disposition: form-data; name="b"\n\n2')
+        self.assertEqual(
+            [(part.name, part.data) for part in parser.iter_multipart(data, 'XyZ')], [('a', '1'), ('b', '2')])
+
+    def test_iter_multipart_no_boundary(self):
+        with self.assertRaises(ValueError):
+            list(parser.iter_multipart('x=1&y=2', 'XyZ'))
+
+    ###
+    # parser.iter_requests
+    ###
+    def test_iter_requests(self):
+        stream = BytesIO(
+            b"GET https://foo.bar/robots.txt HTTP/1.1\r\n"
+            b"Host: foo.bar\r\n"
+            b"\r\n")
+        self.assertEqual(
+            list(parser.iter_requests(stream)),
+            [
+                (
+                    ['Host: foo.bar'],
+                    {
+                        'protocol': 'HTTP',
+                        'pre_scheme': 'https://',
+                        'Host': 'foo.bar',
+                        'version': '1.1',
+                        'path': '/robots.txt',
+                        'method': 'GET',
+                        'data': ''
+                    }
+                )
+            ])
+
+    def test_iter_requests_malformed(self):
+        with self.assertRaises(ValueError):
+            list(parser.iter_requests(BytesIO(b"GET x\r\nHost: foo.bar\r\n")))
+
+
+if __name__ == '__main__':
+    unittest.main()
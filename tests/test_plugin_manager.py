@@ -1,7 +1,7 @@
 import unittest
 from textwrap import dedent
 
-from hrt import plugin_manager, script
+from hrt import plugin_manager, request, script
 
 
 class TestPluginManager(unittest.TestCase):
@@ -11,8 +11,48 @@ class TestPluginManager(unittest.TestCase):
     ###
     def test_get_script_class(self):
         self.assertEqual(plugin_manager.get_script_class("ruby"), script.RubyScript)
+        self.assertEqual(plugin_manager.get_script_class("python_load"), script.PythonLoadScript)
         self.assertRaises(ValueError, plugin_manager.get_script_class, "lua")
 
+    def test_get_script_class_cached(self):
+        self.assertIs(plugin_manager.get_script_class(" Bash "), plugin_manager.get_script_class("bash"))
+        self.assertIs(plugin_manager._script_classes["bash"], script.BashScript)
+
+    def test_get_script_class_entry_point(self):
+        class EntryPoint(object):
+            name = 'Lua'
+
+            def load(self):
+                return script.RubyScript
+
+        iter_entry_points = plugin_manager._iter_entry_points
+        self.addCleanup(setattr, plugin_manager, '_iter_entry_points', iter_entry_points)
+        self.addCleanup(setattr, plugin_manager, '_entry_points_loaded', False)
+        self.addCleanup(plugin_manager._registry.pop, 'lua', None)
+        self.addCleanup(plugin_manager._script_classes.pop, 'lua', None)
+        plugin_manager._iter_entry_points = lambda: [EntryPoint()]
+        plugin_manager._entry_points_loaded = False
+        self.assertEqual(plugin_manager.get_script_class("lua"), script.RubyScript)
+        self.assertIn("lua", plugin_manager.get_languages())
+
+    ###
+    # plugin_manager.register_script
+    ###
+    def test_register_script(self):
+        self.addCleanup(plugin_manager.register_script, "bash", plugin_manager.BUILTIN_SCRIPTS["bash"])
+        plugin_manager.register_script("bash", "hrt.script:PHPScript")
+        self.assertIs(plugin_manager.get_script_class("bash"), script.PHPScript)
+        plugin_manager.register_script("bash", script.RubyScript)
+        self.assertIs(plugin_manager.get_script_class("bash"), script.RubyScript)
+
+    ###
+    # plugin_manager.get_languages
+    ###
+    def test_get_languages(self):
+        languages = plugin_manager.get_languages()
+        self.assertTrue(set(plugin_manager.BUILTIN_SCRIPTS) <= set(languages))
+        self.assertEqual(languages, sorted(languages))
+
     ###
     # plugin_manager.generate_script
     ###
@@ -26,3 +66,13 @@ class TestPluginManager(unittest.TestCase):
             curl -v --request GET http://file.txt  --header "host:github.com"  --include
         """).strip()
         self.assertEqual(script, result)
+
+    ###
+    # plugin_manager.render_script
+    ###
+    def test_render_script(self):
+        prepared = request.prepare_request(["host:github.com"], dict(path="file.txt", method="GET"))
+        self.assertEqual(
+            plugin_manager.render_script("bash", prepared),
+            plugin_manager.generate_script("bash", headers=["host:github.com"], details=dict(path="file.txt", method="GET")))
+        self.assertRaises(ValueError, plugin_manager.render_script, "lua", prepared)
@@ -0,0 +1,128 @@
+import unittest
+
+from hrt import request
+
+
+class TestRequest(unittest.TestCase):
+
+    def setUp(self):
+        self.headers = ['Host: google.com', 'X-Quote: "quoted"']
+        self.details = {
+            'pre_scheme': 'https://',
+            'Host': 'google.com',
+            'path': '/robots.txt',
+            'method': 'GET',
+            'data': 'a="b"'}
+
+    ###
+    # request.prepare_request
+    ###
+    def test_prepare_request(self):
+        prepared = request.prepare_request(self.headers, self.details, 'foo')
+        self.assertEqual(prepared.headers, ('Host: google.com', 'X-Quote: "quoted"'))
+        self.assertEqual(prepared.url, 'https://google.com/robots.txta%3D%22b%22')
+        self.assertEqual(prepared.search, 'foo')
+        self.assertEqual(prepared.header_pairs, (('Host', ' google.com'), ('X-Quote', ' "quoted"')))
+        self.assertEqual(prepared.escaped_headers(), (('Host', ' google.com'), ('X-Quote', ' \\"quoted\\"')))
+        self.assertEqual(prepared.escaped_data(), 'a=\\"b\\"')
+
+    def test_prepare_request_header_pairs(self):
+        header_pairs = (('Host', ' google.com'),)
+        prepared = request.prepare_request(self.headers, self.details, header_pairs=header_pairs)
+        self.assertEqual(prepared.header_pairs, header_pairs)
+
+    def test_prepared_request_escape_cache(self):
+        prepared = request.prepare_request(self.headers, self.details)
+        self.assertIs(prepared.escaped_headers(), prepared.escaped_headers())
+        self.assertEqual(prepared.escaped_headers(str.upper), (('HOST', ' GOOGLE.COM'), ('X-QUOTE', ' "QUOTED"')))
+        self.assertEqual(prepared.escaped_data(str.upper), 'A="B"')
+        self.assertEqual(len(prepared.escape_cache), 3)
+
+    def test_prepare_request_copies_details(self):
+        prepared = request.prepare_request(self.headers, self.details)
+        self.details['method'] = 'POST'
+        self.assertEqual(prepared.details['method'], 'GET')
+
+    def test_prepare_request_immutable(self):
+        prepared = request.prepare_request(self.headers, self.details)
+        with self.assertRaises(AttributeError):
+            prepared.url = 'http://foo.bar'
+
+    def test_prepare_request_invalid(self):
+        self.assertRaises(ValueError, request.prepare_request, [], self.details)
+        self.assertRaises(ValueError, request.prepare_request, self.headers, {})
+        self.details['Host'] = 'wrongurl..'
+        self.assertRaises(ValueError, request.prepare_request, self.headers, self.details)
+
+    ###
+    # request.split_headers
+    ###
+    def test_split_headers(self):
+        self.assertEqual(request.split_headers(['a:b:c', 'd: e']), [('a', 'b:c'), ('d', ' e')])
+        self.assertRaises(ValueError, request.split_headers, ['Host'])
+
+    ###
+    # request.escape_literal
+    ###
+    def test_escape_literal(self):
+        self.assertEqual(request.escape_literal('a="b\\c"\r\nd=$#'), 'a=\\"b\\\\c\\"\\r\\nd=$#')
+        self.assertEqual(request.escape_php('a=$b\nc=#'), 'a=\\$b\\nc=#')
+        self.assertEqual(request.escape_ruby('a=#{b}\nc=$'), 'a=\\#{b}\\nc=$')
+
+    ###
+    # request.escape_headers
+    ###
+    def test_escape_headers(self):
+        self.assertEqual(request.escape_headers(['a:"b:c"']), [('a', '\\"b:c\\"')])
+        self.assertRaises(ValueError, request.escape_headers, ['Host'])
+
+    ###
+    # request.canonicalize_request
+    ###
+    def test_canonicalize_request(self):
+        details = {
+            'method': 'post',
+            'Host': 'Foo.bar',
+            'pre_scheme': '',
+            'path': '/a?b=2&_=1500000000&a=1',
+            'data': 'csrf_token=x1&user=a'}
+        self.assertEqual(
+            request.canonicalize_request(
+                ['Host: Foo.bar', 'Content-Type: application/x-www-form-urlencoded', 'Cookie: id=1'], details),
+            (
+                'POST', '', 'foo.bar', '/a', '_=%2A&a=1&b=2',
+                (('content-type', 'application/x-www-form-urlencoded'), ('cookie', '*'), ('host', 'Foo.bar')),
+                'csrf_token=%2A&user=a',
+            ))
+
+    def test_canonicalize_request_raw_body(self):
+        details = {'method': 'POST', 'Host': 'foo.bar', 'path': '/', 'data': '{"_": 1}'}
+        self.assertEqual(request.canonicalize_request(['Host: foo.bar'], details)[-1], '{"_": 1}')
+
+    def test_canonicalize_request_header_pairs(self):
+        details = {'method': 'GET', 'Host': 'foo.bar', 'path': '/'}
+        self.assertEqual(
+            request.canonicalize_request(None, details, header_pairs=(('Host', ' foo.bar'), ('Cookie', ' id=1'))),
+            request.canonicalize_request(['Host: foo.bar', 'Cookie: id=1'], details))
+
+    ###
+    # request.fingerprint_request
+    ###
+    def test_fingerprint_request(self):
+        details = {'method': 'GET', 'Host': 'foo.bar', 'path': '/?a=1&b=2'}
+        fingerprint = request.fingerprint_request(['Host: foo.bar', 'Cookie: id=1', 'Accept: */*'], details)
+        self.assertEqual(
+            fingerprint,
+            request.fingerprint_request(
+                ['accept: */*', 'host: foo.bar', 'cookie: id=2'], dict(details, path='/?b=2&a=1')))
+        self.assertNotEqual(
+            fingerprint,
+            request.fingerprint_request(['Host: foo.bar', 'Accept: */*'], dict(details, path='/?a=1&b=3')))
+        self.assertNotEqual(
+            fingerprint,
+            request.fingerprint_request(
+                ['Host: foo.bar', 'Cookie: id=1', 'Accept: */*'], details, volatile_fields=frozenset()))
+
+
+if __name__ == '__main__':
+    unittest.main()
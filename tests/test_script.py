@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 import unittest
 
+from hrt import base, request, script
 from hrt.base import AbstractScript
-from hrt import script
 from .templates import (code_begin_python, code_search_python, code_python, code_post_python, code_search_ruby,
                         code_begin_ruby, code_ruby, code_post_ruby, code_begin_bash, code_search_bash, code_bash,
                         code_post_bash, code_search_php, code_php, code_begin_php, code_post_php)
@@ -45,6 +45,27 @@ class TestScripts(unittest.TestCase):
                 globals()["code_search_" + script_name.__language__],
                 'Invalid generation of search code for {}'.format(script_name.__class__.__name__))
 
+    def test_generate_search_first_match(self):
+        first_match = {
+            'bash': 'if [ 1 = 1 ]',
+            'php': '$first_match = 1;',
+            'python': 'first_match = 1',
+            'ruby': 'first_match = 1 == 1'}
+        self.details['first_match'] = True
+        for script_name in self.script_list:
+            result = script_name._generate_search(self.code_search)
+            self.assertIn(
+                first_match[script_name.__language__],
+                result,
+                'Invalid generation of first match search code for {}'.format(script_name.__class__.__name__))
+
+    def test_generate_script_search_bash(self):
+        result = script.BashScript(headers=self.headers, details=self.details, search='Disallow').generate_script()
+        self.assertTrue(
+            result.endswith(' --include --no-buffer | if [ 0 = 1 ]; then grep -E -o -m 1 "Disallow"; '
+                            'else grep -E -o "Disallow"; fi'),
+            'Invalid generation of search script for BashScript')
+
     def test_generate_proxy(self):
         code_proxy = {
             'bash': " -x http://xyz.com:2223",
@@ -78,9 +99,9 @@ class TestScripts(unittest.TestCase):
     def test_generate_post(self):
         code_post = {
             'bash': ' --data "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\-=<>?:\\"{}|_+!@#$%^&*()`" ',
-            'php': '\n$content = "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\-=<>?:\\"{}|_+!@#$%^&*()`";\ncurl_setopt($ch, CURLOPT_POST, 1);\ncurl_setopt($ch, CURLOPT_POSTFIELDS, $content);\n',
-            'python': '\n    # Sets request method to POST\n    curl_handler.setopt(curl_handler.POSTFIELDS, "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\-=<>?:\\"{}|_+!@#$%^&*()`")  #expects body to urlencoded\n',
-            'ruby': '\n    body: "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\-=<>?:\\"{}|_+!@#$%^&*()`"\n'}
+            'php': '\n$content = "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\\\\-=<>?:\\"{}|_+!@#\\$%^&*()`";\ncurl_setopt($ch, CURLOPT_POST, 1);\ncurl_setopt($ch, CURLOPT_POSTFIELDS, $content);\n',
+            'python': '\n    # Sets request method to POST\n    curl_handler.setopt(curl_handler.POSTFIELDS, "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\\\\-=<>?:\\"{}|_+!@#$%^&*()`")  #expects body to urlencoded\n',
+            'ruby': '\n    body: "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\\\\-=<>?:\\"{}|_+!@\\#$%^&*()`"\n'}
         self.details['data'] = 'hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\-=<>?:"{}|_+!@#$%^&*()`'
         for script_name in self.script_list:
             result = script_name._generate_post()
@@ -89,6 +110,68 @@ class TestScripts(unittest.TestCase):
                 code_post[script_name.__language__],
                 'Invalid generation of post code for {}'.format(script_name.__class__.__name__))
 
+    def test_generate_post_file(self):
+        self.details['data'] = 'a' * 1024
+        self.details['data_file'] = '/tmp/"body'
+        code_post_file = {
+            'bash': ' --data-binary "@/tmp/\\"body" ',
+            'php': '\n$content = file_get_contents("/tmp/\\"body");\n',
+            'python': '\n    body_file = open("/tmp/\\"body", \'rb\')\n',
+            'ruby': '\n    body: File.binread("/tmp/\\"body")\n'}
+        for script_name in self.script_list:
+            result = script_name._generate_post()
+            self.assertIn(
+                code_post_file[script_name.__language__].strip('\n'),
+                result,
+                'Invalid generation of post file code for {}'.format(script_name.__class__.__name__))
+            self.assertNotIn(self.details['data'], result)
+
+    def test_generate_form(self):
+        self.details['data'] = '--XyZ\r\nContent-Disposition: form-data; name="title"\r\n\r\nMy "doc"\r\n--XyZ--'
+        self.details['form_parts'] = [
+            request.FormPart('title', 'My "doc"', None, None, None),
+            request.FormPart('file', None, '/tmp/1-notes.txt', 'notes.txt', 'text/plain')]
+        code_form = {
+            'bash': [
+                ' --form-string "title=My \\"doc\\"" ',
+                ' --form "file=@/tmp/1-notes.txt;filename=notes.txt;type=text/plain" '],
+            'php': [
+                '$content["title"] = "My \\"doc\\"";',
+                '$content["file"] = new CURLFile("/tmp/1-notes.txt", "text/plain", "notes.txt");'],
+            'python': [
+                '("title", "My \\"doc\\""),',
+                'curl_handler.FORM_FILE, "/tmp/1-notes.txt",',
+                'curl_handler.FORM_FILENAME, "notes.txt",',
+                'curl_handler.FORM_CONTENTTYPE, "text/plain")),'],
+            'ruby': [
+                '"title" => "My \\"doc\\"",',
+                '"file" => File.open("/tmp/1-notes.txt"),']}
+        for script_name in self.script_list:
+            result = script_name._generate_post()
+            for code in code_form[script_name.__language__]:
+                self.assertIn(
+                    code, result, 'Invalid generation of form code for {}'.format(script_name.__class__.__name__))
+            self.assertNotIn('--XyZ', result)
+
+    def test_generate_sections(self):
+        for script_name in self.script_list:
+            sections = script_name.generate_sections()
+            self.assertEqual(
+                [name for name, _ in script_name.__sections__], ['begin', 'proxy', 'post', 'https', 'request'])
+            self.assertEqual(sections['post'], '', 'The body of a GET request is generated')
+            self.assertEqual(sections['begin'], script_name._generate_begin())
+            self.assertEqual(
+                ''.join(sections[name] for name, _ in script_name.__sections__),
+                globals()["code_" + script_name.__language__],
+                'Invalid generation of the sections of {}'.format(script_name.__class__.__name__))
+            self.assertEqual(list(script_name.generate_sections(['proxy'])), ['proxy'])
+
+    def test_generate_sections_unsupported_method(self):
+        self.details['method'] = 'DELETE'
+        for script_name in self.script_list:
+            with self.assertRaises(ValueError):
+                script_name.generate_sections(['proxy'])
+
     def test_generate_begin(self):
         for script_name in self.script_list:
             result = script_name._generate_begin()
@@ -112,5 +195,157 @@ class TestScripts(unittest.TestCase):
                 'https://google.com/robots.txt%3Fxx',
                 'Invalid generation of begin code for {}'.format(script_name.__class__.__name__))
 
+    def test_load_attributes_cached(self):
+        plan = script.BashScript._render_plan
+        base._render_plans['hrt.templates.bash'] = (-1, plan[1])  # Not checked without RELOAD_TEMPLATES.
+        self.addCleanup(base._render_plans.__setitem__, 'hrt.templates.bash', plan)
+        script.BashScript(headers=self.headers, details=self.details)
+        self.assertIs(script.BashScript._render_plan, plan)
+
+    def test_load_attributes_template_changed(self):
+        base.RELOAD_TEMPLATES = True
+        self.addCleanup(setattr, base, 'RELOAD_TEMPLATES', False)
+        plan = script.BashScript._render_plan
+        AbstractScript.load_attributes(script.BashScript)
+        self.assertIs(script.BashScript._render_plan, plan)
+        self.assertIs(base._render_plans['hrt.templates.bash'], plan)
+        stale_plan = (-1, dict(script.BashScript._render_plan[1], code_stale='stale'))
+        base._render_plans['hrt.templates.bash'] = stale_plan
+        AbstractScript.load_attributes(script.BashScript)
+        self.assertIsNot(script.BashScript._render_plan, stale_plan)
+        self.assertIs(base._render_plans['hrt.templates.bash'], script.BashScript._render_plan)
+        script.BashScript.code_stale = 'stale'
+        script.BashScript._render_plan = stale_plan
+        AbstractScript.load_attributes(script.BashScript)
+        self.assertFalse(hasattr(script.BashScript, 'code_stale'))
+
+
+class TestLoadScripts(unittest.TestCase):
+
+    def setUp(self):
+        self.headers = ['Host: www.codepunker.com']
+        self.details = {
+            'protocol': 'HTTP',
+            'pre_scheme': 'https://',
+            'Host': 'www.codepunker.com',
+            'version': '1.1',
+            'path': '/tools/http-requests',
+            'method': 'POST',
+            'data': 'extra=whoAreYou',
+            'proxy_port': '2223',
+            'proxy_host': 'http://xyz.com'}
+
+    ###
+    # script.get_load_options
+    ###
+    def test_get_load_options(self):
+        self.assertEqual(script.get_load_options({}), (script.DEFAULT_REPEAT, script.DEFAULT_CONCURRENCY, True))
+        self.assertEqual(script.get_load_options({'repeat': 5, 'concurrency': 20, 'keep_alive': False}), (5, 5, False))
+
+    ###
+    # script.BashParallelScript
+    ###
+    def test_bash_parallel_generate_script(self):
+        self.details.update(repeat=50, concurrency=4, keep_alive=False)
+        result = script.BashParallelScript(headers=self.headers, details=self.details).generate_script()
+        self.assertIn("\nREPEAT=50\n", result)
+        self.assertIn("\nCONCURRENCY=4\n", result)
+        self.assertIn("\nKEEP_ALIVE=0\n", result)
+        self.assertIn(
+            'OPTIONS=(--silent --show-error -x http://xyz.com:2223 --data "extra=whoAreYou"  --request POST  '
+            '--header "Host: www.codepunker.com" )\n', result)
+        self.assertIn("URL='https://www.codepunker.com/tools/http-requests'\n", result)
+        self.assertIn("TIMING='%{http_code} %{time_connect} %{time_starttransfer} %{time_total}\\n'", result)
+        self.assertNotIn("search_request() {", result)
+
+    def test_bash_parallel_generate_script_search(self):
+        self.details['first_match'] = True
+        result = script.BashParallelScript(headers=self.headers, details=self.details, search='who').generate_script()
+        self.assertIn('\nSEARCH="who"\n', result)
+        self.assertIn("\nFIRST_MATCH=1\n", result)
+        self.assertIn("search_request() {", result)
+        self.assertIn('Matched in %d response(s)', result)
+
+    ###
+    # script.PythonLoadScript
+    ###
+    def test_python_load_generate_script(self):
+        self.details.update(repeat=50, concurrency=4, keep_alive=False)
+        result = script.PythonLoadScript(headers=self.headers, details=self.details).generate_script()
+        self.assertIn("\nREPEAT = 50\n", result)
+        self.assertIn("\nCONCURRENCY = 4\n", result)
+        self.assertIn("\nKEEP_ALIVE = False\n", result)
+        self.assertIn("    curl_handler.setopt(curl_handler.URL, 'https://www.codepunker.com/tools/http-requests')\n", result)
+        # Proxy, body and HTTPS code are inherited from the Python template and configure every request.
+        self.assertIn(script.PythonScript.code_proxy.format(proxy='http://xyz.com:2223'), result)
+        self.assertIn(script.PythonScript.code_post.format(data='extra=whoAreYou'), result)
+        self.assertIn(script.PythonScript.code_https, result)
+        self.assertIn("pycurl.CurlMulti()", result)
+        compile(result, 'python_load', 'exec')
+
+    def test_python_load_generate_script_body_file(self):
+        # Each handler opens the body file once and closes it with the handler.
+        self.details['data_file'] = '/tmp/body'
+        result = script.PythonLoadScript(headers=self.headers, details=self.details).generate_script()
+        self.assertEqual(result.count('open("/tmp/body", \'rb\')'), 1)
+        self.assertIn("        curl_handler.body_file = open(", result)
+        self.assertIn("            curl_handler.body_file.close()\n", result)
+        self.assertNotIn("TCP_KEEPALIVE", result)
+        compile(result, 'python_load', 'exec')
+
+    def test_python_generate_script_multiline_body(self):
+        self.details['data'] = '{\n  "a": "1\\n2",\r\n  "b": 2\n}'
+        for script_class in (script.PythonScript, script.PythonLoadScript, script.PythonAsyncioScript):
+            result = script_class(headers=self.headers, details=self.details).generate_script()
+            compile(result, script_class.__language__, 'exec')
+            self.assertIn('"{\\n  \\"a\\": \\"1\\\\n2\\",\\r\\n  \\"b\\": 2\\n}"', result)
+
+    def test_python_load_generate_script_search(self):
+        result = script.PythonLoadScript(headers=self.headers, details=self.details, search='who').generate_script()
+        self.assertIn('SEARCH = re.compile(r"who")', result)
+        self.assertIn("\nFIRST_MATCH = 0\n", result)
+        self.assertIn("curl_handler.setopt(curl_handler.WRITEFUNCTION, searcher(curl_handler.state))", result)
+        self.assertNotIn("BytesIO", result)
+        compile(result, 'python_load', 'exec')
+
+    def test_python_load_generate_script_nosearch(self):
+        result = script.PythonLoadScript(headers=self.headers, details=self.details).generate_script()
+        self.assertIn("curl_handler.setopt(curl_handler.WRITEFUNCTION, discard)", result)
+        self.assertNotIn("BytesIO", result)
+        compile(result, 'python_load', 'exec')
+
+    ###
+    # script.PythonAsyncioScript
+    ###
+    def test_python_asyncio_generate_script(self):
+        self.details.update(repeat=50, concurrency=4)
+        result = script.PythonAsyncioScript(headers=self.headers, details=self.details).generate_script()
+        self.assertIn("\nREPEAT = 50\n", result)
+        self.assertIn("\nCONCURRENCY = 4\n", result)
+        self.assertIn("\nKEEP_ALIVE = True\n", result)
+        self.assertIn("\nMETHOD = 'POST'\n", result)
+        self.assertIn("\nHEADERS = [('Host', 'www.codepunker.com')]\n", result)
+        self.assertIn("\nOPTIONS['proxy'] = 'http://xyz.com:2223'\n", result)
+        self.assertIn("\nOPTIONS['data'] = \"extra=whoAreYou\".encode('utf-8')\n", result)
+        self.assertIn("p99", result)
+        self.assertNotIn("pycurl", result)
+        compile(result, 'python_asyncio', 'exec')
+
+    def test_python_asyncio_generate_script_search(self):
+        self.details['first_match'] = True
+        result = script.PythonAsyncioScript(headers=self.headers, details=self.details, search='who').generate_script()
+        self.assertIn('SEARCH = re.compile(r"who")', result)
+        self.assertIn("\nFIRST_MATCH = 1\n", result)
+        self.assertIn("response.content.iter_any()", result)
+        self.assertNotIn("response.read()", result)
+        compile(result, 'python_asyncio', 'exec')
+
+    def test_python_asyncio_generate_form(self):
+        # The form is not rebuilt, the body is sent as captured.
+        self.details['form_parts'] = [request.FormPart('extra', 'whoAreYou', None, None, None)]
+        result = script.PythonAsyncioScript(headers=self.headers, details=self.details).generate_script()
+        self.assertIn("\nOPTIONS['data'] = \"extra=whoAreYou\".encode('utf-8')\n", result)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,134 @@
+import json
+import socket
+import sys
+import threading
+import unittest
+
+if sys.version_info < (3, 7):
+    raise unittest.SkipTest("The translation daemon requires Python 3.7+.")
+
+import asyncio
+
+from hrt.server import TranslationServer
+
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = TranslationServer()
+        self.raw_request = "GET /\r\nHost: foo.bar"
+
+    ###
+    # server.TranslationServer.translate
+    ###
+    def test_translate(self):
+        status, answer = self.server.translate(json.dumps({'request': self.raw_request}).encode('utf-8'))
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            answer,
+            {'bash': '#!/usr/bin/env bash\ncurl -v --request GET http://foo.bar  --header "Host: foo.bar"  --include'})
+
+    def test_translate_languages(self):
+        payload = json.dumps({'request': self.raw_request, 'languages': 'bash, ruby'}).encode('utf-8')
+        status, answer = self.server.translate(payload)
+        self.assertEqual(status, 200)
+        self.assertEqual(sorted(answer), ['bash', 'ruby'])
+
+    def test_translate_invalid(self):
+        self.assertEqual(self.server.translate(b'{')[0], 400)
+        self.assertEqual(self.server.translate(b'{"languages": ["bash"]}')[0], 400)
+        status, answer = self.server.translate(json.dumps({'request': "GET /\r\nHost"}).encode('utf-8'))
+        self.assertEqual(status, 400)
+        self.assertEqual(answer, {'error': 'Headers Malformed. Please Enter a Valid HTTP request.'})
+
+    def test_translate_wrong_types(self):
+        for payload, error in (
+                ([self.raw_request], "The payload must be a JSON object."),
+                ('GET /', "The payload must be a JSON object."),
+                ({'request': 1}, "'request' must be a string."),
+                ({'request': self.raw_request, 'languages': 1}, "'languages' must be a list of strings or a comma "
+                                                               "separated string."),
+                ({'request': self.raw_request, 'languages': ['bash', 1]}, "'languages' must be a list of strings or "
+                                                                          "a comma separated string."),
+                ({'request': self.raw_request, 'proxy': 8080}, "'proxy' must be a string."),
+                ({'request': self.raw_request, 'search_string': ['a']}, "'search_string' must be a string."),
+                ({'request': self.raw_request, 'data': {'a': 1}}, "'data' must be a string.")):
+            self.assertEqual(
+                self.server.translate(json.dumps(payload).encode('utf-8')), (400, {'error': error}), payload)
+
+    ###
+    # server.TranslationServer.handle
+    ###
+    def exchange(self, data, server=None):
+        # Sends raw data to a daemon listening on a free port and returns everything it answers until it closes.
+        loop = asyncio.new_event_loop()
+        listening = loop.run_until_complete((server or self.server).start(port=0))
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            client = socket.create_connection(listening.sockets[0].getsockname()[:2])
+            client.sendall(data)
+            answers = b''
+            while True:
+                received = client.recv(4096)
+                if not received:
+                    break
+                answers += received
+            client.close()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            listening.close()
+            loop.run_until_complete(listening.wait_closed())
+            loop.close()
+        return answers.decode('utf-8')
+
+    def test_handle(self):
+        body = json.dumps({'request': self.raw_request, 'languages': ['bash']}).encode('utf-8')
+        wrong_body = json.dumps({'request': self.raw_request, 'proxy': 8080}).encode('utf-8')
+        data = (
+            "POST /translate HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(wrong_body)).encode('latin-1') + wrong_body
+        for path, connection in (('/translate', 'keep-alive'), ('/unknown', 'close')):
+            data += (
+                "POST %s HTTP/1.1\r\nConnection: %s\r\nContent-Length: %d\r\n\r\n" % (path, connection, len(body))
+            ).encode('latin-1') + body
+        answers = self.exchange(data)
+        self.assertTrue(answers.startswith('HTTP/1.1 400 Bad Request\r\n'))
+        self.assertIn('{"error": "\'proxy\' must be a string."}HTTP/1.1 200 OK\r\n', answers)
+        self.assertIn('"bash": "#!/usr/bin/env bash', answers)
+        self.assertIn('HTTP/1.1 404 Not Found\r\n', answers)
+
+    def test_handle_too_large(self):
+        # The body is not read, the connection is closed once answered.
+        server = TranslationServer(max_body_size=10)
+        answers = self.exchange(b"POST /translate HTTP/1.1\r\nContent-Length: 11\r\n\r\n", server)
+        self.assertTrue(answers.startswith('HTTP/1.1 413 Payload Too Large\r\n'))
+        self.assertIn('Connection: close\r\n', answers)
+        self.assertTrue(answers.endswith('{"error": "The request is larger than 10 bytes."}'))
+
+    def test_handle_invalid_length(self):
+        answers = self.exchange(b"POST /translate HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+        self.assertTrue(answers.startswith('HTTP/1.1 400 Bad Request\r\n'))
+        self.assertTrue(answers.endswith('{"error": "Invalid Content-Length."}'))
+
+    def test_handle_line_too_long(self):
+        # Longer than the 64 KiB limit of the stream reader.
+        answers = self.exchange(b"POST /translate HTTP/1.1\r\nX-Long: " + b"a" * 100000 + b"\r\n\r\n")
+        self.assertTrue(answers.startswith('HTTP/1.1 400 Bad Request\r\n'))
+        self.assertTrue(answers.endswith('{"error": "Request line or header too long."}'))
+
+    def test_handle_error(self):
+        # An unexpected error is answered instead of leaving the client waiting.
+        class FailingServer(TranslationServer):
+            def translate(self, payload):
+                raise RuntimeError("boom")
+
+        body = json.dumps({'request': self.raw_request}).encode('utf-8')
+        answers = self.exchange(
+            ("POST /translate HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body)).encode('latin-1') + body,
+            FailingServer())
+        self.assertTrue(answers.startswith('HTTP/1.1 500 Internal Server Error\r\n'))
+        self.assertTrue(answers.endswith('{"error": "RuntimeError: boom"}'))
+
+if __name__ == '__main__':
+    unittest.main()
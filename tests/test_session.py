@@ -0,0 +1,140 @@
+import unittest
+
+from hrt.interface import HttpRequestTranslator
+from hrt.session import EDIT_HELP, InteractiveSession
+
+
+LANGUAGES = ['bash', 'php', 'python', 'python_asyncio', 'ruby']
+
+
+def iter_input(lines):
+    """Reads the given lines as if they were typed, ``None`` being ^D.
+
+    :return: Function taking an optional prompt, like `input`.
+    :rtype: function
+    """
+    lines = iter(lines)
+
+    def read_line(prompt=''):
+        line = next(lines, None)
+        if line is None:
+            raise EOFError
+        return line
+    return read_line
+
+
+class TestInteractiveSession(unittest.TestCase):
+
+    def setUp(self):
+        self.session = InteractiveSession(LANGUAGES, proxy='127.0.0.1:8080')
+        self.codes = self.session.load("POST /a HTTP/1.1\nHost: foo.bar\nAccept: */*\n\nx=1")
+
+    def assertTranslated(self, codes, raw_request):
+        translator = HttpRequestTranslator(request=raw_request, languages=LANGUAGES, proxy='127.0.0.1:8080')
+        self.assertEqual(codes, translator.generate_code())
+
+    ###
+    # session.InteractiveSession.load
+    ###
+    def test_load(self):
+        self.assertTranslated(self.codes, "POST /a HTTP/1.1\nHost: foo.bar\nAccept: */*\n\nx=1")
+
+    def test_load_malformed(self):
+        with self.assertRaises(ValueError):
+            self.session.load("DELETE /a HTTP/1.1\nHost: foo.bar")
+        self.assertEqual(self.session.translator.details['method'], 'POST')
+
+    ###
+    # session.InteractiveSession.set_body
+    ###
+    def test_set_body(self):
+        sections = self.session.sections
+        codes = self.session.set_body('y="2"')
+        self.assertTranslated(codes, "POST /a HTTP/1.1\nHost: foo.bar\nAccept: */*\n\ny=\"2\"")
+        for language in LANGUAGES:
+            # Only the body is generated again.
+            self.assertIs(self.session.sections[language]['begin'], sections[language]['begin'])
+            self.assertIs(self.session.sections[language]['request'], sections[language]['request'])
+        self.assertEqual(self.session.translator.parsed.data, 'y="2"')
+
+    def test_set_body_get(self):
+        self.session.load("GET /a HTTP/1.1\nHost: foo.bar")
+        self.assertIn('http://foo.bar/aq%3D1', self.session.set_body('q=1')['bash'])
+
+    def test_set_body_form(self):
+        raw_request = (
+            'POST /a HTTP/1.1\nHost: foo.bar\nContent-Type: multipart/form-data; boundary=XyZ\n\n'
+            '--XyZ\nContent-Disposition: form-data; name="a"\n\n1\n--XyZ--')
+        session = InteractiveSession(['bash'], form_dir='/nonexistent')
+        self.assertIn('--form-string "a=1"', session.load(raw_request)['bash'])
+        codes = session.set_body('a=2')
+        self.assertIn('--data "a=2"', codes['bash'])
+        self.assertIn('--header "Content-Type: multipart/form-data; boundary=XyZ"', codes['bash'])
+
+    ###
+    # session.InteractiveSession.set_header
+    ###
+    def test_set_header(self):
+        self.session.set_header('accept', 'text/html')
+        codes = self.session.set_header('X-Token', 'abc')
+        self.assertTranslated(codes, "POST /a HTTP/1.1\nHost: foo.bar\nAccept: text/html\nX-Token: abc\n\nx=1")
+        self.assertEqual(self.session.translator.headers, ['Host: foo.bar', 'Accept: text/html', 'X-Token: abc'])
+
+    def test_set_header_remove(self):
+        codes = self.session.set_header('Accept')
+        self.assertTranslated(codes, "POST /a HTTP/1.1\nHost: foo.bar\n\nx=1")
+
+    def test_set_header_host(self):
+        codes = self.session.set_header('Host', 'bar.baz')
+        self.assertTranslated(codes, "POST /a HTTP/1.1\nHost: bar.baz\nAccept: */*\n\nx=1")
+        with self.assertRaises(ValueError):
+            self.session.set_header('Host', 'bar baz')
+        self.assertEqual(self.session.translator.details['Host'], 'bar.baz')
+        self.assertEqual(self.session.translator.headers, ['Host: bar.baz', 'Accept: */*'])
+
+    def test_set_header_without_request(self):
+        with self.assertRaises(ValueError):
+            InteractiveSession().set_header('Accept', '*/*')
+
+    ###
+    # session.InteractiveSession.run
+    ###
+    def test_run(self):
+        output = []
+        session = InteractiveSession(['bash'])
+        session.run(
+            iter_input([
+                'GET /a HTTP/1.1', 'Host: foo.bar', None,
+                'X-Token: abc',
+                ':body', 'q=1', None,
+                'X-Token:',
+                'X-Token',
+                ':unknown',
+            ]),
+            output.append)
+        self.assertEqual(session.translator.headers, ['Host: foo.bar'])
+        self.assertEqual(session.translator.details['data'], 'q=1')
+        output = ''.join(output)
+        self.assertIn('--header "X-Token: abc"', output)
+        self.assertIn("Unknown edit 'X-Token'.\n", output)
+        self.assertIn("Unknown edit ':unknown'.\n", output)
+        self.assertEqual(output.count(EDIT_HELP), 3)
+
+    def test_run_malformed_request(self):
+        output = []
+        session = InteractiveSession(['bash'])
+        session.run(iter_input(['GET', None, ':request', 'GET / HTTP/1.1', 'Host: foo.bar', None]), output.append)
+        self.assertEqual(session.translator.headers, ['Host: foo.bar'])
+
+    def test_run_long_session(self):
+        # The session loops on the edits, a long session does not grow the stack.
+        session = InteractiveSession(['bash'])
+        lines = ['GET /a HTTP/1.1', 'Host: foo.bar', None]
+        for index in range(2000):
+            lines.extend([':body', 'q=%d' % index, None])
+        session.run(iter_input(lines), lambda output: None)
+        self.assertEqual(session.translator.details['data'], 'q=1999')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,9 @@
+import os
+import shutil
+import tempfile
 import unittest
 
+from hrt import parser, translator
 from hrt.interface import HttpRequestTranslator
 
 
@@ -8,13 +12,45 @@ class TestTranslator(unittest.TestCase):
     ###
     # translator.parse_raw_request
     ###
+    def test_parse_raw_request_shared_parser(self):
+        self.assertIs(translator.parse_raw_request, parser.parse_raw_request)
+
+    ###
+    # translator.run_interactive
+    ###
+    def test_run_interactive(self):
+        request = ['GET /a HTTP/1.1', 'Host: foo.bar', None, 'q=1', None]
+        lines = iter(['GET /a HTTP/1.1', 'Host: foo.bar', None, None] + request * 1000 + [None, None])
+
+        def read_line(prompt=''):
+            line = next(lines)
+            if line is None:
+                raise EOFError
+            return line
+        original_input = vars(translator).get('input')  # Python 2.x alias of `raw_input`.
+        translator.input = read_line
+        if original_input is None:
+            self.addCleanup(delattr, translator, 'input')
+        else:
+            self.addCleanup(setattr, translator, 'input', original_input)
+        # The requests are taken in a loop, a long session does not grow the stack.
+        translator.run_interactive(['bash'])
+        self.assertIsNone(next(lines, None))
+
+    def test_parsed_request(self):
+        translator = HttpRequestTranslator(
+            request="POST /a HTTP/1.1\nHost: foo.bar\n\nx=1", data='y=2', proxy='127.0.0.1:8080')
+        self.assertEqual(translator.parsed.header_pairs, (('Host', ' foo.bar'),))
+        self.assertEqual(translator.parsed.data, 'y=2')
+        self.assertEqual((translator.parsed.proxy_host, translator.parsed.proxy_port), ('http://127.0.0.1', '8080'))
+
     def test_parse_raw_request_http_version_with_path(self):
         for i in range(0, 10):
             for j in range(0, 10):
                 raw_request = "GET /robots.txt HTTP/%d.%d\n"\
                               "Host: foo.bar" % (i, j)
                 self.assertEqual(
-                    HttpRequestTranslator(request=raw_request)._parse_request(),
+                    parser.parse_raw_request(raw_request),
                     (
                         ['Host: foo.bar'],
                         {
@@ -33,7 +69,7 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET /\n"\
                       "Host: foo.bar"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: foo.bar'],
                 {
@@ -50,7 +86,7 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET / HTTP//1.b\n"\
                       "Host: foo.bar"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: foo.bar'],
                 {
@@ -69,7 +105,7 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET /?foo=bar HTTP/1.1\n"\
                       "Host: foo.bar"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: foo.bar'],
                 {
@@ -88,7 +124,7 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET /#foo=bar HTTP/1.1\n"\
                       "Host: foo.bar"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: foo.bar'],
                 {
@@ -107,7 +143,7 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET /;foo=bar HTTP/1.1\n"\
                       "Host: foo.bar"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: foo.bar'],
                 {
@@ -126,7 +162,7 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET https://google.com/robots.txt HTTP/1.1\n"\
                       "Host: google.com"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: google.com'],
                 {
@@ -145,7 +181,7 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET https://google.com:31337/robots.txt HTTP/1.1\n"\
                       "Host: google.com:31337"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: google.com:31337'],
                 {
@@ -164,7 +200,7 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET https://127.0.0.1/robots.txt HTTP/1.1\n"\
                       "Host: 127.0.0.1"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: 127.0.0.1'],
                 {
@@ -183,7 +219,7 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET https://127.0.0.1:31337/robots.txt HTTP/1.1\n"\
                       "Host: 127.0.0.1:31337"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: 127.0.0.1:31337'],
                 {
@@ -202,7 +238,7 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET https://[::1]/robots.txt HTTP/1.1\n"\
                       "Host: [::1]"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: [::1]'],
                 {
@@ -221,7 +257,7 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET https://[::1]:31337/robots.txt HTTP/1.1\n"\
                       "Host: [::1]:31337"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: [::1]:31337'],
                 {
@@ -244,7 +280,7 @@ class TestTranslator(unittest.TestCase):
                       "host: foo.bar\n"\
                       "host:     foo.bar\n"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 [
                     'Host: foo.bar',
@@ -269,18 +305,18 @@ class TestTranslator(unittest.TestCase):
         raw_request = "GET https://foo.bar HTTP/1.1\n"\
                       "Host"
         with self.assertRaises(ValueError):
-            HttpRequestTranslator(request=raw_request)._parse_request()
+            parser.parse_raw_request(raw_request)
 
     def test_parse_raw_request_no_path(self):
         raw_request = "GET\n"\
                       "Host: foo.bar"
         with self.assertRaises(ValueError):
-            HttpRequestTranslator(request=raw_request)._parse_request()
+            parser.parse_raw_request(raw_request)
 
     def test_parse_raw_request_empty(self):
         raw_request = ''
         with self.assertRaises(ValueError):
-            HttpRequestTranslator(request=raw_request)._parse_request()
+            parser.parse_raw_request(raw_request)
 
     def test_parse_raw_request_post(self):
         raw_request = "POST /\r\n"\
@@ -289,7 +325,7 @@ class TestTranslator(unittest.TestCase):
                       "\r\n\r\n"\
                       "{}\r\n"
         self.assertEqual(
-            HttpRequestTranslator(request=raw_request)._parse_request(),
+            parser.parse_raw_request(raw_request),
             (
                 ['Host: foo.bar', 'Content-Length: 2'],
                 {
@@ -304,6 +340,17 @@ class TestTranslator(unittest.TestCase):
             ),
             'Invalid parsing of request!')
 
+    def test_parse_raw_request_post_multiline_body(self):
+        raw_request = "POST / HTTP/1.1\r\n"\
+                      "Host: foo.bar\r\n"\
+                      "\r\n"\
+                      "a=1\r\n"\
+                      "\r\n"\
+                      "b=2\n"
+        headers, details = parser.parse_raw_request(raw_request)
+        self.assertEqual(headers, ['Host: foo.bar'])
+        self.assertEqual(details['data'], 'a=1\r\n\r\nb=2', 'Line breaks of the body must be kept!')
+
     def test_extract_request_details(self):
         raw_request = "GET /\r\n"\
                       "Host: foo.bar"
@@ -403,6 +450,134 @@ class TestTranslator(unittest.TestCase):
             {},
             'Invalid code generation!')
 
+    def test_generate_code_body_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        body_file = os.path.join(directory, 'body')
+        raw_request = "POST / HTTP/1.1\r\nHost: foo.bar\r\n\r\na=1\nb=2"
+        codes = HttpRequestTranslator(request=raw_request, body_file=body_file).generate_code()
+        self.assertIn('--data-binary "@%s"' % body_file, codes['bash'])
+        self.assertNotIn('a=1', codes['bash'])
+        with open(body_file) as f:
+            self.assertEqual(f.read(), 'a=1\nb=2', 'Invalid body file!')
+
+    def test_generate_code_form_dir(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        raw_request = (
+            'POST /upload HTTP/1.1\r\n'
+            'Host: foo.bar\r\n'
+            'Content-Type: multipart/form-data; boundary=XyZ\r\n'
+            'Content-Length: 999\r\n'
+            '\r\n'
+            '--XyZ\r\n'
+            'Content-Disposition: form-data; name="title"\r\n'
+            '\r\n'
+            'My doc\r\n'
+            '--XyZ\r\n'
+            'Content-Disposition: form-data; name="file"; filename="../notes v1.txt"\r\n'
+            'Content-Type: text/plain\r\n'
+            '\r\n'
+            'line1\r\nline2\r\n'
+            '--XyZ--\r\n')
+        codes = HttpRequestTranslator(
+            request=raw_request, form_dir=directory, languages=['bash', 'python_asyncio']).generate_code()
+        form_file = os.path.join(directory, '1-notes_v1.txt')
+        self.assertIn(' --form-string "title=My doc" ', codes['bash'])
+        self.assertIn(' --form "file=@%s;filename=../notes v1.txt;type=text/plain" ' % form_file, codes['bash'])
+        self.assertNotIn('Content-Type', codes['bash'])
+        # The captured body is sent as is, with its boundary.
+        self.assertIn("('Content-Type', 'multipart/form-data; boundary=XyZ')", codes['python_asyncio'])
+        with open(form_file, 'rb') as f:
+            self.assertEqual(f.read(), b'line1\r\nline2', 'Invalid form file!')
+
+    def test_generate_code_form_dir_not_multipart(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        raw_request = "POST / HTTP/1.1\r\nHost: foo.bar\r\nContent-Type: multipart/form-data; boundary=XyZ\r\n\r\na=1"
+        translator = HttpRequestTranslator(request=raw_request, form_dir=directory)
+        self.assertNotIn('form_parts', translator.details)
+        self.assertIn('--data "a=1"', translator.generate_code()['bash'])
+        self.assertEqual(os.listdir(directory), [])
+
+    def test_extract_request_details_with_load_options(self):
+        raw_request = "GET / HTTP/1.1\r\nHost: foo.bar"
+        details = HttpRequestTranslator(request=raw_request, repeat=10, concurrency=2, keep_alive=False).details
+        self.assertEqual((details['repeat'], details['concurrency'], details['keep_alive']), (10, 2, False))
+        self.assertNotIn('repeat', HttpRequestTranslator(request=raw_request).details)
+        with self.assertRaises(ValueError):
+            HttpRequestTranslator(request=raw_request, concurrency=0)
+
+    def test_extract_request_details_with_first_match(self):
+        raw_request = "GET / HTTP/1.1\r\nHost: foo.bar"
+        self.assertTrue(HttpRequestTranslator(request=raw_request, first_match=True).details['first_match'])
+        self.assertNotIn('first_match', HttpRequestTranslator(request=raw_request).details)
+
+    def test_translate_batch(self):
+        raw_requests = [
+            "GET /\r\n"
+            "Host: foo.bar",
+            "GET /\r\n"
+            "Host",
+        ]
+        results = list(HttpRequestTranslator.translate_batch(raw_requests))
+        self.assertEqual(
+            [(result.index, result.codes) for result in results],
+            [
+                (0, {'bash': '#!/usr/bin/env bash\ncurl -v --request GET http://foo.bar  --header "Host: foo.bar"  --include'}),
+                (1, None),
+            ],
+            'Invalid batch code generation!')
+        self.assertIsInstance(results[1].error, ValueError)
+
+    def test_translate_batch_dedup(self):
+        raw_requests = [
+            "GET /a?x=1&y=2 HTTP/1.1\r\nHost: foo.bar\r\nCookie: id=1",
+            "GET /b\r\nHost",
+            "GET /a?y=2&x=1 HTTP/1.1\r\nCookie: id=2\r\nhost: foo.bar",
+            "GET /b\r\nHost",
+            "GET /c HTTP/1.1\r\nHost: foo.bar",
+            "GET /a?x=1&y=2 HTTP/1.1\r\nHost: foo.bar",
+        ]
+        for jobs in (1, 2):
+            results = list(HttpRequestTranslator.translate_batch(raw_requests, dedup=True, jobs=jobs))
+            self.assertEqual([result.index for result in results], list(range(6)))
+            self.assertEqual([result.duplicate_of for result in results], [None, None, 0, None, None, None])
+            self.assertEqual(results[2].codes, results[0].codes)
+            self.assertIsInstance(results[3].error, ValueError)
+
+    def test_translate_batch_dedup_parsed(self):
+        # The first requests are translated from the parse they were fingerprinted from.
+        raw_requests = [
+            ("a.txt", "POST /a HTTP/1.1\r\nHost: foo.bar\r\n\r\nx=1"),
+            ("b.txt", "POST /a HTTP/1.1\r\nHost: foo.bar\r\n\r\nx=2"),
+        ]
+        for jobs in (1, 2):
+            results = list(HttpRequestTranslator.translate_batch(
+                raw_requests, languages=['bash', 'python'], data='y=3', dedup=True, jobs=jobs))
+            expected = list(HttpRequestTranslator.translate_batch(
+                raw_requests, languages=['bash', 'python'], data='y=3'))
+            self.assertEqual([result.duplicate_of for result in results], [None, 0])
+            self.assertEqual([result.source for result in results], ['a.txt', 'b.txt'])
+            self.assertEqual([result.codes for result in results], [result.codes for result in expected])
+
+    def test_translator_parsed_request(self):
+        raw_request = "GET /a HTTP/1.1\r\nHost: foo.bar\r\nAccept: */*"
+        parsed = parser.parse_compact_request(raw_request)
+        self.assertEqual(
+            HttpRequestTranslator(request=parsed, languages=['bash', 'python']).generate_code(),
+            HttpRequestTranslator(request=raw_request, languages=['bash', 'python']).generate_code())
+
+    def test_translate_batch_jobs(self):
+        raw_requests = [("source", "GET /%d\r\nHost: foo.bar" % i) for i in range(300)]
+        raw_requests[5] = "GET /\r\nHost"
+        parallel = list(HttpRequestTranslator.translate_batch(raw_requests, languages=['bash', 'python'], jobs=2))
+        sequential = list(HttpRequestTranslator.translate_batch(raw_requests, languages=['bash', 'python']))
+        self.assertEqual(
+            [(result.index, result.source, result.codes, type(result.error)) for result in parallel],
+            [(result.index, result.source, result.codes, type(result.error)) for result in sequential],
+            'Invalid parallel batch code generation!')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -21,6 +21,8 @@ class TestURL(unittest.TestCase):
         self.assertFalse(url.check_valid_url("http://192.999.1.1"))
         self.assertFalse(url.check_valid_url("https://[::1]:invalid"))
         self.assertFalse(url.check_valid_url("https://[::1]:9999999999"))
+        self.assertFalse(url.check_valid_url("https://[::g]:443"))
+        self.assertFalse(url.check_valid_url("http://:80"))
 
         # Regression for https://github.com/owtf/http-request-translator/issues/44
         self.assertTrue(url.check_valid_url("http://www.cmd5.com"))
@@ -51,3 +53,20 @@ class TestURL(unittest.TestCase):
         self.assertEqual(url.get_url("github.com:22"), "ssh://github.com:22")
 
         self.assertEqual(url.get_url("[::1]:443"), "https://[::1]:443")
+
+    ###
+    # url.create_valid_url
+    ###
+    def test_create_valid_url(self):
+        url.url_cache.clear()
+        self.assertEqual(url.create_valid_url("github.com:443", "", "/robots.txt"), "https://github.com:443/robots.txt")
+        self.assertEqual(url.create_valid_url("github.com:443", "", "/?a=b"), "https://github.com:443/?a=b")
+        self.assertEqual(url.create_valid_url("github.com:443", "http://"), "http://github.com:443")
+        self.assertEqual(url.url_cache.info(), (1, 2, url.url_cache.maxsize, 2))
+
+    def test_create_valid_url_path_in_netloc(self):
+        self.assertEqual(url.create_valid_url("", "", "file.txt/a"), "http://file.txt/a")
+        with self.assertRaises(ValueError):
+            url.create_valid_url("", "", "/file.txt")
+        with self.assertRaises(ValueError):
+            url.create_valid_url("wrongurl..", "", "/robots.txt")
@@ -0,0 +1,54 @@
+import re
+import threading
+import unittest
+
+from hrt import util
+
+
+class TestUtil(unittest.TestCase):
+
+    ###
+    # util.LazyPattern
+    ###
+    def test_lazy_pattern(self):
+        pattern = util.LazyPattern(r'^[a-z]+$', re.IGNORECASE)
+        self.assertNotIn('match', vars(pattern))
+        self.assertTrue(pattern.match('Abc'))
+        self.assertIn('match', vars(pattern))
+        self.assertIsNone(pattern.match('a1'))
+
+    ###
+    # util.LRUCache
+    ###
+    def test_lru_cache(self):
+        cache = util.LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)  # Evicts 'b', the least recently used entry.
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.info(), util.CacheInfo(hits=2, misses=1, maxsize=2, currsize=2))
+        cache.clear()
+        self.assertEqual(cache.info(), util.CacheInfo(hits=0, misses=0, maxsize=2, currsize=0))
+
+    def test_lru_cache_threads(self):
+        cache = util.LRUCache(maxsize=8)
+
+        def worker():
+            for i in range(1000):
+                if cache.get(i % 16) is None:
+                    cache.set(i % 16, i)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = cache.info()
+        self.assertEqual(info.hits + info.misses, 4000)
+        self.assertLessEqual(info.currsize, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
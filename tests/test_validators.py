@@ -0,0 +1,103 @@
+import unittest
+
+from hrt import validators
+
+
+class TestValidators(unittest.TestCase):
+
+    ###
+    # validators.get_netloc
+    ###
+    def test_get_netloc(self):
+        self.assertEqual(validators.get_netloc("https://google.com:443/robots.txt"), "google.com:443")
+        self.assertEqual(validators.get_netloc("http://[::1]?a=b"), "[::1]")
+        self.assertEqual(validators.get_netloc("svn+ssh://foo.bar#frag"), "foo.bar")
+        self.assertEqual(validators.get_netloc("//foo.bar"), "foo.bar")
+
+        self.assertEqual(validators.get_netloc("://github.com/"), "")
+        self.assertEqual(validators.get_netloc("http:foo.bar"), "")
+        self.assertEqual(validators.get_netloc("foo.bar"), "")
+
+    ###
+    # validators.check_ipv4
+    ###
+    def test_check_ipv4(self):
+        self.assertTrue(validators.check_ipv4("127.0.0.1"))
+        self.assertTrue(validators.check_ipv4("255.255.255.255"))
+
+        self.assertFalse(validators.check_ipv4("256.0.0.1"))
+        self.assertFalse(validators.check_ipv4("01.0.0.1"))
+        self.assertFalse(validators.check_ipv4("1.0.0"))
+        self.assertFalse(validators.check_ipv4("1..0.0"))
+        self.assertFalse(validators.check_ipv4("1.0.0.a"))
+
+    ###
+    # validators.check_ipv6
+    ###
+    def test_check_ipv6(self):
+        self.assertTrue(validators.check_ipv6("::"))
+        self.assertTrue(validators.check_ipv6("::1"))
+        self.assertTrue(validators.check_ipv6("fe80::"))
+        self.assertTrue(validators.check_ipv6("1:2:3:4:5:6:7:8"))
+        self.assertTrue(validators.check_ipv6("1:2:3:4:5:6:7::"))
+        self.assertTrue(validators.check_ipv6("::ffff:127.0.0.1"))
+        self.assertTrue(validators.check_ipv6("1:2:3:4:5:6:127.0.0.1"))
+
+        self.assertFalse(validators.check_ipv6("1:2:3:4:5:6:7:8:9"))
+        self.assertFalse(validators.check_ipv6("1:2:3:4:5:6:7::8"))
+        self.assertFalse(validators.check_ipv6("1::2::3"))
+        self.assertFalse(validators.check_ipv6("1:::2"))
+        self.assertFalse(validators.check_ipv6(":1::"))
+        self.assertFalse(validators.check_ipv6("12345::"))
+        self.assertFalse(validators.check_ipv6("::g"))
+        self.assertFalse(validators.check_ipv6("::1.2.3.4:1"))
+        self.assertFalse(validators.check_ipv6("::256.0.0.1"))
+        self.assertTrue(validators.check_ipv6("FE80::1"))
+        self.assertTrue(validators.check_ipv6("::1.2.3.4"))
+        self.assertTrue(validators.check_ipv6("1::1.2.3.4"))
+        self.assertFalse(validators.check_ipv6(":1.2.3.4"))
+        self.assertFalse(validators.check_ipv6("1:::1.2.3.4"))
+        self.assertFalse(validators.check_ipv6("1:2:3:4:5:6:7::1.2.3.4"))
+        self.assertFalse(validators.check_ipv6("::1\n"))
+
+    ###
+    # validators.check_domain
+    ###
+    def test_check_domain(self):
+        self.assertTrue(validators.check_domain("google.com"))
+        self.assertTrue(validators.check_domain("www.google.com."))
+        self.assertTrue(validators.check_domain("9gag.com"))
+        self.assertTrue(validators.check_domain('a' * 63 + ".com"))
+
+        self.assertFalse(validators.check_domain("localhost"))
+        self.assertFalse(validators.check_domain("google.c"))
+        self.assertFalse(validators.check_domain("-google.com"))
+        self.assertFalse(validators.check_domain("wrongurl.."))
+        self.assertFalse(validators.check_domain('a' * 64 + ".com"))
+
+    ###
+    # validators.check_label
+    ###
+    def test_check_label_memoized(self):
+        validators._label_cache.clear()
+        validators._top_label_cache.clear()
+        self.assertTrue(validators.check_label("google"))
+        self.assertFalse(validators.check_label("g", top=True))
+        self.assertEqual(validators._label_cache, {"google": True})
+        self.assertEqual(validators._top_label_cache, {"g": False})
+
+    ###
+    # validators.check_host
+    ###
+    def test_check_host(self):
+        self.assertTrue(validators.check_host("[::1]"))
+        self.assertTrue(validators.check_host("127.0.0.1"))
+        self.assertTrue(validators.check_host("google.com"))
+
+        self.assertFalse(validators.check_host("::1"))
+        self.assertFalse(validators.check_host("[::1"))
+        self.assertFalse(validators.check_host(""))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from hrt import watcher
+
+
+def inotify_available():
+    try:
+        watcher._load_inotify()
+    except OSError:
+        return False
+    return True
+
+
+class TestWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.tmp_dir, 'req.txt')
+        self.write_request(self.filepath, "GET /a HTTP/1.1\nHost: foo.bar\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_request(self, filepath, raw_request):
+        # Written to a temporary file then moved over the request file, as editors save files.
+        with io.open(filepath + '.tmp', 'w') as fp:
+            fp.write(raw_request)
+        os.rename(filepath + '.tmp', filepath)
+
+    ###
+    # watcher.PollingWatcher
+    ###
+    def test_polling_watcher(self):
+        with watcher.PollingWatcher([self.filepath], interval=0.001) as files:
+            self.assertEqual(files.wait(timeout=0.01), [])
+            self.write_request(self.filepath, "GET /bb HTTP/1.1\nHost: foo.bar\n")
+            self.assertEqual(files.wait(timeout=1), [self.filepath])
+            self.assertEqual(files.wait(timeout=0.01), [])
+
+    def test_polling_watcher_removed_file(self):
+        with watcher.PollingWatcher([self.filepath], interval=0.001) as files:
+            os.remove(self.filepath)
+            self.assertEqual(files.wait(timeout=0.01), [])
+            self.write_request(self.filepath, "GET /a HTTP/1.1\nHost: foo.bar\n")
+            self.assertEqual(files.wait(timeout=1), [self.filepath])
+
+    ###
+    # watcher.InotifyWatcher
+    ###
+    @unittest.skipUnless(inotify_available(), "inotify is not available")
+    def test_inotify_watcher(self):
+        with watcher.InotifyWatcher([self.filepath]) as files:
+            self.assertEqual(files.wait(timeout=0.01), [])
+            # The other files of the directory, e.g. the generated scripts, are not watched.
+            with io.open(os.path.join(self.tmp_dir, 'req.py'), 'w') as fp:
+                fp.write(u'print(1)')
+            self.assertEqual(files.wait(timeout=0.01), [])
+            self.write_request(self.filepath, "GET /b HTTP/1.1\nHost: foo.bar\n")
+            self.assertEqual(files.wait(timeout=1), [self.filepath])
+
+    def test_get_watcher_polling(self):
+        with watcher.get_watcher([self.filepath], polling=True) as files:
+            self.assertIsInstance(files, watcher.PollingWatcher)
+
+    ###
+    # watcher.get_output_path
+    ###
+    def test_get_output_path(self):
+        self.assertEqual(watcher.get_output_path('/tmp/req.txt', 'python'), '/tmp/req.py')
+        self.assertEqual(watcher.get_output_path('/tmp/req', 'python_load'), '/tmp/req.load.py')
+        self.assertEqual(watcher.get_output_path('/tmp/req.sh', 'bash'), '/tmp/req.sh.sh')
+
+    ###
+    # watcher.check_output_paths
+    ###
+    def test_check_output_paths(self):
+        watcher.check_output_paths(['/tmp/req.txt', '/tmp/other.txt'], ['bash', 'python'])
+        # req.py would be overwritten by the python script of req.txt.
+        with self.assertRaises(ValueError):
+            watcher.check_output_paths(['/tmp/req.txt', '/tmp/req.py'], ['python'])
+        with self.assertRaises(ValueError):
+            watcher.check_output_paths(['req.txt', os.path.abspath('req.py')], ['python'])
+        # Both would be translated to req.sh.
+        with self.assertRaises(ValueError):
+            watcher.check_output_paths(['/tmp/req.txt', '/tmp/req.md'], ['bash'])
+
+    ###
+    # watcher.translate_file
+    ###
+    def test_translate_file(self):
+        output_paths = watcher.translate_file(self.filepath, ['bash', 'python'])
+        self.assertEqual(output_paths, [os.path.join(self.tmp_dir, 'req.sh'), os.path.join(self.tmp_dir, 'req.py')])
+        with open(output_paths[0]) as fp:
+            self.assertIn('http://foo.bar/a', fp.read())
+
+    ###
+    # watcher.watch_files
+    ###
+    def test_watch_files(self):
+        malformed = os.path.join(self.tmp_dir, 'malformed.txt')
+        self.write_request(malformed, "GET")
+        report = io.StringIO()
+        timer = threading.Timer(0.05, self.write_request, [self.filepath, "GET /b HTTP/1.1\nHost: foo.bar\n"])
+        timer.start()
+        self.addCleanup(timer.cancel)
+        watcher.watch_files(
+            [self.filepath, malformed],
+            watcher=watcher.PollingWatcher([self.filepath, malformed], interval=0.001),
+            stream=report,
+            timeout=0.5)
+        with open(os.path.join(self.tmp_dir, 'req.sh')) as fp:
+            self.assertIn('http://foo.bar/b', fp.read())
+        report = report.getvalue().splitlines()
+        self.assertEqual(len(report), 3)
+        self.assertTrue(report[1].startswith('%s: ' % malformed))
+        self.assertTrue(report[2].startswith('%s: wrote ' % self.filepath))
+
+    def test_watch_files_output_collision(self):
+        script = os.path.join(self.tmp_dir, 'req.sh')
+        self.write_request(script, "GET /c HTTP/1.1\nHost: foo.bar\n")
+        with self.assertRaises(ValueError):
+            watcher.watch_files([self.filepath, script], stream=io.StringIO(), timeout=0)
+        with open(script) as fp:
+            self.assertIn('GET /c', fp.read())
+
+
+if __name__ == '__main__':
+    unittest.main()